@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Board backend benchmark / 棋盘后端性能测试
+Compare move + win-check throughput of the NumPy Board and the BitBoard
+比较 NumPy 棋盘与位棋盘的“落子+胜负判断”吞吐量
+
+Exits with an error when the BitBoard speedup falls below MIN_SPEEDUP
+位棋盘加速比低于 MIN_SPEEDUP 时以错误退出
+
+Usage / 用法: python benchmarks/bench_board.py [games]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.board import Board
+from game.bitboard import BitBoard
+
+# 位棋盘相对 NumPy 棋盘的最低加速比
+MIN_SPEEDUP = 1.5
+
+
+def make_games(count, seed=2024, size=15):
+    """生成固定的随机对局（落子序列），两种后端使用相同的输入"""
+    rng = random.Random(seed)
+    cells = [(row, col) for row in range(size) for col in range(size)]
+    games = []
+    for _ in range(count):
+        order = cells[:]
+        rng.shuffle(order)
+        games.append(order)
+    return games
+
+
+def play_games(board_class, games):
+    """
+    在指定后端上重放对局：每步落子并判断胜负，结束后全部悔棋
+
+    Returns:
+        tuple: (落子次数, 耗时秒)
+    """
+    board = board_class()
+    moves = 0
+    start = time.perf_counter()
+    for order in games:
+        player = 1
+        for row, col in order:
+            board.make_move(row, col, player)
+            moves += 1
+            if board.check_winner(row, col, player):
+                break
+            player = 3 - player
+        while board.undo_move():
+            pass
+    return moves, time.perf_counter() - start
+
+
+def main():
+    games_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    games = make_games(games_count)
+
+    print(f"Games / 对局数: {games_count}")
+    results = {}
+    for board_class in (Board, BitBoard):
+        moves, elapsed = play_games(board_class, games)
+        rate = moves / elapsed if elapsed else float('inf')
+        results[board_class.__name__] = rate
+        print(f"{board_class.__name__:>8}: {moves} moves in {elapsed:.3f}s "
+              f"-> {rate:,.0f} move+check/s")
+
+    speedup = results['BitBoard'] / results['Board']
+    print(f"BitBoard speedup / 位棋盘加速比: {speedup:.1f}x")
+    assert speedup >= MIN_SPEEDUP, (
+        f"BitBoard speedup {speedup:.2f}x below {MIN_SPEEDUP}x / 位棋盘加速比低于 {MIN_SPEEDUP}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Search engine benchmark / 搜索引擎性能测试
+Search a fixed set of positions to a fixed depth and report nodes per second,
+so search performance can be compared across releases
+在固定局面上做固定深度搜索并报告每秒节点数，便于跨版本比较搜索性能
+
+Usage / 用法: python benchmarks/bench_engine.py [depth]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.bitboard import BitBoard
+from game.engine import SearchEngine
+from game.pattern import PatternManager
+
+# 额外的开局局面 (row, col, player)
+OPENINGS = {
+    'center_4': [(7, 7, 1), (7, 8, 2), (8, 8, 1), (6, 6, 2)],
+    'diagonal_6': [(7, 7, 1), (8, 8, 2), (6, 8, 1), (8, 6, 2), (8, 7, 1), (6, 7, 2)],
+}
+
+
+def benchmark_positions():
+    """收集测试局面：内置棋谱初始局面加若干开局"""
+    positions = dict(OPENINGS)
+    manager = PatternManager()
+    for info in manager.get_patterns_list():
+        manager.load_pattern(info['id'])
+        positions[info['id']] = list(manager.current_pattern['initial_setup'])
+    return positions
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    total_nodes = 0
+    total_time = 0.0
+    print(f"Depth / 深度: {depth}")
+    for name, moves in benchmark_positions().items():
+        board = BitBoard()
+        for row, col, player in moves:
+            board.make_move(row, col, player)
+        engine = SearchEngine(max_depth=depth, time_limit=None)
+        start = time.perf_counter()
+        result = engine.search(board)
+        elapsed = time.perf_counter() - start
+        total_nodes += result['nodes']
+        total_time += elapsed
+        print(f"{name:>16}: move={result['move']} score={result['score']:>8} "
+              f"nodes={result['nodes']:>7} nps={result['nps']:>9,.0f}")
+    print(f"Total / 合计: {total_nodes} nodes in {total_time:.2f}s "
+          f"-> {total_nodes / total_time:,.0f} nps")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pattern catalog benchmark / 棋谱目录性能测试
+Measure pattern load and language-switch latency, and the memory allocated per load
+测量棋谱加载和语言切换的延迟，以及每次加载分配的内存
+
+Usage / 用法: python benchmarks/bench_patterns.py [rounds]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.catalog import PatternCatalog
+from game.pattern import PatternManager, compile_built_in_records, localize_pattern
+
+
+def per_call(func, count):
+    """返回 func 平均每次调用的耗时（微秒）"""
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    manager = PatternManager()
+    ids = list(manager.catalog.ids)
+
+    def rebuild_and_load():
+        # 旧做法：每次加载都重新编译全部棋谱
+        catalog = PatternCatalog(compile_built_in_records(), localize_pattern)
+        catalog.views('english')
+
+    def load_all():
+        for pattern_id in ids:
+            manager.load_pattern(pattern_id)
+
+    def switch_language():
+        manager.set_language('chinese')
+        manager.set_language('english')
+
+    load_all()
+    switch_language()
+    rebuild_us = per_call(rebuild_and_load, max(rounds // 20, 10))
+    load_us = per_call(load_all, rounds) / len(ids)
+    switch_us = per_call(switch_language, rounds) / 2
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    load_all()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename')
+                    if stat.size_diff > 0 and 'tracemalloc' not in str(stat.traceback))
+
+    print(f"Patterns / 棋谱数: {len(ids)}")
+    print(f"Rebuild per load (old behaviour) / 每次重建: {rebuild_us:10.1f} us")
+    print(f"load_pattern / 加载棋谱:              {load_us:10.3f} us")
+    print(f"set_language / 切换语言:              {switch_us:10.3f} us")
+    print(f"Allocated while loading all patterns / 加载全部棋谱分配内存: {allocated} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,10 @@ This module was developed with the assistance of AI coding agents.
 """
 
 from .board import Board
+from .bitboard import BitBoard
+from .batch import BoardBatch
 from .pattern import PatternManager
 from .validator import MoveValidator
 from .sound_manager import SoundManager, sound_manager
 
-__all__ = ['Board', 'PatternManager', 'MoveValidator', 'SoundManager', 'sound_manager']
\ No newline at end of file
+__all__ = ['Board', 'BitBoard', 'BoardBatch', 'PatternManager', 'MoveValidator', 'SoundManager', 'sound_manager']
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Batched Gobang Boards
+批量五子棋棋盘
+Hold thousands of positions in one NumPy array and update or judge them all at once
+用一个 NumPy 数组保存成千上万个局面，并一次性落子、悔棋和判断胜负
+"""
+
+import numpy as np
+
+from .board import Board
+
+
+class BoardBatch:
+    """Batch of Gobang Boards / 批量棋盘
+
+    boards[i] 是第 i 个局面 (0=空, 1=黑子, 2=白子)，
+    history[i, :move_counts[i]] 是它的走棋历史 (row, col, player)。
+    """
+
+    def __init__(self, count, size=15, max_moves=None):
+        """
+        初始化批量棋盘
+
+        Args:
+            count (int): 局面数量
+            size (int): 棋盘大小，默认15x15
+            max_moves (int): 每个局面最多记录的步数，默认 size * size
+        """
+        self.count = count
+        self.size = size
+        self.capacity = max_moves or size * size
+        self.boards = np.zeros((count, size, size), dtype=np.int8)
+        self.history = np.zeros((count, self.capacity, 3), dtype=np.int8)
+        self.move_counts = np.zeros(count, dtype=np.int32)
+
+    def __len__(self):
+        return self.count
+
+    def _select(self, active):
+        """把 active（None / 布尔掩码 / 下标数组）转换为下标数组"""
+        if active is None:
+            return np.arange(self.count)
+        active = np.asarray(active)
+        if active.dtype == bool:
+            return np.nonzero(active)[0]
+        return active.astype(np.intp)
+
+    def make_moves(self, rows, cols, players, active=None):
+        """
+        批量落子
+
+        Args:
+            rows (array): 每个被选局面的落子行
+            cols (array): 每个被选局面的落子列
+            players (int or array): 落子玩家 (1=黑子, 2=白子)
+            active: 参与落子的局面（None 表示全部）
+
+        Returns:
+            numpy.ndarray: 每个被选局面是否成功落子（越界或已有棋子时失败）
+        """
+        indices = self._select(active)
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        players = np.broadcast_to(np.asarray(players, dtype=np.int8), indices.shape)
+
+        in_bounds = (rows >= 0) & (rows < self.size) & (cols >= 0) & (cols < self.size)
+        has_room = self.move_counts[indices] < self.capacity
+        ok = in_bounds & has_room
+        safe_rows = np.where(ok, rows, 0)
+        safe_cols = np.where(ok, cols, 0)
+        ok &= self.boards[indices, safe_rows, safe_cols] == 0
+
+        target = indices[ok]
+        target_rows = rows[ok]
+        target_cols = cols[ok]
+        target_players = players[ok]
+        self.boards[target, target_rows, target_cols] = target_players
+        slots = self.move_counts[target]
+        self.history[target, slots, 0] = target_rows
+        self.history[target, slots, 1] = target_cols
+        self.history[target, slots, 2] = target_players
+        self.move_counts[target] += 1
+        return ok
+
+    def undo_moves(self, active=None):
+        """
+        批量悔棋 - 每个被选局面撤销最后一步
+
+        Args:
+            active: 参与悔棋的局面（None 表示全部）
+
+        Returns:
+            numpy.ndarray: 形状 (k, 3) 的撤销走法 (row, col, player)，无棋可悔时为 -1
+        """
+        indices = self._select(active)
+        undone = np.full((len(indices), 3), -1, dtype=np.int16)
+        has_moves = self.move_counts[indices] > 0
+        target = indices[has_moves]
+        slots = self.move_counts[target] - 1
+        moves = self.history[target, slots]
+        self.boards[target, moves[:, 0], moves[:, 1]] = 0
+        self.move_counts[target] = slots
+        undone[has_moves] = moves
+        return undone
+
+    def winners(self):
+        """
+        批量判断胜负（沿四个方向做 5 格滑动窗口求和）
+
+        Returns:
+            numpy.ndarray: 每个局面的胜者 (0=无, 1=黑子, 2=白子)；
+                           双方都有五连时记为黑子
+        """
+        result = np.zeros(self.count, dtype=np.int8)
+        for player in (2, 1):
+            stones = (self.boards == player).astype(np.int8)
+            result[self._has_five(stones)] = player
+        return result
+
+    @staticmethod
+    def _has_five(stones):
+        """检查 (N, size, size) 的 0/1 数组中每个局面是否存在五连"""
+        found = np.zeros(stones.shape[0], dtype=bool)
+        horizontal = sum(stones[:, :, k:stones.shape[2] - 4 + k] for k in range(5))
+        vertical = sum(stones[:, k:stones.shape[1] - 4 + k, :] for k in range(5))
+        diagonal = sum(stones[:, k:stones.shape[1] - 4 + k, k:stones.shape[2] - 4 + k]
+                       for k in range(5))
+        anti_diagonal = sum(stones[:, k:stones.shape[1] - 4 + k, 4 - k:stones.shape[2] - k]
+                            for k in range(5))
+        for sums in (horizontal, vertical, diagonal, anti_diagonal):
+            found |= (sums == 5).any(axis=(1, 2))
+        return found
+
+    @classmethod
+    def from_boards(cls, boards, max_moves=None):
+        """
+        从若干 Board 构建批量棋盘
+
+        Args:
+            boards (list): Board 对象列表（大小必须相同）
+            max_moves (int): 每个局面最多记录的步数
+
+        Returns:
+            BoardBatch: 批量棋盘
+        """
+        if not boards:
+            raise ValueError("boards must not be empty / 棋盘列表不能为空")
+        size = boards[0].size
+        batch = cls(len(boards), size, max_moves)
+        for i, board in enumerate(boards):
+            if board.size != size:
+                raise ValueError("all boards must have the same size / 棋盘大小必须一致")
+            moves = board.move_history
+            if len(moves) > batch.capacity:
+                raise ValueError("too many moves for batch capacity / 步数超过批量容量")
+            batch.boards[i] = board.get_board_state()
+            if moves:
+                batch.history[i, :len(moves)] = moves
+            batch.move_counts[i] = len(moves)
+        return batch
+
+    def to_board(self, index, board_class=Board):
+        """
+        把第 index 个局面转换为 Board（按历史重放，增量状态随之建立）
+
+        Args:
+            index (int): 局面下标
+            board_class (type): 目标棋盘类，默认 Board
+
+        Returns:
+            Board: 转换后的棋盘
+        """
+        board = board_class(self.size)
+        for row, col, player in self.history[index, :self.move_counts[index]].tolist():
+            board.make_move(row, col, player)
+        return board
+
+    def to_boards(self, board_class=Board):
+        """
+        把全部局面转换为 Board 列表
+
+        Returns:
+            list: Board 对象列表
+        """
+        return [self.to_board(i, board_class) for i in range(self.count)]
@@ -0,0 +1,208 @@
+"""
+Bitboard Board Backend
+位棋盘后端
+Store each colour as one integer bitmask so moves and win checks are bitwise operations
+每种颜色用一个整数位掩码存储，落子和胜负判断都变成位运算
+"""
+
+import numpy as np
+
+from .board import Board
+from .lines import DIRECTIONS
+
+# 按棋盘大小缓存的每格五连掩码
+_WIN_MASKS_CACHE = {}
+
+
+def _build_win_masks(size):
+    """
+    预计算每个格子所在的全部五连窗口掩码
+
+    Args:
+        size (int): 棋盘大小
+
+    Returns:
+        list: 下标为 row * size + col，值为该格子参与的五连掩码元组
+    """
+    masks = [[] for _ in range(size * size)]
+    for dr, dc in DIRECTIONS:
+        for row in range(size):
+            for col in range(size):
+                end_row = row + 4 * dr
+                end_col = col + 4 * dc
+                if not (0 <= end_row < size and 0 <= end_col < size):
+                    continue
+                cells = [(row + k * dr) * size + (col + k * dc) for k in range(5)]
+                mask = 0
+                for index in cells:
+                    mask |= 1 << index
+                for index in cells:
+                    masks[index].append(mask)
+    return [tuple(cell_masks) for cell_masks in masks]
+
+
+def get_win_masks(size):
+    """获取（并缓存）指定大小棋盘的五连掩码表"""
+    masks = _WIN_MASKS_CACHE.get(size)
+    if masks is None:
+        masks = _build_win_masks(size)
+        _WIN_MASKS_CACHE[size] = masks
+    return masks
+
+
+class BitBoard(Board):
+    """Bitboard Gobang Board / 位棋盘五子棋棋盘
+
+    与 Board 接口完全兼容，可直接替换给 MoveValidator 和 GameWindow 使用。
+    格子 (row, col) 对应位 row * size + col。
+    """
+
+    def _init_storage(self):
+        """初始化位掩码存储"""
+        self.stones = [0, 0, 0]  # 下标为玩家：stones[1]=黑子, stones[2]=白子
+        self._full_mask = (1 << (self.size * self.size)) - 1
+        self._win_masks = get_win_masks(self.size)
+
+    def _place_stone(self, row, col, player):
+        """在位掩码中放置棋子"""
+        self.stones[player] |= 1 << (row * self.size + col)
+
+    def _remove_stone(self, row, col, player):
+        """从位掩码中移除棋子"""
+        self.stones[player] ^= 1 << (row * self.size + col)
+
+    @property
+    def occupied(self):
+        """所有已落子格子的位掩码"""
+        return self.stones[1] | self.stones[2]
+
+    @property
+    def board(self):
+        """
+        棋盘数组视图（按需从位掩码生成，与 Board.board 格式相同）。
+        数组只读：写入不会改变位棋盘，因此直接报错，请改用 make_move / undo_move
+
+        Returns:
+            numpy.ndarray: 0=空, 1=黑子, 2=白子
+        """
+        grid = np.zeros(self.size * self.size, dtype=int)
+        for player in (1, 2):
+            bits = self.stones[player]
+            while bits:
+                low = bits & -bits
+                grid[low.bit_length() - 1] = player
+                bits ^= low
+        grid = grid.reshape(self.size, self.size)
+        grid.flags.writeable = False
+        return grid
+
+    def is_valid_move(self, row, col):
+        """
+        检查落子位置是否有效
+
+        Args:
+            row (int): 行位置
+            col (int): 列位置
+
+        Returns:
+            bool: 是否可以落子
+        """
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            return False
+        stones = self.stones
+        return not ((stones[1] | stones[2]) >> (row * self.size + col)) & 1
+
+    def make_move(self, row, col, player):
+        """
+        落子（没有建立线路表和候选点时走只更新位掩码和哈希的精简路径）
+
+        Args:
+            row (int): 行位置
+            col (int): 列位置
+            player (int): 玩家 (1=黑子, 2=白子)
+
+        Returns:
+            bool: 是否成功落子
+        """
+        if self._track_lines or self._track_frontier:
+            return Board.make_move(self, row, col, player)
+        size = self.size
+        if not (0 <= row < size and 0 <= col < size):
+            return False
+        index = row * size + col
+        bit = 1 << index
+        stones = self.stones
+        if (stones[1] | stones[2]) & bit:
+            return False
+        stones[player] |= bit
+        self.hash ^= self._zobrist[player][index]
+        self.move_history.append((row, col, player))
+        return True
+
+    def undo_move(self):
+        """
+        悔棋 - 撤销最后一步（精简路径同 make_move）
+
+        Returns:
+            tuple: 撤销的走法 (row, col, player) 或 None
+        """
+        if self._track_lines or self._track_frontier or not self.move_history:
+            return Board.undo_move(self)
+        last_move = self.move_history.pop()
+        row, col, player = last_move
+        index = row * self.size + col
+        self.stones[player] ^= 1 << index
+        self.hash ^= self._zobrist[player][index]
+        return last_move
+
+    def check_winner(self, row, col, player):
+        """
+        检查是否有玩家获胜（只检查经过该格子的五连窗口）
+
+        Args:
+            row (int): 最后落子的行
+            col (int): 最后落子的列
+            player (int): 落子的玩家
+
+        Returns:
+            bool: 该玩家是否获胜
+        """
+        index = row * self.size + col
+        bits = self.stones[player] | (1 << index)
+        for mask in self._win_masks[index]:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def get_board_state(self):
+        """
+        获取当前棋盘状态
+
+        Returns:
+            numpy.ndarray: 棋盘状态副本
+        """
+        return self.board
+
+    def is_full(self):
+        """
+        检查棋盘是否已满
+
+        Returns:
+            bool: 棋盘是否已满
+        """
+        return self.occupied == self._full_mask
+
+    def get_empty_positions(self):
+        """
+        获取所有空位置
+
+        Returns:
+            list: 空位置列表 [(row, col), ...]
+        """
+        empty_positions = []
+        bits = ~self.occupied & self._full_mask
+        while bits:
+            low = bits & -bits
+            empty_positions.append(divmod(low.bit_length() - 1, self.size))
+            bits ^= low
+        return empty_positions
@@ -5,12 +5,83 @@ Handle board state, piece placement, win/loss judgment and other basic functions
 处理棋盘状态、落子、胜负判断等基础功能
 """
 
+import random
+
 import numpy as np
 
+from .lines import (SYMMETRY_COUNT, WINDOW_MASK, WINDOW_RADIUS, WINDOW_SIZE, get_line_geometry,
+                    get_neighbours, get_symmetry_maps)
+from .shapes import SHAPE_BITS, SHAPE_NONE, get_shape_table
+
+# Zobrist 键表随机种子（固定种子保证不同进程、不同安装得到相同的哈希）
+ZOBRIST_SEED = 20240815
+
+# 按棋盘大小缓存的 Zobrist 键表
+_ZOBRIST_CACHE = {}
+_SYMMETRY_KEY_CACHE = {}
+
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+
+
+def get_zobrist_keys(size):
+    """
+    获取（并缓存）指定大小棋盘的 64 位 Zobrist 键表
+
+    Args:
+        size (int): 棋盘大小
+
+    Returns:
+        list: keys[player][row * size + col]，player 为 1 或 2（keys[0] 为 None）
+    """
+    keys = _ZOBRIST_CACHE.get(size)
+    if keys is None:
+        rng = random.Random(ZOBRIST_SEED + size)
+        cells = size * size
+        keys = [None,
+                [rng.getrandbits(64) for _ in range(cells)],
+                [rng.getrandbits(64) for _ in range(cells)]]
+        _ZOBRIST_CACHE[size] = keys
+    return keys
+
+
+def get_symmetry_keys(size):
+    """
+    获取（并缓存）打包的对称 Zobrist 键表
+
+    第 k 个 64 位段是该格经第 k 种对称变换后所在格的 Zobrist 键，
+    因此每手棋一次大整数异或就能同时算出 8 个对称局面的哈希。
+
+    Returns:
+        list: keys[player][row * size + col]，为 8 x 64 位打包的整数
+    """
+    keys = _SYMMETRY_KEY_CACHE.get(size)
+    if keys is None:
+        zobrist = get_zobrist_keys(size)
+        maps = get_symmetry_maps(size)
+        keys = [None]
+        for player in (1, 2):
+            packed = []
+            for index in range(size * size):
+                value = 0
+                for symmetry in range(SYMMETRY_COUNT):
+                    value |= zobrist[player][maps[symmetry][index]] << (HASH_BITS * symmetry)
+                packed.append(value)
+            keys.append(packed)
+        _SYMMETRY_KEY_CACHE[size] = keys
+    return keys
+
 
 class Board:
     """Gobang Board Class / 五子棋棋盘类"""
     
+    # 候选点范围：距离任意棋子不超过该半径的空位
+    FRONTIER_RADIUS = 2
+
+    # 按需建立的增量数据（见 __getattr__）
+    _LINE_ATTRIBUTES = ('line_bits',)
+    _FRONTIER_ATTRIBUTES = ('cells', '_near', 'frontier')
+    
     def __init__(self, size=15):
         """
         Initialize board / 初始化棋盘
@@ -19,8 +90,35 @@ class Board:
             size (int): Board size, default 15x15 / 棋盘大小，默认15x15
         """
         self.size = size
-        self.board = np.zeros((size, size), dtype=int)  # 0=空, 1=黑子, 2=白子
-        self.move_history = []  # 记录走棋历史
+        self.reset()
+
+    @classmethod
+    def from_board(cls, other):
+        """
+        从另一个棋盘复制局面（按走棋历史重放）
+        
+        Args:
+            other (Board): 源棋盘
+            
+        Returns:
+            Board: 与源棋盘局面和历史相同的新棋盘
+        """
+        board = cls(other.size)
+        for row, col, player in other.move_history:
+            board.make_move(row, col, player)
+        return board
+
+    def _init_storage(self):
+        """初始化棋子存储（子类可替换为其他表示）"""
+        self.board = np.zeros((self.size, self.size), dtype=int)  # 0=空, 1=黑子, 2=白子
+
+    def _place_stone(self, row, col, player):
+        """在存储中放置棋子（不做合法性检查）"""
+        self.board[row, col] = player
+
+    def _remove_stone(self, row, col, player):
+        """从存储中移除棋子（不做合法性检查）"""
+        self.board[row, col] = 0
         
     def is_valid_move(self, row, col):
         """
@@ -52,7 +150,24 @@ class Board:
         if not self.is_valid_move(row, col):
             return False
             
-        self.board[row, col] = player
+        index = row * self.size + col
+        self._place_stone(row, col, player)
+        self.hash ^= self._zobrist[player][index]
+        if self._track_lines:
+            line_bits = self.line_bits[player]
+            for line_id, bit in self.geometry.cell_updates[index]:
+                line_bits[line_id] ^= bit
+        if self._track_frontier:
+            # 更新候选点：邻居引用计数加一，空邻居进入候选集
+            cells = self.cells
+            near = self._near
+            frontier = self.frontier
+            cells[index] = player
+            frontier.discard(index)
+            for neighbour in self._neighbours[index]:
+                near[neighbour] += 1
+                if not cells[neighbour]:
+                    frontier.add(neighbour)
         self.move_history.append((row, col, player))
         return True
     
@@ -68,7 +183,24 @@ class Board:
             
         last_move = self.move_history.pop()
         row, col, player = last_move
-        self.board[row, col] = 0
+        index = row * self.size + col
+        self._remove_stone(row, col, player)
+        self.hash ^= self._zobrist[player][index]
+        if self._track_lines:
+            line_bits = self.line_bits[player]
+            for line_id, bit in self.geometry.cell_updates[index]:
+                line_bits[line_id] ^= bit
+        if self._track_frontier:
+            # 还原候选点：引用计数归零的邻居离开候选集
+            near = self._near
+            frontier = self.frontier
+            self.cells[index] = 0
+            for neighbour in self._neighbours[index]:
+                near[neighbour] -= 1
+                if not near[neighbour]:
+                    frontier.discard(neighbour)
+            if near[index]:
+                frontier.add(index)
         return last_move
     
     def check_winner(self, row, col, player):
@@ -114,6 +246,96 @@ class Board:
         
         return False
     
+    def line_window(self, row, col, direction, player):
+        """
+        获取以某格为中心、沿某方向的 9 格线路窗口编码（查表即可判断棋型）
+        
+        Args:
+            row (int): 行位置
+            col (int): 列位置
+            direction (int): 方向编号 0=水平, 1=垂直, 2=主对角线, 3=反对角线
+            player (int): 视角玩家 (1=黑子, 2=白子)
+            
+        Returns:
+            int: own | (blocked << 9)，第 4 位为中心格；
+                 blocked 包含对方棋子和棋盘边界。该方向无线路时返回 None
+        """
+        entry = self.geometry.cell_lines[row * self.size + col][direction]
+        if entry is None:
+            return None
+        line_id, offset, edge_mask = entry
+        own = ((self.line_bits[player][line_id] << WINDOW_RADIUS) >> offset) & WINDOW_MASK
+        blocked = ((self.line_bits[3 - player][line_id] << WINDOW_RADIUS) >> offset) & WINDOW_MASK
+        return own | ((blocked | edge_mask) << WINDOW_SIZE)
+    
+    def get_shapes(self, row, col, player):
+        """
+        查表获取某格在四个方向上的棋型（空位时为在此落子后的棋型）
+        
+        Args:
+            row (int): 行位置
+            col (int): 列位置
+            player (int): 视角玩家 (1=黑子, 2=白子)
+            
+        Returns:
+            tuple: 四个方向的棋型编号（见 game.shapes 中的 SHAPE_* 常量）
+        """
+        table = get_shape_table()
+        shapes = []
+        for direction in range(4):
+            window = self.line_window(row, col, direction, player)
+            shapes.append(SHAPE_NONE if window is None else table[window] & SHAPE_BITS)
+        return tuple(shapes)
+    
+    def compute_hash(self):
+        """
+        从头计算当前局面的 Zobrist 哈希（用于校验增量哈希）
+        
+        Returns:
+            int: 64 位哈希值，与 self.hash 相等
+        """
+        value = 0
+        for row, col, player in self.move_history:
+            value ^= self._zobrist[player][row * self.size + col]
+        return value
+
+    def symmetry_hashes(self):
+        """
+        获取当前局面经 8 种对称变换后的 Zobrist 哈希
+
+        只有去重和分级需要对称哈希，因此不在落子时维护，而是按走棋历史现算
+        （每手一次打包键的异或）。
+
+        Returns:
+            tuple: 第 k 项为变换 k（见 game.lines.transform_point）后局面的哈希，第 0 项等于 self.hash
+        """
+        keys = get_symmetry_keys(self.size)
+        size = self.size
+        packed = 0
+        for row, col, player in self.move_history:
+            packed ^= keys[player][row * size + col]
+        return tuple((packed >> (HASH_BITS * symmetry)) & HASH_MASK for symmetry in range(SYMMETRY_COUNT))
+
+    def canonical_hash(self):
+        """
+        获取规范哈希：8 个对称哈希中的最小值，互为旋转/镜像的局面结果相同
+
+        Returns:
+            int: 64 位规范哈希
+        """
+        return min(self.symmetry_hashes())
+
+    def canonical_symmetry(self):
+        """
+        获取把当前局面变换为规范形式的对称变换
+
+        Returns:
+            tuple: (canonical_hash, symmetry)，多个变换并列时取编号最小的
+        """
+        hashes = self.symmetry_hashes()
+        symmetry = min(range(SYMMETRY_COUNT), key=hashes.__getitem__)
+        return hashes[symmetry], symmetry
+    
     def get_board_state(self):
         """
         获取当前棋盘状态
@@ -125,8 +347,63 @@ class Board:
     
     def reset(self):
         """重置棋盘"""
-        self.board = np.zeros((self.size, self.size), dtype=int)
-        self.move_history = []
+        self._init_storage()
+        self.move_history = []  # 记录走棋历史
+        self._zobrist = get_zobrist_keys(self.size)
+        self.hash = 0  # 当前局面的 Zobrist 哈希，随落子/悔棋增量更新
+        # 线路表和候选点按需建立（见 __getattr__），只落子判胜的棋盘不用维护
+        self.geometry = get_line_geometry(self.size)
+        self._neighbours = get_neighbours(self.size, self.FRONTIER_RADIUS)
+        self._track_lines = False
+        self._track_frontier = False
+        for name in self._LINE_ATTRIBUTES + self._FRONTIER_ATTRIBUTES:
+            self.__dict__.pop(name, None)
+
+    def __getattr__(self, name):
+        """
+        线路表和候选点第一次被读取时从走棋历史建立，此后随落子/悔棋增量维护
+
+        Args:
+            name (str): 属性名
+
+        Returns:
+            建立好的属性值
+        """
+        if name in self._LINE_ATTRIBUTES:
+            self._build_lines()
+        elif name in self._FRONTIER_ATTRIBUTES:
+            self._build_frontier()
+        else:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        return self.__dict__[name]
+
+    def _build_lines(self):
+        """建立线路表：line_bits[player][line_id] 为该玩家在此线路上的棋子位掩码"""
+        line_count = len(self.geometry.lines)
+        line_bits = [None, [0] * line_count, [0] * line_count]
+        cell_updates = self.geometry.cell_updates
+        for row, col, player in self.move_history:
+            bits = line_bits[player]
+            for line_id, bit in cell_updates[row * self.size + col]:
+                bits[line_id] |= bit
+        self.line_bits = line_bits
+        self._track_lines = True
+
+    def _build_frontier(self):
+        """建立候选点：cells 为按下标展开的棋子颜色，_near 为邻域内棋子数（都小于 256，用 bytearray 节省内存）"""
+        cell_count = self.size * self.size
+        cells = bytearray(cell_count)
+        near = bytearray(cell_count)
+        for row, col, player in self.move_history:
+            index = row * self.size + col
+            cells[index] = player
+            for neighbour in self._neighbours[index]:
+                near[neighbour] += 1
+        self.cells = cells
+        self._near = near
+        # 距离棋子不超过 FRONTIER_RADIUS 的空位下标
+        self.frontier = {index for index in range(cell_count) if near[index] and not cells[index]}
+        self._track_frontier = True
     
     def is_full(self):
         """
@@ -144,9 +421,18 @@ class Board:
         Returns:
             list: 空位置列表 [(row, col), ...]
         """
-        empty_positions = []
-        for row in range(self.size):
-            for col in range(self.size):
-                if self.board[row, col] == 0:
-                    empty_positions.append((row, col))
-        return empty_positions
\ No newline at end of file
+        rows, cols = np.nonzero(self.board == 0)
+        return list(zip(rows.tolist(), cols.tolist()))
+    
+    def candidate_moves(self):
+        """
+        获取候选落子点（增量维护，无需扫描全盘）
+        
+        Returns:
+            iterable: 候选位置 (row, col)；空棋盘时只有天元
+        """
+        if not self.move_history:
+            center = self.size // 2
+            return iter([(center, center)])
+        size = self.size
+        return (divmod(index, size) for index in self.frontier)
\ No newline at end of file
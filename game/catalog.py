@@ -0,0 +1,133 @@
+"""
+Pattern Catalog
+棋谱目录
+An immutable store of compiled puzzles, indexed by id, difficulty and move count,
+with localized views built lazily once per language
+编译后的不可变棋谱库，按 ID、难度和手数建立索引，本地化视图按语言懒加载且只构建一次
+"""
+
+from collections import namedtuple
+from types import MappingProxyType
+
+# 编译后的棋谱记录（坐标均为 (row, col, player) 元组）
+PatternRecord = namedtuple('PatternRecord', [
+    'id',             # 棋谱 ID
+    'difficulty',     # 难度键：'beginner' / 'intermediate' / 'advanced'
+    'win_moves',      # 几手胜
+    'number',         # 显示用题号
+    'initial_setup',  # 初始局面
+    'moves',          # 走法序列
+])
+
+
+def freeze(value):
+    """把字典和列表递归转换为只读映射和元组"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class PatternCatalog:
+    """Pattern Catalog / 棋谱目录
+
+    记录在构造时编译一次并建立索引；localize(record, language) 返回的
+    本地化字典在第一次访问时冻结并缓存，之后按 ID 读取不再分配内存。
+    """
+
+    def __init__(self, records, localize, listed_ids=None):
+        """
+        初始化棋谱目录
+
+        Args:
+            records (iterable): PatternRecord 序列（保持顺序）
+            localize (callable): localize(record, language) -> dict，生成本地化棋谱数据
+            listed_ids (iterable): 出现在选择列表中的棋谱 ID，默认全部
+        """
+        self._records = {}
+        by_difficulty = {}
+        by_win_moves = {}
+        for record in records:
+            if record.id in self._records:
+                raise ValueError(f"duplicate pattern id / 棋谱 ID 重复: {record.id}")
+            self._records[record.id] = record
+            by_difficulty.setdefault(record.difficulty, []).append(record.id)
+            by_win_moves.setdefault(record.win_moves, []).append(record.id)
+        self.ids = tuple(self._records)
+        self.listed_ids = tuple(listed_ids) if listed_ids is not None else self.ids
+        self._by_difficulty = {key: tuple(ids) for key, ids in by_difficulty.items()}
+        self._by_win_moves = {key: tuple(ids) for key, ids in by_win_moves.items()}
+        self._localize = localize
+        self._views = {}      # language -> {pattern_id: 只读视图}
+        self._listings = {}   # language -> 选择列表
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, pattern_id):
+        return pattern_id in self._records
+
+    def record(self, pattern_id):
+        """按 ID 获取编译后的记录，不存在时返回 None"""
+        return self._records.get(pattern_id)
+
+    def ids_by_difficulty(self, difficulty):
+        """按难度键获取棋谱 ID 元组"""
+        return self._by_difficulty.get(difficulty, ())
+
+    def ids_by_win_moves(self, win_moves):
+        """按几手胜获取棋谱 ID 元组"""
+        return self._by_win_moves.get(win_moves, ())
+
+    def get(self, pattern_id, language):
+        """
+        获取某语言下的只读棋谱数据
+
+        Args:
+            pattern_id (str): 棋谱 ID
+            language (str): 语言
+
+        Returns:
+            Mapping: 棋谱数据（与旧版字典字段相同），不存在时返回 None
+        """
+        views = self._views.get(language)
+        if views is None:
+            views = self._views[language] = {}
+        view = views.get(pattern_id)
+        if view is None:
+            record = self._records.get(pattern_id)
+            if record is None:
+                return None
+            view = views[pattern_id] = freeze(self._localize(record, language))
+        return view
+
+    def views(self, language):
+        """
+        获取某语言下全部棋谱的只读映射 {pattern_id: 棋谱数据}
+
+        Returns:
+            Mapping: 只读映射（保持目录顺序）
+        """
+        return MappingProxyType({pattern_id: self.get(pattern_id, language) for pattern_id in self.ids})
+
+    def listing(self, language):
+        """
+        获取某语言下的选择列表（每种语言只构建一次）
+
+        Returns:
+            tuple: ({'id', 'name', 'difficulty', 'description'}, ...)
+        """
+        listing = self._listings.get(language)
+        if listing is None:
+            entries = []
+            for pattern_id in self.listed_ids:
+                view = self.get(pattern_id, language)
+                entries.append(MappingProxyType({
+                    "id": pattern_id,
+                    "name": view["name"],
+                    "difficulty": view["difficulty"],
+                    "description": view["description"]
+                }))
+            listing = self._listings[language] = tuple(entries)
+        return listing
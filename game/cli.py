@@ -0,0 +1,519 @@
+"""
+Command Line Tools
+命令行工具
+`gobang solve`: stream positions from a file through a process pool of solvers
+and write the results as JSONL in input order
+`gobang solve`：从文件流式读取局面，交给进程池中的求解器，并按输入顺序输出 JSONL 结果
+`gobang import`: stream RenLib / SGF / move-text records into a puzzle collection
+`gobang import`：把 RenLib / SGF / 纯文本棋谱流式导入棋谱集合文件
+`gobang dedup`: report (and optionally drop) puzzles that are rotations / mirrors of each other
+`gobang dedup`：报告（并可去除）互为旋转 / 镜像的重复棋谱
+`gobang validate`: check puzzles in parallel and write a JSON report
+`gobang validate`：并行校验棋谱并输出 JSON 报告
+`gobang generate`: generate N-move-win puzzles by self-play across worker processes
+`gobang generate`：多进程自对弈生成 N 手胜棋谱
+`gobang grade`: rate puzzles by solver effort, incrementally through a cache file
+`gobang grade`：按求解器工作量为棋谱评分，通过缓存文件增量评级
+`gobang replay`: push recorded training-session logs through headless sessions
+`gobang replay`：把录制的训练会话日志交给无界面会话回放
+`gobang serve`: host many training sessions over HTTP / WebSocket
+`gobang serve`：通过 HTTP / WebSocket 承载大量训练会话
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .bitboard import BitBoard
+from .collection import COLLECTION_SUFFIX, PatternCollection, write_collection
+from .generator import generate_collection
+from .grading import DEFAULT_DECOY_NODES, DEFAULT_MAX_NODES, GradeCache, grade_records
+from .importer import FORMATS, import_file, to_pattern_record
+from .pattern import compile_built_in_records
+from .replay import REPLAY_SOLVER_NODES, replay_stream
+from .server import run_server
+from .symmetry import find_duplicates, unique_records
+from .validation import CHECKS, validate_records, validation_report
+from .vcf import VCFSolver
+from .vct import VCTSolver, principal_line
+
+SOLVERS = ('vcf', 'vct')
+
+# 每个工作进程内的求解器（由 _init_worker 创建）
+_worker_solver = None
+
+
+def parse_position(line):
+    """
+    解析一行输入
+
+    支持两种格式：
+      - JSON 对象：{"id": ..., "moves": [[row, col, player], ...], "attacker": 1}
+        （也接受棋谱格式的 "initial_setup"，attacker 可省略）
+      - 纯文本：空格分隔的 "row,col"，从黑子开始轮流落子
+
+    Args:
+        line (str): 一行文本（已去掉首尾空白）
+
+    Returns:
+        dict: {'id': ..., 'moves': [(row, col, player), ...], 'attacker': int 或 None}
+
+    Raises:
+        ValueError: 格式错误
+    """
+    if line.startswith('{'):
+        data = json.loads(line)
+        moves = data.get('moves', data.get('initial_setup'))
+        if moves is None:
+            raise ValueError("missing 'moves' / 缺少 'moves'")
+        moves = [tuple(int(value) for value in move) for move in moves]
+        if any(len(move) != 3 for move in moves):
+            raise ValueError("each move must be [row, col, player] / 每一手必须是 [row, col, player]")
+        if any(move[2] not in (1, 2) for move in moves):
+            raise ValueError("player must be 1 or 2 / 棋子颜色必须是 1 或 2")
+        attacker = data.get('attacker')
+        if attacker not in (None, 1, 2) or isinstance(attacker, bool):
+            raise ValueError("attacker must be 1 or 2 / attacker 必须是 1 或 2")
+        return {'id': data.get('id'), 'moves': moves, 'attacker': attacker}
+
+    moves = []
+    for i, token in enumerate(line.replace(';', ' ').split()):
+        row, col = token.split(',')
+        moves.append((int(row), int(col), 1 if i % 2 == 0 else 2))
+    return {'id': None, 'moves': moves, 'attacker': None}
+
+
+def side_to_move(moves):
+    """根据双方棋子数推断轮到谁走（棋子数相同时黑子先走）"""
+    black = sum(1 for move in moves if move[2] == 1)
+    white = len(moves) - black
+    return 1 if black <= white else 2
+
+
+def _init_worker(solver_name, max_depth, max_nodes, time_limit):
+    """工作进程初始化：每个进程只创建一次求解器"""
+    global _worker_solver
+    _worker_solver = make_solver(solver_name, max_depth, max_nodes, time_limit)
+
+
+def make_solver(solver_name, max_depth=None, max_nodes=None, time_limit=None):
+    """
+    按名称创建求解器
+
+    Args:
+        solver_name (str): 'vcf' 或 'vct'
+        max_depth (int): 进攻方最多的攻击手数，None 使用默认值
+        max_nodes (int): 每个局面的节点预算
+        time_limit (float): 每个局面的时间预算（秒）
+
+    Returns:
+        VCFSolver or VCTSolver: 求解器
+    """
+    solver_class = VCTSolver if solver_name == 'vct' else VCFSolver
+    kwargs = {'max_nodes': max_nodes, 'time_limit': time_limit}
+    if max_depth is not None:
+        kwargs['max_depth'] = max_depth
+    return solver_class(**kwargs)
+
+
+def solve_position(position, solver):
+    """
+    求解单个局面
+
+    Args:
+        position (dict): parse_position 的返回值
+        solver: 求解器
+
+    Returns:
+        dict: {'id', 'attacker', 'result', 'move', 'line', 'nodes', 'time'}
+
+    Raises:
+        ValueError: 局面中有非法落子
+    """
+    board = BitBoard()
+    for row, col, player in position['moves']:
+        if not board.make_move(row, col, player):
+            raise ValueError(f"illegal move / 非法落子: {(row, col, player)}")
+    attacker = position['attacker'] or side_to_move(position['moves'])
+    solved = solver.solve(board, attacker)
+    if 'tree' in solved:
+        line = principal_line(solved['tree'])
+    else:
+        line = solved['line']
+    return {
+        'id': position['id'],
+        'attacker': attacker,
+        'result': solved['result'],
+        'move': list(line[0][:2]) if line else None,
+        'line': [list(move) for move in line],
+        'nodes': solved['nodes'],
+        'time': round(solved['time'], 6)
+    }
+
+
+def _solve_chunk(chunk):
+    """工作进程入口：求解一批 (序号, 文本行)，出错的行返回错误信息而不是中断（任何异常都不会中断整批）"""
+    results = []
+    for number, line in chunk:
+        result = {'line_number': number}
+        try:
+            result.update(solve_position(parse_position(line), _worker_solver))
+        except (ValueError, TypeError, KeyError) as e:
+            result['error'] = str(e)
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        results.append(result)
+    return results
+
+
+def _read_chunks(stream, chunk_size):
+    """把输入流切成 [(行号, 文本), ...] 的小批，跳过空行和 # 注释"""
+    chunk = []
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        chunk.append((number, line))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def solve_stream(stream, output, solver='vcf', workers=None, chunk_size=8,
+                 max_depth=None, max_nodes=None, time_limit=None):
+    """
+    流式批量求解：按输入顺序写出 JSONL 结果
+
+    同时在途的批次数量有上限（workers * 4），因此内存占用与输入大小无关。
+
+    Args:
+        stream: 输入文本流
+        output: 输出文本流
+        solver (str): 'vcf' 或 'vct'
+        workers (int): 工作进程数，默认 CPU 核数
+        chunk_size (int): 每次交给工作进程的局面数
+        max_depth (int): 进攻方最多的攻击手数
+        max_nodes (int): 每个局面的节点预算
+        time_limit (float): 每个局面的时间预算（秒）
+
+    Returns:
+        dict: {'positions': int, 'errors': int, 'time': float, 'positions_per_second': float}
+    """
+    workers = workers or os.cpu_count() or 1
+    window = workers * 4
+    positions = 0
+    errors = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(solver, max_depth, max_nodes, time_limit)) as pool:
+        pending = deque()
+
+        def drain(limit):
+            nonlocal positions, errors
+            while len(pending) > limit:
+                for result in pending.popleft().result():
+                    positions += 1
+                    errors += 'error' in result
+                    output.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+        for chunk in _read_chunks(stream, chunk_size):
+            pending.append(pool.submit(_solve_chunk, chunk))
+            drain(window)
+        drain(0)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'positions': positions,
+        'errors': errors,
+        'time': elapsed,
+        'positions_per_second': positions / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def build_parser():
+    """创建命令行解析器"""
+    parser = argparse.ArgumentParser(prog='gobang', description='Gobang command line tools / 五子棋命令行工具')
+    commands = parser.add_subparsers(dest='command')
+
+    solve = commands.add_parser('solve', help='batch-solve positions / 批量求解局面')
+    solve.add_argument('input', help="positions file (JSONL or 'row,col' text), '-' for stdin / 局面文件，'-' 表示标准输入")
+    solve.add_argument('-o', '--output', default='-', help="JSONL output file, '-' for stdout / 输出文件")
+    solve.add_argument('--solver', choices=SOLVERS, default='vcf', help='solver / 求解器')
+    solve.add_argument('-j', '--workers', type=int, default=None, help='worker processes / 工作进程数')
+    solve.add_argument('--chunk-size', type=int, default=8, help='positions per task / 每个任务的局面数')
+    solve.add_argument('--max-depth', type=int, default=None, help='attacker moves / 进攻方最多手数')
+    solve.add_argument('--max-nodes', type=int, default=200000, help='node budget per position / 每个局面的节点预算')
+    solve.add_argument('--time-limit', type=float, default=None, help='seconds per position / 每个局面的时间预算')
+
+    importer = commands.add_parser('import', help='import game records into a collection / 导入棋谱到集合文件')
+    importer.add_argument('inputs', nargs='+', help='RenLib (.lib), SGF or move-text files / 棋谱文件')
+    importer.add_argument('-o', '--output', required=True, help='collection file (.gpc) / 集合文件')
+    importer.add_argument('--format', choices=FORMATS, default=None, help='input format (default: detect) / 输入格式')
+    importer.add_argument('--solution-plies', type=int, default=1,
+                          help='last plies of each record kept as the moves to find / 每条记录末尾作为解答的手数')
+    importer.add_argument('--dedup', action='store_true',
+                          help='skip rotations / mirrors of earlier records / 跳过与之前记录对称的重复局面')
+
+    dedup = commands.add_parser('dedup', help='find symmetric duplicate puzzles / 查找对称重复的棋谱')
+    dedup.add_argument('inputs', nargs='+', help='collection files (.gpc) or game records / 集合文件或棋谱文件')
+    dedup.add_argument('-o', '--output', default=None, help='write the de-duplicated collection / 写出去重后的集合文件')
+    dedup.add_argument('--translate', action='store_true', help='also ignore translation / 同时忽略平移')
+    dedup.add_argument('--include-moves', action='store_true',
+                       help='only merge puzzles whose solutions also match / 解答也相同才算重复')
+
+    validate = commands.add_parser('validate', help='validate puzzles / 校验棋谱')
+    validate.add_argument('inputs', nargs='*', help='collection files (.gpc) or game records / 集合文件或棋谱文件')
+    validate.add_argument('--built-in', action='store_true', help='also validate the built-in patterns / 同时校验内置棋谱')
+    validate.add_argument('-o', '--output', default='-', help="JSON report file, '-' for stdout / 报告文件")
+    validate.add_argument('--checks', default=','.join(CHECKS),
+                          help='comma-separated checks / 逗号分隔的检查项: ' + ','.join(CHECKS))
+    validate.add_argument('--solver', choices=SOLVERS, default=None,
+                          help='prove each win is forced with this solver / 用求解器确认必胜')
+    validate.add_argument('--max-nodes', type=int, default=200000, help='node budget per puzzle / 每道题的节点预算')
+    validate.add_argument('-j', '--workers', type=int, default=1, help='worker processes (0 = all cores) / 工作进程数')
+    validate.add_argument('--all', action='store_true', help='list valid puzzles in the report too / 报告中也列出通过的棋谱')
+
+    generate = commands.add_parser('generate', help='generate puzzles by self-play / 自对弈生成棋谱')
+    generate.add_argument('-o', '--output', required=True, help='collection file (.gpc) / 集合文件')
+    generate.add_argument('--seed', type=int, default=0, help='random seed / 随机数种子')
+    generate.add_argument('--shards', type=int, default=16, help='number of shards / 分片数')
+    generate.add_argument('--first-shard', type=int, default=0,
+                          help='first shard number, to split a run across machines / 起始分片编号')
+    generate.add_argument('--games', type=int, default=20, help='games per shard / 每个分片的对局数')
+    generate.add_argument('--win-moves', default='2,3', help='comma-separated N of N-move wins / 要收集的几手胜')
+    generate.add_argument('-j', '--workers', type=int, default=None, help='worker processes / 工作进程数')
+
+    grade = commands.add_parser('grade', help='rate puzzle difficulty / 评估棋谱难度')
+    grade.add_argument('inputs', nargs='*', help='collection files (.gpc) or game records / 集合文件或棋谱文件')
+    grade.add_argument('--built-in', action='store_true', help='also grade the built-in patterns / 同时评估内置棋谱')
+    grade.add_argument('-o', '--output', default='-', help="JSONL output file, '-' for stdout / 输出文件")
+    grade.add_argument('--cache', default=None, help='grade cache file (JSON) / 评级缓存文件')
+    grade.add_argument('--relabel', default=None,
+                       help='write a collection with difficulties from the ratings / 按评分写出新的集合文件')
+    grade.add_argument('--max-nodes', type=int, default=DEFAULT_MAX_NODES,
+                       help='node budget per puzzle, about 10 s at the default / 每道题的节点预算，默认约 10 秒')
+    grade.add_argument('--decoy-nodes', type=int, default=DEFAULT_DECOY_NODES,
+                       help='node budget per attacking move checked / 每个攻击手的检查预算')
+    grade.add_argument('-j', '--workers', type=int, default=None, help='worker processes / 工作进程数')
+
+    replay = commands.add_parser('replay', help='replay training-session logs / 回放训练会话日志')
+    replay.add_argument('input', help="session logs (JSONL), '-' for stdin / 会话日志，'-' 表示标准输入")
+    replay.add_argument('-o', '--output', default=None, help="JSONL summaries, '-' for stdout / 摘要输出文件")
+    replay.add_argument('--patterns-dir', default='patterns', help='collection directory / 棋谱集合目录')
+    replay.add_argument('--max-nodes', type=int, default=REPLAY_SOLVER_NODES,
+                        help='solver node budget for off-script moves / 检查非棋谱走法的节点预算')
+    replay.add_argument('--trace', action='store_true', help='include every event / 摘要中包含全部事件')
+    replay.add_argument('-j', '--workers', type=int, default=1, help='worker processes (0 = all cores) / 工作进程数')
+
+    serve = commands.add_parser('serve', help='run the training server / 运行训练服务')
+    serve.add_argument('--host', default='127.0.0.1', help='listen address / 监听地址')
+    serve.add_argument('--port', type=int, default=8765, help='listen port / 监听端口')
+    serve.add_argument('--patterns-dir', default='patterns', help='collection directory / 棋谱集合目录')
+    serve.add_argument('--max-sessions', type=int, default=10000, help='sessions kept at once / 同时保留的会话数')
+    serve.add_argument('--idle-timeout', type=float, default=1800.0, help='seconds before an idle session is closed / 空闲会话保留秒数')
+    return parser
+
+
+def run_import(args):
+    """执行 gobang import：流式导入并写出集合文件，坏记录报告到标准错误"""
+    errors = []
+
+    def report(error):
+        errors.append(error)
+        print(f"Skipped record / 跳过记录 {error}", file=sys.stderr)
+
+    def records():
+        for path in args.inputs:
+            for pattern in import_file(path, args.format, args.solution_plies, report):
+                yield to_pattern_record(pattern)
+
+    duplicates = []
+    source = records()
+    if args.dedup:
+        source = unique_records(source, on_duplicate=lambda record, kept_id: duplicates.append(record.id))
+
+    start = time.perf_counter()
+    written = write_collection(args.output, source)
+    if duplicates:
+        print(f"Dropped / 去除 {len(duplicates)} symmetric duplicates", file=sys.stderr)
+    print(f"Imported / 已导入 {written} records ({len(errors)} skipped) "
+          f"in {time.perf_counter() - start:.2f}s -> {args.output}", file=sys.stderr)
+    return 0
+
+
+def _iter_records(paths):
+    """依次产生多个来源的 PatternRecord：.gpc 集合文件直接读取，其它文件按棋谱导入"""
+    for path in paths:
+        if path.endswith(COLLECTION_SUFFIX):
+            with PatternCollection(path) as collection:
+                yield from collection.records()
+        else:
+            for pattern in import_file(path):
+                yield to_pattern_record(pattern)
+
+
+def run_dedup(args):
+    """执行 gobang dedup：把重复簇报告以 JSON 写到标准输出，可选写出去重后的集合文件"""
+    options = {'translate': args.translate, 'include_moves': args.include_moves}
+    report = find_duplicates(_iter_records(args.inputs), **options)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.output:
+        written = write_collection(args.output, unique_records(_iter_records(args.inputs), **options))
+        print(f"Wrote / 已写入 {written} unique records -> {args.output}", file=sys.stderr)
+    return 0
+
+
+def run_validate(args):
+    """执行 gobang validate：有未通过的棋谱时返回 1"""
+    checks = [check.strip() for check in args.checks.split(',') if check.strip()]
+    unknown = sorted(set(checks) - set(CHECKS))
+    if unknown:
+        print(f"Unknown checks / 未知检查项: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    def records():
+        if args.built_in:
+            yield from compile_built_in_records()
+        yield from _iter_records(args.inputs)
+
+    solver = make_solver(args.solver, max_nodes=args.max_nodes) if args.solver else None
+    report = validation_report(validate_records(records(), solver, checks, workers=args.workers or None),
+                               include_valid=args.all)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        json.dump(report, output, ensure_ascii=False, indent=2)
+        output.write('\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"Validated / 已校验 {report['records']} patterns: {report['valid']} valid, "
+          f"{report['invalid']} invalid in {report['time']:.2f}s", file=sys.stderr)
+    return 1 if report['invalid'] else 0
+
+
+def run_generate(args):
+    """执行 gobang generate：写出集合文件，并在标准错误报告每小时生成的棋谱数"""
+    win_moves = tuple(int(value) for value in args.win_moves.split(','))
+    shards = range(args.first_shard, args.first_shard + args.shards)
+    stats = generate_collection(args.output, shards, workers=args.workers, seed=args.seed,
+                                games=args.games, win_moves=win_moves)
+    print(f"Generated / 已生成 {stats['puzzles']} puzzles ({stats['duplicates']} duplicates dropped) "
+          f"from {stats['games']} games in {stats['time']:.2f}s -> "
+          f"{stats['puzzles_per_hour']:.0f} puzzles/hour -> {args.output}", file=sys.stderr)
+    return 0
+
+
+def run_grade(args):
+    """执行 gobang grade：按输入顺序输出 JSONL 评级结果"""
+    def records():
+        if args.built_in:
+            yield from compile_built_in_records()
+        yield from _iter_records(args.inputs)
+
+    options = {'max_nodes': args.max_nodes, 'decoy_nodes': args.decoy_nodes}
+    cache = GradeCache(args.cache, options)
+    difficulties = {}
+    graded = 0
+    cached = 0
+    start = time.perf_counter()
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        for grade in grade_records(records(), workers=args.workers, cache=cache, **options):
+            graded += 1
+            cached += grade['cached']
+            if grade['rating'] is not None:
+                difficulties[grade['id']] = grade['difficulty']
+            output.write(json.dumps(grade, ensure_ascii=False) + '\n')
+    finally:
+        cache.save()
+        if output is not sys.stdout:
+            output.close()
+
+    if args.relabel:
+        relabelled = (record._replace(difficulty=difficulties.get(record.id, record.difficulty))
+                      for record in records())
+        write_collection(args.relabel, relabelled)
+    print(f"Graded / 已评级 {graded} puzzles ({cached} from cache) "
+          f"in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 0
+
+
+def run_replay(args):
+    """执行 gobang replay：有日志出错或与 expect 不一致时返回 1"""
+    stream = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    output = None
+    if args.output:
+        output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        stats = replay_stream(stream, output, workers=args.workers or None, patterns_dir=args.patterns_dir,
+                              max_nodes=args.max_nodes, trace=args.trace)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if output is not None and output is not sys.stdout:
+            output.close()
+    print(f"Replayed / 已回放 {stats['sessions']} sessions ({stats['complete']} complete, "
+          f"{stats['errors']} errors, {stats['mismatches']} mismatches) in {stats['time']:.2f}s "
+          f"-> {stats['sessions_per_second']:.0f} sessions/s", file=sys.stderr)
+    return 1 if stats['errors'] or stats['mismatches'] else 0
+
+
+def main(argv=None):
+    """
+    命令行入口
+
+    Args:
+        argv (list): 参数列表，默认 sys.argv[1:]
+
+    Returns:
+        int: 退出码
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'import':
+        return run_import(args)
+    if args.command == 'dedup':
+        return run_dedup(args)
+    if args.command == 'validate':
+        return run_validate(args)
+    if args.command == 'generate':
+        return run_generate(args)
+    if args.command == 'grade':
+        return run_grade(args)
+    if args.command == 'replay':
+        return run_replay(args)
+    if args.command == 'serve':
+        run_server(args.host, args.port, patterns_dir=args.patterns_dir,
+                   max_sessions=args.max_sessions, idle_timeout=args.idle_timeout)
+        return 0
+    if args.command != 'solve':
+        parser.print_help()
+        return 2
+
+    stream = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        stats = solve_stream(stream, output, solver=args.solver, workers=args.workers,
+                             chunk_size=args.chunk_size, max_depth=args.max_depth,
+                             max_nodes=args.max_nodes, time_limit=args.time_limit)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"Solved / 已求解 {stats['positions']} positions ({stats['errors']} errors) "
+          f"in {stats['time']:.2f}s -> {stats['positions_per_second']:.1f} positions/s",
+          file=sys.stderr)
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
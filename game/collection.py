@@ -0,0 +1,320 @@
+"""
+Puzzle Collection Files
+棋谱集合文件
+A compact binary format for large puzzle collections: a fixed header, an offset
+index, an id-sorted index and records with one byte per coordinate. Files are
+memory-mapped and a record is decoded only when that puzzle is opened.
+大型棋谱集合的紧凑二进制格式：固定文件头、偏移索引、按 ID 排序的索引，
+以及每个坐标一个字节的记录。文件以内存映射方式打开，只有打开某道题时才解码该记录。
+
+Layout / 布局 (little endian / 小端):
+    header   : magic 'GBPC', version u16, board size u8, flags u8, count u32, reserved u32
+    offsets  : (count + 1) x u32, record i spans offsets[i] .. offsets[i + 1]
+    by_id    : count x u32, record numbers sorted by id bytes (binary search)
+    records  : id_len u8, id utf-8, difficulty u8, win_moves u8, number u16,
+               setup section, moves section
+    section  : count u8, colours u8 (1/2 = alternating from that colour,
+               0 = a bitmap of ceil(count / 8) bytes follows, bit set = white),
+               count x coordinate u8 (row * size + col)
+"""
+
+import mmap
+import os
+import shutil
+import struct
+import sys
+from array import array
+
+from .catalog import PatternRecord
+
+COLLECTION_MAGIC = b'GBPC'
+COLLECTION_VERSION = 1
+COLLECTION_SUFFIX = '.gpc'
+
+HEADER = struct.Struct('<4sHBBII')
+OFFSET = struct.Struct('<I')
+RECORD_INFO = struct.Struct('<BBH')
+
+# 难度编码（未知难度编码为 255）
+DIFFICULTIES = ('beginner', 'intermediate', 'advanced')
+UNKNOWN_DIFFICULTY = 255
+
+
+class CollectionError(ValueError):
+    """集合文件格式错误"""
+
+
+def _encode_section(stones, size):
+    """编码一段棋子序列 [(row, col, player), ...]"""
+    if len(stones) > 255:
+        raise CollectionError("too many stones in one section / 单段棋子过多")
+    colours = [player for _, _, player in stones]
+    first = colours[0] if colours else 1
+    alternating = all(colour == (first if i % 2 == 0 else 3 - first) for i, colour in enumerate(colours))
+    data = bytearray((len(stones), first if alternating else 0))
+    if not alternating:
+        bitmap = bytearray((len(stones) + 7) // 8)
+        for i, colour in enumerate(colours):
+            if colour == 2:
+                bitmap[i >> 3] |= 1 << (i & 7)
+        data += bitmap
+    for row, col, _ in stones:
+        if not (0 <= row < size and 0 <= col < size):
+            raise CollectionError(f"coordinate off board / 坐标越界: {(row, col)}")
+        data.append(row * size + col)
+    return bytes(data)
+
+
+def _decode_section(buffer, position, size):
+    """解码一段棋子序列，返回 (stones, 新位置)"""
+    count, colours = buffer[position], buffer[position + 1]
+    position += 2
+    if colours:
+        players = [colours if i % 2 == 0 else 3 - colours for i in range(count)]
+    else:
+        bitmap = buffer[position:position + (count + 7) // 8]
+        position += len(bitmap)
+        players = [2 if bitmap[i >> 3] >> (i & 7) & 1 else 1 for i in range(count)]
+    coords = buffer[position:position + count]
+    stones = tuple(divmod(coords[i], size) + (players[i],) for i in range(count))
+    return stones, position + count
+
+
+def encode_record(record, size=15):
+    """
+    编码一条棋谱记录
+
+    Args:
+        record (PatternRecord): 棋谱记录
+        size (int): 棋盘大小（不超过 16，保证坐标一个字节）
+
+    Returns:
+        bytes: 记录的二进制数据
+    """
+    pattern_id = record.id.encode('utf-8')
+    if len(pattern_id) > 255:
+        raise CollectionError(f"pattern id too long / 棋谱 ID 过长: {record.id}")
+    if record.difficulty in DIFFICULTIES:
+        difficulty = DIFFICULTIES.index(record.difficulty)
+    else:
+        difficulty = UNKNOWN_DIFFICULTY
+    return b''.join((
+        bytes((len(pattern_id),)), pattern_id,
+        RECORD_INFO.pack(difficulty, record.win_moves, record.number),
+        _encode_section(record.initial_setup, size),
+        _encode_section(record.moves, size),
+    ))
+
+
+def write_collection(path, records, size=15):
+    """
+    写出棋谱集合文件（先写入临时文件再替换，避免读到半个文件）
+
+    记录边编码边写入临时数据文件，内存中只保留每条记录 4 字节的偏移；
+    全部写完后再从数据文件读 ID 排序、生成索引，最后拼接成集合文件。
+    因此可以直接传入生成器，几百 MB 的集合也不会把记录全部留在内存中。
+
+    Args:
+        path (str): 目标路径
+        records (iterable): PatternRecord 序列（可以是生成器）
+        size (int): 棋盘大小
+
+    Returns:
+        int: 写入的记录数
+    """
+    if size > 16:
+        raise CollectionError("board too large for one-byte coordinates / 棋盘过大")
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    data_path = f"{path}.{os.getpid()}.records.tmp"
+    try:
+        # 第一遍：流式写出记录，只记下相对偏移
+        offsets = array('I', [0])
+        with open(data_path, 'wb') as data_file:
+            for record in records:
+                data = encode_record(record, size)
+                data_file.write(data)
+                offsets.append(offsets[-1] + len(data))
+        count = len(offsets) - 1
+
+        with open(data_path, 'rb') as data_file, open(temp_path, 'wb') as f:
+            # 第二遍：从数据文件读 ID，生成按 ID 排序的索引
+            by_id = array('I')
+            if count:
+                with mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    def record_id(index):
+                        start = offsets[index]
+                        return buffer[start + 1:start + 1 + buffer[start]]
+
+                    by_id = array('I', sorted(range(count), key=record_id))
+                    for previous, current in zip(by_id, by_id[1:]):
+                        if record_id(previous) == record_id(current):
+                            raise CollectionError(f"duplicate pattern id / 棋谱 ID 重复: "
+                                                  f"{record_id(current).decode('utf-8')}")
+
+            base = HEADER.size + OFFSET.size * (2 * count + 1)
+            for i in range(len(offsets)):
+                offsets[i] += base
+            if sys.byteorder != 'little':
+                offsets.byteswap()
+                by_id.byteswap()
+            f.write(HEADER.pack(COLLECTION_MAGIC, COLLECTION_VERSION, size, 0, count, 0))
+            offsets.tofile(f)
+            by_id.tofile(f)
+            shutil.copyfileobj(data_file, f)
+        os.replace(temp_path, path)
+    finally:
+        for leftover in (data_path, temp_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    return count
+
+
+class PatternCollection:
+    """Memory-Mapped Puzzle Collection / 内存映射的棋谱集合
+
+    打开时只读取文件头，时间和内存都与题目数量无关；
+    按 ID 查找是在排序索引上二分查找，只解码用到的记录。
+    """
+
+    def __init__(self, path):
+        """
+        打开棋谱集合文件
+
+        Args:
+            path (str): 文件路径
+
+        Raises:
+            CollectionError: 文件格式错误
+        """
+        self.path = path
+        self._buffer = None
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise CollectionError(f"not a puzzle collection / 不是棋谱集合文件: {path}")
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, _, count, _ = HEADER.unpack_from(self._buffer, 0)
+        if magic != COLLECTION_MAGIC or version != COLLECTION_VERSION:
+            self.close()
+            raise CollectionError(f"unsupported collection file / 不支持的集合文件: {path}")
+        self.size = size
+        self.count = count
+        self._by_id_start = HEADER.size + OFFSET.size * (count + 1)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """关闭内存映射"""
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+    def _offset(self, index):
+        """第 index 条记录的起始偏移"""
+        return OFFSET.unpack_from(self._buffer, HEADER.size + OFFSET.size * index)[0]
+
+    def _id_at(self, index):
+        """只解码第 index 条记录的 ID（字节串）"""
+        start = self._offset(index)
+        return self._buffer[start + 1:start + 1 + self._buffer[start]]
+
+    def record_at(self, index):
+        """
+        解码第 index 条记录
+
+        Args:
+            index (int): 记录序号（文件中的顺序）
+
+        Returns:
+            PatternRecord: 棋谱记录
+        """
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        buffer = self._buffer
+        position = self._offset(index)
+        id_length = buffer[position]
+        pattern_id = buffer[position + 1:position + 1 + id_length].decode('utf-8')
+        position += 1 + id_length
+        difficulty, win_moves, number = RECORD_INFO.unpack_from(buffer, position)
+        position += RECORD_INFO.size
+        initial_setup, position = _decode_section(buffer, position, self.size)
+        moves, _ = _decode_section(buffer, position, self.size)
+        difficulty = DIFFICULTIES[difficulty] if difficulty < len(DIFFICULTIES) else 'unknown'
+        return PatternRecord(pattern_id, difficulty, win_moves, number, initial_setup, moves)
+
+    def find(self, pattern_id):
+        """
+        按 ID 二分查找记录序号
+
+        Returns:
+            int: 记录序号，不存在时返回 -1
+        """
+        key = pattern_id.encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            index = OFFSET.unpack_from(self._buffer, self._by_id_start + OFFSET.size * middle)[0]
+            current = self._id_at(index)
+            if current == key:
+                return index
+            if current < key:
+                low = middle + 1
+            else:
+                high = middle
+        return -1
+
+    def __contains__(self, pattern_id):
+        return self.find(pattern_id) >= 0
+
+    def record(self, pattern_id):
+        """按 ID 获取记录，不存在时返回 None"""
+        index = self.find(pattern_id)
+        return self.record_at(index) if index >= 0 else None
+
+    def ids(self):
+        """按文件顺序逐个产生棋谱 ID（不解码棋子）"""
+        for index in range(self.count):
+            yield self._id_at(index).decode('utf-8')
+
+    def records(self):
+        """按文件顺序逐条解码记录"""
+        for index in range(self.count):
+            yield self.record_at(index)
+
+
+def open_collections(directory):
+    """
+    打开目录下所有棋谱集合文件（按文件名排序），目录不存在时返回空列表
+
+    Args:
+        directory (str): 目录
+
+    Returns:
+        list: PatternCollection 列表
+    """
+    if not directory or not os.path.isdir(directory):
+        return []
+    collections = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(COLLECTION_SUFFIX):
+            try:
+                collections.append(PatternCollection(os.path.join(directory, name)))
+            except (OSError, CollectionError) as e:
+                print(f"Failed to open collection / 打开棋谱集合失败 {name}: {e}")
+    return collections
+
+
+if __name__ == "__main__":
+    # 把内置棋谱导出为集合文件：python -m game.collection out.gpc
+    import sys
+    from .pattern import compile_built_in_records
+
+    target = sys.argv[1] if len(sys.argv) > 1 else 'built_in' + COLLECTION_SUFFIX
+    written = write_collection(target, compile_built_in_records())
+    print(f"Wrote / 已写入 {written} patterns -> {target}")
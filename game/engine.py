@@ -0,0 +1,377 @@
+"""
+Alpha-Beta Search Engine
+Alpha-Beta 搜索引擎
+Iterative-deepening principal variation search with a transposition table,
+threat-first move ordering and node/time budgets, usable headlessly or from the GUI
+带置换表、威胁优先走法排序和节点/时间预算的迭代加深主变例搜索，可无界面使用或接入图形界面
+"""
+
+import time
+
+from .bitboard import BitBoard
+from .shapes import SHAPE_BITS, SHAPE_FIVE, SHAPE_FOUR, SHAPE_OPEN_FOUR, get_shape_table
+from .threats import (
+    THREAT_FIVE, THREAT_FOUR, THREAT_OPEN_FOUR, SHAPE_SCORES,
+    cell_entries, entries_score, threat_level,
+)
+
+# 胜负分值：WIN_SCORE - ply 表示 ply 步后获胜
+WIN_SCORE = 1000000
+WIN_THRESHOLD = WIN_SCORE - 1000
+# 静态评估中“有四 / 对方有活四”的估计分值：低于 WIN_THRESHOLD，不当作已证明的胜负
+FOUR_SCORE = WIN_THRESHOLD // 2
+
+# 置换表项类型
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# 置换表键中区分轮到谁走的随机数
+SIDE_KEY = 0x9E3779B97F4A7C15
+
+
+def _score_to_tt(score, ply):
+    """写入置换表前把胜负分值从“距根”换成“距本节点”的步数，其他分值不变"""
+    if score >= WIN_THRESHOLD:
+        return score + ply
+    if score <= -WIN_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    """从置换表读出后把胜负分值换回“距根”的步数（_score_to_tt 的逆变换）"""
+    if score >= WIN_THRESHOLD:
+        return score - ply
+    if score <= -WIN_THRESHOLD:
+        return score + ply
+    return score
+
+
+class SearchTimeout(Exception):
+    """搜索预算耗尽"""
+
+
+class SearchEngine:
+    """Alpha-Beta Search Engine / Alpha-Beta 搜索引擎
+
+    搜索在棋盘的 BitBoard 副本上进行，不会修改传入的棋盘。
+    置换表在多次搜索之间保留，可用 clear() 清空。
+    """
+
+    def __init__(self, max_depth=6, time_limit=1.0, max_nodes=None,
+                 beam_width=12, tt_size=1 << 20):
+        """
+        初始化搜索引擎
+
+        Args:
+            max_depth (int): 迭代加深的最大深度（半步）
+            time_limit (float): 时间预算（秒），None 表示不限
+            max_nodes (int): 节点预算，None 表示不限
+            beam_width (int): 每个节点最多展开的走法数
+            tt_size (int): 置换表最大项数，超出时清空
+        """
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.max_nodes = max_nodes
+        self.beam_width = beam_width
+        self.tt_size = tt_size
+        self.tt = {}
+        self.nodes = 0
+        self._deadline = None
+        self._node_limit = None
+        self._should_stop = None
+        self._table = None
+
+    def clear(self):
+        """清空置换表"""
+        self.tt = {}
+
+    def search(self, board, player=None, time_limit=None, max_nodes=None, max_depth=None, should_stop=None):
+        """
+        为 player 搜索最佳走法
+
+        Args:
+            board (Board): 当前棋盘（不会被修改）
+            player (int): 走棋方，默认根据最后一手推断（空棋盘为黑子）
+            time_limit (float): 本次搜索的时间预算，默认使用引擎设置
+            max_nodes (int): 本次搜索的节点预算，默认使用引擎设置
+            max_depth (int): 本次搜索的最大深度，默认使用引擎设置
+            should_stop (callable): 每 256 个节点调用一次，返回 True 时像预算耗尽一样提前结束
+                                    （用于从其他线程取消搜索）
+
+        Returns:
+            dict: {
+                'move': tuple,     # 最佳走法 (row, col)，无棋可走时为 None
+                'score': int,      # 走棋方视角的分值
+                'depth': int,      # 完成的搜索深度
+                'pv': list,        # 主变例 [(row, col, player), ...]
+                'nodes': int,      # 搜索节点数
+                'time': float,     # 耗时（秒）
+                'nps': float       # 每秒节点数
+            }
+        """
+        if player is None:
+            player = 3 - board.move_history[-1][2] if board.move_history else 1
+        time_limit = self.time_limit if time_limit is None else time_limit
+        max_nodes = self.max_nodes if max_nodes is None else max_nodes
+        max_depth = self.max_depth if max_depth is None else max_depth
+
+        work = BitBoard.from_board(board)
+        self._table = get_shape_table()
+        self.nodes = 0
+        start = time.perf_counter()
+        self._deadline = start + time_limit if time_limit else None
+        self._node_limit = max_nodes
+        self._should_stop = should_stop
+        if len(self.tt) > self.tt_size:
+            self.tt = {}
+
+        best_move = None
+        best_score = 0
+        completed_depth = 0
+        pv = []
+
+        if not self._is_over(work):
+            ordered = self._ordered_moves(work, player, None)
+            if ordered:
+                best_move = ordered[0]
+            try:
+                for depth in range(1, max_depth + 1):
+                    score = self._pvs(work, player, depth, -WIN_SCORE - 1, WIN_SCORE + 1, 0)
+                    completed_depth = depth
+                    best_score = score
+                    entry = self.tt.get(self._key(work, player))
+                    if entry and entry[3] is not None:
+                        best_move = entry[3]
+                    pv = self._principal_variation(work, player, depth)
+                    if abs(score) >= WIN_THRESHOLD:
+                        break
+            except SearchTimeout:
+                # 未完成的一层不可靠（棋盘已由 finally 还原），使用上一层结果
+                pass
+
+        elapsed = time.perf_counter() - start
+        move = divmod(best_move, work.size) if best_move is not None else None
+        return {
+            'move': move,
+            'score': best_score,
+            'depth': completed_depth,
+            'pv': pv,
+            'nodes': self.nodes,
+            'time': elapsed,
+            'nps': self.nodes / elapsed if elapsed > 0 else 0.0
+        }
+
+    def candidate_moves(self, board, player, count=None):
+        """
+        player 最可能的走法：威胁优先排序，置换表中记下的最佳走法排在最前
+
+        Args:
+            board (Board): 当前棋盘（不会被修改）
+            player (int): 走棋方
+            count (int): 最多返回的走法数，None 时返回整个搜索宽度
+
+        Returns:
+            list: [(row, col), ...]
+        """
+        work = BitBoard.from_board(board)
+        if self._is_over(work):
+            return []
+        self._table = get_shape_table()
+        entry = self.tt.get(self._key(work, player))
+        moves = self._ordered_moves(work, player, entry[3] if entry else None)
+        return [divmod(index, work.size) for index in moves[:count]]
+
+    def _key(self, board, player):
+        """置换表键：局面哈希加走棋方"""
+        return board.hash ^ SIDE_KEY if player == 2 else board.hash
+
+    def _is_over(self, board):
+        """检查最后一手是否已经成五"""
+        if not board.move_history:
+            return False
+        row, col, player = board.move_history[-1]
+        return board.check_winner(row, col, player)
+
+    def _tick(self):
+        """节点计数并检查预算"""
+        self.nodes += 1
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            raise SearchTimeout()
+        if not self.nodes & 255:
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                raise SearchTimeout()
+            if self._should_stop is not None and self._should_stop():
+                raise SearchTimeout()
+
+    def _ordered_moves(self, board, player, tt_move):
+        """
+        威胁优先的走法排序
+
+        Returns:
+            list: 格子下标列表；若能直接成五则只返回成五点，
+                  若对方下一手成五则只返回防守点
+        """
+        table = self._table
+        opponent = 3 - player
+        scored = []
+        blocks = []
+        for index in board.frontier:
+            own = cell_entries(board, index, player, table)
+            own_level = threat_level(own)
+            if own_level == THREAT_FIVE:
+                return [index]
+            opp = cell_entries(board, index, opponent, table)
+            opp_level = threat_level(opp)
+            if opp_level == THREAT_FIVE:
+                blocks.append(index)
+                continue
+            score = entries_score(own) * 11 // 10 + entries_score(opp)
+            if own_level >= THREAT_FOUR:
+                score += 50000 if own_level >= THREAT_OPEN_FOUR else 2000
+            if opp_level >= THREAT_OPEN_FOUR:
+                score += 20000
+            scored.append((score, index))
+        if blocks:
+            return blocks
+        scored.sort(reverse=True)
+        moves = [index for _, index in scored[:self.beam_width]]
+        if tt_move is not None and tt_move in board.frontier:
+            if tt_move in moves:
+                moves.remove(tt_move)
+            moves.insert(0, tt_move)
+        if not moves and not board.move_history:
+            center = board.size // 2
+            moves = [center * board.size + center]
+        return moves
+
+    def evaluate(self, board, player):
+        """
+        静态评估（player 视角）：统计双方每颗棋子所在线路的棋型分值
+
+        Args:
+            board (Board): 棋盘
+            player (int): 视角玩家（轮到其走棋）
+
+        Returns:
+            int: 分值
+        """
+        table = self._table or get_shape_table()
+        totals = [0, 0, 0]
+        fours = [False, False, False]
+        open_fours = [False, False, False]
+        size = board.size
+        for row, col, stone in board.move_history:
+            for entry in cell_entries(board, row * size + col, stone, table):
+                shape = entry & SHAPE_BITS
+                if shape == SHAPE_FIVE:
+                    return WIN_SCORE if stone == player else -WIN_SCORE
+                if shape == SHAPE_OPEN_FOUR:
+                    open_fours[stone] = True
+                if shape >= SHAPE_FOUR:
+                    fours[stone] = True
+                totals[stone] += SHAPE_SCORES[shape]
+        opponent = 3 - player
+        # 走棋方有四即可成五；对方有活四则无法防守
+        if fours[player]:
+            return FOUR_SCORE
+        if open_fours[opponent]:
+            return -FOUR_SCORE
+        return totals[player] * 12 // 10 - totals[opponent]
+
+    def _pvs(self, board, player, depth, alpha, beta, ply):
+        """主变例搜索（负极大值形式）"""
+        self._tick()
+        key = self._key(board, player)
+        entry = self.tt.get(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, flag, entry_score, tt_move = entry
+            # 同一局面可能在不同的步数出现（置换表也跨搜索保留），胜负分值要按当前步数还原
+            entry_score = _score_from_tt(entry_score, ply)
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return entry_score
+                if flag == LOWER_BOUND and entry_score >= beta:
+                    return entry_score
+                if flag == UPPER_BOUND and entry_score <= alpha:
+                    return entry_score
+
+        if depth <= 0:
+            return self.evaluate(board, player)
+
+        moves = self._ordered_moves(board, player, tt_move)
+        if not moves:
+            return 0  # 和棋
+
+        original_alpha = alpha
+        best_score = -WIN_SCORE - 1
+        best_move = moves[0]
+        size = board.size
+        first = True
+        for index in moves:
+            row, col = divmod(index, size)
+            board.make_move(row, col, player)
+            try:
+                if board.check_winner(row, col, player):
+                    score = WIN_SCORE - ply - 1
+                elif first:
+                    score = -self._pvs(board, 3 - player, depth - 1, -beta, -alpha, ply + 1)
+                else:
+                    score = -self._pvs(board, 3 - player, depth - 1, -alpha - 1, -alpha, ply + 1)
+                    if alpha < score < beta:
+                        score = -self._pvs(board, 3 - player, depth - 1, -beta, -score, ply + 1)
+            finally:
+                board.undo_move()
+            first = False
+            if score > best_score:
+                best_score = score
+                best_move = index
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.tt[key] = (depth, flag, _score_to_tt(best_score, ply), best_move)
+        return best_score
+
+    def _principal_variation(self, board, player, depth):
+        """沿置换表最佳走法提取主变例"""
+        line = []
+        size = board.size
+        for _ in range(depth):
+            entry = self.tt.get(self._key(board, player))
+            if not entry or entry[3] is None:
+                break
+            row, col = divmod(entry[3], size)
+            if not board.make_move(row, col, player):
+                break
+            line.append((row, col, player))
+            if board.check_winner(row, col, player):
+                break
+            player = 3 - player
+        for _ in line:
+            board.undo_move()
+        return line
+
+
+if __name__ == "__main__":
+    # 简单演示：从天元附近开始自我对弈几手并报告搜索速度
+    demo_board = BitBoard()
+    demo_engine = SearchEngine(max_depth=4, time_limit=1.0)
+    demo_player = 1
+    for _ in range(6):
+        result = demo_engine.search(demo_board, demo_player)
+        if result['move'] is None:
+            break
+        demo_board.make_move(result['move'][0], result['move'][1], demo_player)
+        print(f"player {demo_player}: {result['move']} score={result['score']} "
+              f"depth={result['depth']} nodes={result['nodes']} nps={result['nps']:,.0f}")
+        demo_player = 3 - demo_player
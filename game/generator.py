@@ -0,0 +1,216 @@
+"""
+Self-Play Puzzle Generator
+自对弈棋谱生成器
+Play randomised, engine-guided games and cut each one at the first position where
+the side to move has a shortest forced win of exactly N moves (the VCF line, checked
+against a shorter VCT win); games are grouped into seeded shards so any number of
+worker processes produce the same puzzles
+进行带随机扰动、由引擎引导的对局，在走棋方第一次出现恰好 N 手的最短必胜时截取成题
+（连续冲四给出胜法，再用 VCT 确认没有借助活三的更短胜法）；
+对局按带种子的分片划分，因此无论使用多少个工作进程，生成的棋谱都相同
+"""
+
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .bitboard import BitBoard
+from .catalog import PatternRecord
+from .collection import DIFFICULTIES, write_collection
+from .engine import SearchEngine
+from .symmetry import unique_records
+from .vcf import RESULT_WIN, VCFSolver
+from .vct import RESULT_DISPROVEN, VCTSolver
+
+# 开局随机落子的区域（以天元为中心的 5x5）
+OPENING_RADIUS = 2
+
+
+def puzzle_difficulty(win_moves):
+    """按几手胜给出难度键：1 手初级、2 手中级、3 手及以上高级"""
+    return DIFFICULTIES[min(win_moves, len(DIFFICULTIES)) - 1]
+
+
+def _is_shortest_win(board, player, win_moves, checker):
+    """
+    确认 player 没有比 win_moves 手更短的连续攻击必胜
+
+    VCF 迭代加深只保证没有更短的连续冲四；借助活三的胜法可能更短，
+    因此用 VCT 在少一手的深度内求解，只有明确反证时才确认（预算耗尽按不确定处理）。
+
+    Args:
+        board (Board): 局面（轮到 player 走）
+        player (int): 进攻方
+        win_moves (int): VCF 给出的几手胜（含成五的一手）
+        checker (VCTSolver): 求解器，max_depth 会被改为 win_moves - 2
+
+    Returns:
+        bool: 确认 win_moves 是最短胜法
+    """
+    if win_moves < 3:
+        # 一手胜不可能更短；两手胜更短只能是直接成五，VCF 已经排除
+        return True
+    checker.max_depth = win_moves - 2
+    return checker.solve(board, player)['result'] == RESULT_DISPROVEN
+
+
+def _choose_move(board, player, rng, engine, noise, opening_plies):
+    """
+    选择自对弈的下一手
+
+    前 opening_plies 手在中心区域随机落子；之后以 noise 的概率从候选点中随机选，
+    否则使用引擎的最佳走法。
+
+    Returns:
+        tuple: (row, col)，无棋可走时为 None
+    """
+    ply = len(board.move_history)
+    if ply < opening_plies:
+        centre = board.size // 2
+        empty = [(row, col)
+                 for row in range(centre - OPENING_RADIUS, centre + OPENING_RADIUS + 1)
+                 for col in range(centre - OPENING_RADIUS, centre + OPENING_RADIUS + 1)
+                 if board.is_valid_move(row, col)]
+        return rng.choice(empty) if empty else None
+    if rng.random() < noise and board.frontier:
+        return divmod(rng.choice(sorted(board.frontier)), board.size)
+    return engine.search(board, player)['move']
+
+
+def generate_shard(shard, seed=0, games=20, win_moves=(2, 3), noise=0.2, opening_plies=4,
+                   max_plies=80, engine_nodes=400, solver_nodes=5000):
+    """
+    生成一个分片的棋谱（工作进程入口，也可以直接调用）
+
+    分片 k 的随机数种子为 "seed:k"，所以结果只由 (seed, shard) 决定。
+
+    Args:
+        shard (int): 分片编号
+        seed (int): 总随机数种子
+        games (int): 本分片的对局数
+        win_moves (tuple): 要收集的几手胜
+        noise (float): 随机落子的概率
+        opening_plies (int): 开局随机落子的手数
+        max_plies (int): 每局最多手数
+        engine_nodes (int): 引擎每手的节点预算
+        solver_nodes (int): 求解器每个局面的节点预算（VCF 和检查更短胜法的 VCT 各自使用）
+
+    Returns:
+        dict: {'shard', 'games', 'positions', 'puzzles': [PatternRecord, ...], 'time'}
+    """
+    start = time.perf_counter()
+    rng = random.Random(f"{seed}:{shard}")
+    engine = SearchEngine(max_depth=2, time_limit=None, max_nodes=engine_nodes, beam_width=8)
+    # 求解器深度按冲四手数计算，最后成五的一手不计入
+    solver = VCFSolver(max_depth=max(max(win_moves) - 1, 1), max_nodes=solver_nodes)
+    checker = VCTSolver(max_nodes=solver_nodes)
+    puzzles = []
+    positions = 0
+
+    for game in range(games):
+        board = BitBoard()
+        player = 1
+        engine.clear()
+        while len(board.move_history) < max_plies:
+            positions += 1
+            solved = solver.solve(board, player)
+            if solved['result'] == RESULT_WIN:
+                # 迭代加深得到的是最短连续冲四，进攻方手数即为几手胜；再排除借助活三的更短胜法
+                moves = (len(solved['line']) + 1) // 2
+                if moves in win_moves and _is_shortest_win(board, player, moves, checker):
+                    puzzles.append(PatternRecord(
+                        f"gen_{seed}_{shard}_{game}", puzzle_difficulty(moves), moves, 0,
+                        tuple(board.move_history), tuple(solved['line'])))
+                break
+            move = _choose_move(board, player, rng, engine, noise, opening_plies)
+            if move is None:
+                break
+            board.make_move(move[0], move[1], player)
+            if board.check_winner(move[0], move[1], player):
+                break
+            player = 3 - player
+
+    return {
+        'shard': shard,
+        'games': games,
+        'positions': positions,
+        'puzzles': puzzles,
+        'time': time.perf_counter() - start
+    }
+
+
+def _generate_shard(args):
+    """进程池入口：解包 (shard, options)"""
+    shard, options = args
+    return generate_shard(shard, **options)
+
+
+def generate_shards(shards, workers=None, **options):
+    """
+    按分片顺序逐个产生分片结果
+
+    workers 为 1 时在当前进程中执行；否则使用进程池，同时在途的分片数有上限（workers * 4）。
+
+    Args:
+        shards (iterable): 分片编号
+        workers (int): 工作进程数，None 表示 CPU 核数
+        **options: 传给 generate_shard 的参数
+
+    Yields:
+        dict: generate_shard 的结果
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for shard in shards:
+            yield generate_shard(shard, **options)
+        return
+
+    window = workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for shard in shards:
+            pending.append(pool.submit(_generate_shard, (shard, options)))
+            while len(pending) > window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def generate_collection(path, shards, workers=None, **options):
+    """
+    生成棋谱并写入集合文件（跨分片去除对称重复，题号按写入顺序编号）
+
+    Args:
+        path (str): 集合文件路径
+        shards (iterable): 分片编号
+        workers (int): 工作进程数
+        **options: 传给 generate_shard 的参数
+
+    Returns:
+        dict: {'shards', 'games', 'positions', 'puzzles', 'duplicates', 'time', 'puzzles_per_hour'}
+    """
+    stats = {'shards': 0, 'games': 0, 'positions': 0, 'puzzles': 0, 'duplicates': 0}
+    start = time.perf_counter()
+
+    def records():
+        for result in generate_shards(shards, workers, **options):
+            stats['shards'] += 1
+            stats['games'] += result['games']
+            stats['positions'] += result['positions']
+            yield from result['puzzles']
+
+    def count_duplicate(record, kept_id):
+        stats['duplicates'] += 1
+
+    def numbered(unique):
+        # 题号在集合文件中占两个字节
+        for number, record in enumerate(unique, 1):
+            yield record._replace(number=min(number, 0xFFFF))
+
+    stats['puzzles'] = write_collection(path, numbered(unique_records(records(), on_duplicate=count_duplicate)))
+    elapsed = time.perf_counter() - start
+    stats['time'] = elapsed
+    stats['puzzles_per_hour'] = stats['puzzles'] * 3600 / elapsed if elapsed > 0 else 0.0
+    return stats
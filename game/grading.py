@@ -0,0 +1,266 @@
+"""
+Puzzle Difficulty Grading
+棋谱难度评级
+Rate each puzzle by how hard the solver has to work: proof length, nodes to proof,
+how many replies the defender has along the proof, and how many tempting threats
+do not win; grades are cached per canonical position hash so re-grading is incremental
+按求解器的工作量为棋谱评分：证明长度、证明所需节点数、证明中防守方的应手数，
+以及看似有力却不能取胜的诱着数量；评级结果按局面的规范哈希缓存，重新评级时只计算新局面
+"""
+
+import json
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .bitboard import BitBoard
+from .shapes import get_shape_table
+from .threats import THREAT_THREE, find_threat_moves
+from .vcf import pattern_start
+from .vct import RESULT_DISPROVEN, RESULT_PROVEN, VCTSolver
+
+# 评级算法版本，修改评分公式或进攻方规则后需要递增（旧缓存随之失效）
+GRADER_VERSION = 3
+
+# 默认节点预算。VCT 求解器每秒约 2 万节点：整题预算 20 万节点即每道题最多约 10 秒，
+# 每个攻击手 2000 节点约 0.1 秒；批量评级请用 -j 并行、用 --cache 增量评级
+DEFAULT_MAX_NODES = 200000
+DEFAULT_DECOY_NODES = 2000
+
+# 评分 = 基础分 + 各项指标 x 权重
+RATING_BASE = 800
+RATING_WEIGHTS = {
+    'win_moves': 200,   # 证明树中进攻方最多的手数（超过 1 手的部分）
+    'effort': 40,       # log2(证明节点数)
+    'branching': 120,   # 防守方平均应手数（超过 1 的部分）
+    'decoys': 30,       # 不能取胜的攻击手
+    'solutions': -160,  # log2(制胜第一手数)（解法越多越容易）
+}
+
+# 评分对应的难度键：低于阈值即为该难度，其余为 'advanced'
+RATING_LEVELS = ((1200, 'beginner'), (1600, 'intermediate'))
+
+# 每个工作进程内的评级参数（由 _init_worker 设置）
+_worker_options = {}
+
+
+def rating_difficulty(rating):
+    """把评分转换为难度键，无法评分时为 'unknown'"""
+    if rating is None:
+        return 'unknown'
+    for limit, difficulty in RATING_LEVELS:
+        if rating < limit:
+            return difficulty
+    return 'advanced'
+
+
+def _tree_stats(tree, is_or=True, attacker_moves=0):
+    """
+    统计证明树
+
+    Returns:
+        tuple: (进攻方最多手数, 有应手的防守节点数, 防守方应手总数)
+    """
+    depth = attacker_moves
+    and_nodes = 0
+    replies = 0
+    if not is_or and tree['children']:
+        and_nodes = 1
+        replies = len(tree['children'])
+    for child in tree['children']:
+        child_depth, child_nodes, child_replies = _tree_stats(
+            child, not is_or, attacker_moves + (1 if is_or else 0))
+        depth = max(depth, child_depth)
+        and_nodes += child_nodes
+        replies += child_replies
+    return depth, and_nodes, replies
+
+
+def grade_position(board, attacker, max_depth=10, max_nodes=DEFAULT_MAX_NODES, decoy_nodes=DEFAULT_DECOY_NODES):
+    """
+    评估一个局面（轮到进攻方走棋）的难度
+
+    耗时上限约为 (max_nodes + 攻击手数 x decoy_nodes) / 每秒节点数（见 DEFAULT_MAX_NODES）。
+
+    Args:
+        board (Board): 局面（不会被修改）
+        attacker (int): 进攻方
+        max_depth (int): 求解器的最大攻击手数
+        max_nodes (int): 求解整个局面的节点预算
+        decoy_nodes (int): 检查每个攻击手是否制胜的节点预算
+
+    Returns:
+        dict: {'result', 'rating', 'difficulty', 'win_moves', 'nodes', 'branching',
+               'replies', 'threats', 'solutions', 'decoys'}；未证明必胜时 rating 为 None
+    """
+    solver = VCTSolver(max_depth=max_depth, max_nodes=max_nodes)
+    solved = solver.solve(board, attacker)
+    grade = {'result': solved['result'], 'rating': None, 'difficulty': 'unknown', 'win_moves': 0,
+             'nodes': solved['nodes'], 'branching': 0.0, 'replies': 0,
+             'threats': 0, 'solutions': 0, 'decoys': 0}
+    if solved['result'] != RESULT_PROVEN:
+        return grade
+
+    win_moves, and_nodes, replies = _tree_stats(solved['tree'])
+    branching = replies / and_nodes if and_nodes else 1.0
+
+    # 逐个检查进攻方的攻击手：制胜的算作解法，被反证的算作诱着。
+    # 沿用整题求解的置换表（根局面相同，表项仍然有效），证明中已经搜过的攻击手几乎不用再算
+    solver.max_nodes = decoy_nodes
+    threats = find_threat_moves(board, attacker, THREAT_THREE, get_shape_table())
+    solutions = 0
+    decoys = 0
+    for _, index, _ in threats:
+        result = solver.solve_move(board, attacker, divmod(index, board.size))['result']
+        solutions += result == RESULT_PROVEN
+        decoys += result == RESULT_DISPROVEN
+    solutions = max(solutions, 1)
+
+    rating = (RATING_BASE
+              + RATING_WEIGHTS['win_moves'] * (win_moves - 1)
+              + RATING_WEIGHTS['effort'] * math.log2(max(solved['nodes'], 1))
+              + RATING_WEIGHTS['branching'] * (branching - 1)
+              + RATING_WEIGHTS['decoys'] * decoys
+              + RATING_WEIGHTS['solutions'] * math.log2(solutions))
+    rating = max(int(round(rating)), 0)
+    grade.update({'rating': rating, 'difficulty': rating_difficulty(rating), 'win_moves': win_moves,
+                  'branching': round(branching, 3), 'replies': replies,
+                  'threats': len(threats), 'solutions': solutions, 'decoys': decoys})
+    return grade
+
+
+def grade_key(board, attacker):
+    """缓存键：规范哈希（旋转、镜像的局面共用）加进攻方"""
+    return f"{board.canonical_hash():016x}:{attacker}"
+
+
+class GradeCache:
+    """Grade Cache / 评级缓存
+
+    JSON 文件，保存 {缓存键: 评级}；评级算法版本或求解参数不同时整体失效。
+    """
+
+    def __init__(self, path=None, settings=None):
+        """
+        打开（或新建）缓存
+
+        Args:
+            path (str): 缓存文件路径，None 表示只在内存中缓存
+            settings (dict): 影响评级结果的参数（与版本号一起写入文件）
+        """
+        self.path = path
+        self.settings = dict(settings or {}, version=GRADER_VERSION)
+        self.grades = {}
+        self.dirty = False
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring grade cache / 忽略评级缓存 {path}: {e}")
+                return
+            if data.get('settings') == self.settings:
+                self.grades = data.get('grades', {})
+
+    def __len__(self):
+        return len(self.grades)
+
+    def get(self, key):
+        """获取缓存的评级，不存在时返回 None"""
+        return self.grades.get(key)
+
+    def put(self, key, grade):
+        """写入评级"""
+        self.grades[key] = grade
+        self.dirty = True
+
+    def save(self):
+        """写回缓存文件（先写临时文件再替换）"""
+        if not self.path or not self.dirty:
+            return
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'settings': self.settings, 'grades': self.grades}, f)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+
+def _init_worker(options):
+    """工作进程初始化：保存评级参数"""
+    global _worker_options
+    _worker_options = options
+
+
+def _grade_chunk(chunk):
+    """工作进程入口：评估一批 (走棋历史, 进攻方)"""
+    grades = []
+    for moves, attacker in chunk:
+        board = BitBoard()
+        for row, col, player in moves:
+            board.make_move(row, col, player)
+        grades.append(grade_position(board, attacker, **_worker_options))
+    return grades
+
+
+def grade_records(records, workers=1, cache=None, chunk_size=4, **options):
+    """
+    批量评级，按输入顺序逐条产生结果；已缓存的局面不再计算
+
+    Args:
+        records (iterable): PatternRecord 序列
+        workers (int): 工作进程数，None 表示 CPU 核数，1 表示在当前进程中执行
+        cache (GradeCache): 评级缓存，None 表示不缓存
+        chunk_size (int): 每次交给工作进程的局面数
+        **options: 传给 grade_position 的参数
+
+    Yields:
+        dict: {'id', 'key', 'cached': bool, ...grade_position 的字段}（没有走法的棋谱被跳过）
+    """
+    cache = cache if cache is not None else GradeCache(settings=options)
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(options,)) if workers > 1 else None
+    pending = deque()   # (批次条目, future 或已算好的评级列表)
+
+    def finish(entries, grades):
+        grades = iter(grades)
+        for record_id, key, grade, position in entries:
+            cached = grade is not None
+            if not cached:
+                grade = next(grades)
+                cache.put(key, grade)
+            yield dict(grade, id=record_id, key=key, cached=cached)
+
+    def submit(entries):
+        todo = [position for _, _, grade, position in entries if grade is None]
+        if pool is None:
+            _init_worker(options)
+            pending.append((entries, _grade_chunk(todo)))
+        else:
+            pending.append((entries, pool.submit(_grade_chunk, todo)))
+
+    def drain(limit):
+        while len(pending) > limit:
+            entries, result = pending.popleft()
+            yield from finish(entries, result if isinstance(result, list) else result.result())
+
+    try:
+        entries = []
+        for record in records:
+            board, attacker = pattern_start(record._asdict(), BitBoard)
+            if attacker is None:
+                continue
+            key = grade_key(board, attacker)
+            grade = cache.get(key)
+            entries.append((record.id, key, grade, (tuple(board.move_history), attacker)))
+            if len(entries) >= chunk_size:
+                submit(entries)
+                entries = []
+                yield from drain(workers * 4)
+        if entries:
+            submit(entries)
+        yield from drain(0)
+    finally:
+        if pool is not None:
+            pool.shutdown()
@@ -0,0 +1,191 @@
+"""
+Graded Hints
+分级提示
+Explain the move the player should find in four steps of increasing detail -
+the kind of threat it makes (or stops), the line it lies on, a shortlist of
+candidate points and finally the exact move - from a threat analysis of the
+position; results are cached per position hash so repeated hints are free
+用四级由浅入深的提示引导玩家找到应走的一手：这手棋形成（或阻止）的威胁类型、
+所在的线路方向、候选点短名单、最后是具体走法；提示来自局面的威胁分析，
+按局面哈希缓存，重复请求不再计算
+"""
+
+from .bitboard import BitBoard
+from .engine import SearchEngine
+from .lines import DIRECTIONS
+from .shapes import SHAPE_BITS
+from .threats import (
+    THREAT_FOUR, THREAT_NAMES, THREAT_THREE, cell_entries, entries_score, threat_level,
+)
+
+# 提示级别
+HINT_THREAT = 1        # 威胁类型：进攻形成什么 / 防守挡住什么
+HINT_DIRECTION = 2     # 关键线路的方向和区域
+HINT_CANDIDATES = 3    # 包含正确走法的候选点
+HINT_MOVE = 4          # 具体走法
+HINT_LEVELS = HINT_MOVE
+
+# 提示的目的
+PURPOSE_ATTACK = 'attack'
+PURPOSE_DEFEND = 'defend'
+PURPOSE_DEVELOP = 'develop'     # 没有冲四活三：加强自己的棋形
+PURPOSE_RESTRICT = 'restrict'   # 没有冲四活三：限制对方的棋形
+
+# 与 lines.DIRECTIONS 对应的方向名称
+DIRECTION_NAMES = ('horizontal', 'vertical', 'diagonal', 'anti_diagonal')
+
+
+class HintProvider:
+    """Hint Provider / 提示生成器
+
+    analyse() 给出某一手的提示信息（目标走法未知时先用搜索引擎找出最佳走法），
+    按 (局面哈希, 玩家, 目标走法) 缓存；多个会话可以共享同一个提示生成器。
+    """
+
+    # 缓存的最大项数，超出时清空
+    CACHE_SIZE = 4096
+
+    def __init__(self, engine=None, candidates=4, search_time=0.5):
+        """
+        初始化提示生成器
+
+        Args:
+            engine (SearchEngine): 目标走法未知时用来搜索最佳走法的引擎，None 时按需新建
+            candidates (int): 候选点短名单的长度（含正确走法）
+            search_time (float): 搜索最佳走法的时间预算（秒）
+        """
+        self.engine = engine
+        self.candidates = candidates
+        self.search_time = search_time
+        self._cache = {}
+        # 统计：缓存命中 / 实际分析次数
+        self.cache_hits = 0
+        self.analysed = 0
+
+    def analyse(self, board, player, move=None, should_stop=None):
+        """
+        分析 player 在 board 上应走的一手
+
+        Args:
+            board (Board): 当前局面（不会被修改）
+            player (int): 走棋方
+            move (tuple): 应走的一手 (row, col)，None 时用搜索引擎找出
+            should_stop (callable): 搜索的停止检查
+
+        Returns:
+            dict: {
+                'move': tuple,         # 应走的一手 (row, col)
+                'purpose': str,        # 'attack' / 'defend' / 'develop' / 'restrict'
+                'threat': str,         # 形成（进攻）或阻止（防守）的威胁，THREAT_NAMES 中的名称
+                'direction': str,      # 关键线路方向，DIRECTION_NAMES 中的名称
+                'candidates': list     # 按坐标排序的候选点 [(row, col), ...]，包含应走的一手
+            }
+            搜索被停止或无棋可走时为 None
+        """
+        key = (board.hash, len(board.move_history), player, move)
+        info = self._cache.get(key)
+        if info is not None:
+            self.cache_hits += 1
+            return info
+        work = BitBoard.from_board(board)
+        if move is None:
+            if self.engine is None:
+                self.engine = SearchEngine()
+            result = self.engine.search(work, player, time_limit=self.search_time, should_stop=should_stop)
+            if result['move'] is None or (should_stop is not None and should_stop()):
+                return None
+            move = result['move']
+        info = self._describe(work, player, tuple(move))
+        self.analysed += 1
+        if len(self._cache) >= self.CACHE_SIZE:
+            self._cache.clear()
+        self._cache[key] = info
+        return info
+
+    def _describe(self, board, player, move):
+        """用棋型表分析目标走法"""
+        index = move[0] * board.size + move[1]
+        own = cell_entries(board, index, player)
+        opp = cell_entries(board, index, 3 - player)
+        own_level = threat_level(own)
+        opp_level = threat_level(opp)
+        # 自己能冲四就进攻；否则对方在这里能冲四（或成五）就必须防守；活三同理；
+        # 都没有时按哪一方在这里的棋形更好，分为加强自己和限制对方
+        if own_level >= THREAT_FOUR:
+            purpose, level, entries = PURPOSE_ATTACK, own_level, own
+        elif opp_level >= THREAT_FOUR:
+            purpose, level, entries = PURPOSE_DEFEND, opp_level, opp
+        elif own_level >= THREAT_THREE:
+            purpose, level, entries = PURPOSE_ATTACK, own_level, own
+        elif opp_level >= THREAT_THREE:
+            purpose, level, entries = PURPOSE_DEFEND, opp_level, opp
+        elif entries_score(opp) > entries_score(own):
+            purpose, level, entries = PURPOSE_RESTRICT, opp_level, opp
+        else:
+            purpose, level, entries = PURPOSE_DEVELOP, own_level, own
+        direction = max(range(len(DIRECTIONS)), key=lambda d: (entries[d] & SHAPE_BITS, -d))
+        return {
+            'move': move,
+            'purpose': purpose,
+            'threat': THREAT_NAMES[level],
+            'direction': DIRECTION_NAMES[direction],
+            'candidates': self._shortlist(board, player, index),
+        }
+
+    def _shortlist(self, board, player, index):
+        """候选点：攻防分值最高的几个空位，保证包含目标走法，按坐标排序不泄露顺序"""
+        scored = []
+        for cell in board.frontier:
+            if cell == index:
+                continue
+            own = cell_entries(board, cell, player)
+            opp = cell_entries(board, cell, 3 - player)
+            scored.append((-entries_score(own) - entries_score(opp), cell))
+        scored.sort()
+        cells = [cell for _, cell in scored[:self.candidates - 1]] + [index]
+        return sorted(divmod(cell, board.size) for cell in cells)
+
+
+def hint_message(info, level, get_text, format_position, board_size=15):
+    """
+    生成某一级提示的文字
+
+    Args:
+        info (dict): HintProvider.analyse 的返回值
+        level (int): 提示级别 HINT_THREAT ~ HINT_MOVE
+        get_text (callable): 翻译函数 get_text(key, *args)
+        format_position (callable): 坐标格式化函数 format_position(row, col)
+        board_size (int): 棋盘路数（方向提示中的区域）
+
+    Returns:
+        str: 提示文字
+    """
+    if level <= HINT_THREAT:
+        if info['purpose'] in (PURPOSE_DEVELOP, PURPOSE_RESTRICT):
+            return get_text('hint_' + info['purpose'])
+        threat = get_text('threat_' + info['threat'])
+        return get_text('hint_attack' if info['purpose'] == PURPOSE_ATTACK else 'hint_defend', threat)
+    if level == HINT_DIRECTION:
+        row, col = info['move']
+        return get_text('hint_direction', get_text('direction_' + info['direction']),
+                        area_text(row, col, board_size, get_text))
+    if level == HINT_CANDIDATES:
+        return get_text('hint_candidates', ', '.join(format_position(row, col) for row, col in info['candidates']))
+    return get_text('hint_play_at', format_position(*info['move']))
+
+
+def area_text(row, col, board_size, get_text):
+    """把棋盘分成九宫格，给出 (row, col) 所在区域的文字"""
+    if row < board_size // 3:
+        row_region = get_text('area_upper')
+    elif row < 2 * board_size // 3:
+        row_region = get_text('area_middle')
+    else:
+        row_region = get_text('area_lower')
+    if col < board_size // 3:
+        col_region = get_text('area_left')
+    elif col < 2 * board_size // 3:
+        col_region = get_text('area_center')
+    else:
+        col_region = get_text('area_right')
+    return get_text('area_hint', row_region, col_region)
@@ -0,0 +1,353 @@
+"""
+Game Record Importer
+棋谱导入器
+Stream RenLib (.lib), SGF (GM[4]) and plain move-text files through a generator
+pipeline, turning each record into the initial_setup / moves structure used by PatternManager
+以生成器流水线流式读取 RenLib (.lib)、SGF (GM[4]) 和纯文本走法文件，
+把每条记录转换为 PatternManager 使用的 initial_setup / moves 结构
+
+Files are read incrementally, so memory stays bounded by the longest single record.
+文件按块增量读取，内存占用只取决于最长的单条记录。
+"""
+
+import os
+import sys
+
+from .catalog import PatternRecord
+from .pattern import coord_to_pos
+
+BOARD_SIZE = 15
+READ_CHUNK = 1 << 16
+
+# RenLib 节点标志
+RENLIB_HEADER = b'\xffRenLib'
+RENLIB_HEADER_SIZE = 20
+RENLIB_DOWN = 0x80         # 下一个节点是本节点的子节点
+RENLIB_RIGHT = 0x40        # 本节点的子树之后还有兄弟节点
+RENLIB_OLD_COMMENT = 0x20  # 后面跟一段旧格式注释
+RENLIB_COMMENT = 0x08      # 后面跟一段注释
+RENLIB_EXTENSION = 0x01    # 后面跟两个字节的扩展标志
+RENLIB_BOARD_TEXT = 0x01   # 扩展标志：后面跟一段棋盘文字
+
+FORMATS = ('renlib', 'sgf', 'text')
+
+
+class RecordError(ValueError):
+    """单条记录无法导入（记录会被跳过）"""
+
+    def __init__(self, source, position, message):
+        """
+        Args:
+            source (str): 来源文件名
+            position (str): 记录在文件中的位置（行号 / 序号）
+            message (str): 错误说明
+        """
+        super().__init__(f"{source}:{position}: {message}")
+        self.source = source
+        self.position = position
+        self.message = message
+
+
+def detect_format(path):
+    """根据文件头和扩展名判断格式：'renlib' / 'sgf' / 'text'"""
+    with open(path, 'rb') as f:
+        head = f.read(len(RENLIB_HEADER))
+    if head == RENLIB_HEADER or path.lower().endswith('.lib'):
+        return 'renlib'
+    if path.lower().endswith('.sgf'):
+        return 'sgf'
+    return 'text'
+
+
+def iter_text(stream, source='<text>'):
+    """
+    读取纯文本走法：每行一局，如 "H8 I8 G8"，黑白轮流（# 开头为注释）
+
+    Yields:
+        dict 或 RecordError: {'id', 'setup', 'sequence'}
+    """
+    for number, line in enumerate(stream, 1):
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        try:
+            sequence = []
+            for i, token in enumerate(line.replace(',', ' ').split()):
+                pos = coord_to_pos(token)
+                if pos is None or not token[0].isalpha():
+                    raise ValueError(f"bad coordinate / 坐标错误: {token}")
+                sequence.append(pos + (1 if i % 2 == 0 else 2,))
+        except ValueError as e:
+            yield RecordError(source, number, str(e))
+            continue
+        yield {'id': f"{os.path.basename(source)}:{number}", 'setup': [], 'sequence': sequence}
+
+
+def _skip_text(stream):
+    """跳过一段以 0 结尾、按两字节对齐的 RenLib 文本（不保留内容）"""
+    length = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            raise EOFError("unterminated text / 文本未结束")
+        length += 1
+        if byte == b'\x00':
+            break
+    if length % 2:
+        stream.read(1)
+
+
+def iter_renlib(stream, source='<renlib>'):
+    """
+    读取 RenLib 二进制库：用栈遍历变化树，每个叶子节点输出一条从根到叶的走法
+
+    Args:
+        stream: 以二进制方式打开的文件
+
+    Yields:
+        dict 或 RecordError: {'id', 'setup', 'sequence'}
+    """
+    header = stream.read(RENLIB_HEADER_SIZE)
+    if not header.startswith(RENLIB_HEADER):
+        yield RecordError(source, 0, "not a RenLib file / 不是 RenLib 文件")
+        return
+
+    path = []     # 根到当前节点的坐标（空着的节点为 None）
+    stack = []    # 等待兄弟节点的深度
+    leaves = 0
+    while True:
+        node = stream.read(2)
+        if len(node) < 2:
+            break
+        pos, flags = node[0], node[1]
+        try:
+            if flags & RENLIB_EXTENSION:
+                extension = stream.read(2)
+                if len(extension) < 2:
+                    raise EOFError("truncated extension / 扩展标志不完整")
+                if extension[1] & RENLIB_BOARD_TEXT:
+                    _skip_text(stream)
+            if flags & (RENLIB_COMMENT | RENLIB_OLD_COMMENT):
+                _skip_text(stream)
+        except EOFError as e:
+            yield RecordError(source, leaves, str(e))
+            return
+
+        if flags & RENLIB_RIGHT:
+            stack.append(len(path))
+        path.append(divmod(pos - 1, 16) if pos else None)
+        if flags & RENLIB_DOWN:
+            continue
+
+        leaves += 1
+        sequence = []
+        for coord in path:
+            if coord is not None:
+                sequence.append(coord + (1 if len(sequence) % 2 == 0 else 2,))
+        yield {'id': f"{os.path.basename(source)}:{leaves}", 'setup': [], 'sequence': sequence}
+        if not stack:
+            break
+        del path[stack.pop():]
+
+
+def _sgf_tokens(stream):
+    """SGF 词法分析：逐块读取，产生 '(' / ')' / ';' 或 (属性名, [值, ...])"""
+    ident = ''
+    values = []
+    value = None      # 正在读取的属性值（None 表示不在方括号内）
+    escaped = False
+    while True:
+        chunk = stream.read(READ_CHUNK)
+        if not chunk:
+            break
+        for char in chunk:
+            if value is not None:
+                if escaped:
+                    value.append(char)
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == ']':
+                    values.append(''.join(value))
+                    value = None
+                else:
+                    value.append(char)
+            elif char == '[':
+                value = []
+            elif char.isalpha():
+                if values:
+                    yield ident, values
+                    ident, values = '', []
+                if char.isupper():
+                    ident += char
+            elif char in '();':
+                if values:
+                    yield ident, values
+                    ident, values = '', []
+                yield char
+    if values:
+        yield ident, values
+
+
+def _sgf_point(value, size):
+    """SGF 坐标（如 'hh'）转换为 (row, col)，停一手返回 None"""
+    if value == '' or (value == 'tt' and size <= 19):
+        return None
+    if len(value) != 2:
+        raise ValueError(f"bad point / 坐标错误: {value}")
+    col = ord(value[0]) - ord('a')
+    row = ord(value[1]) - ord('a')
+    return row, col
+
+
+def iter_sgf(stream, source='<sgf>'):
+    """
+    读取 SGF 棋谱（只取每局的主线，忽略其它变化）
+
+    Yields:
+        dict 或 RecordError: {'id', 'setup', 'sequence'}
+    """
+    depth = 0
+    skip_below = None   # 正在跳过的变化所在深度
+    closed = set()      # 已经读完一个变化的深度
+    games = 0
+    game = None
+
+    for token in _sgf_tokens(stream):
+        if token == '(':
+            depth += 1
+            if skip_below is None and depth > 1 and depth in closed:
+                skip_below = depth
+            if depth == 1:
+                games += 1
+                game = {'size': BOARD_SIZE, 'setup': [], 'sequence': [], 'error': None, 'name': None}
+            continue
+        if token == ')':
+            if skip_below == depth:
+                skip_below = None
+            closed = {level for level in closed if level < depth}
+            closed.add(depth)
+            depth -= 1
+            if depth == 0 and game is not None:
+                record_id = f"{os.path.basename(source)}:{game['name'] or games}"
+                if game['error']:
+                    yield RecordError(source, games, game['error'])
+                elif game['size'] != BOARD_SIZE:
+                    yield RecordError(source, games, f"unsupported board size / 不支持的棋盘大小: {game['size']}")
+                else:
+                    yield {'id': record_id, 'setup': game['setup'], 'sequence': game['sequence']}
+                game = None
+                closed = set()
+            continue
+        if token == ';' or skip_below is not None or game is None or game['error']:
+            continue
+
+        ident, values = token
+        try:
+            if ident == 'SZ':
+                game['size'] = int(values[0].split(':')[0])
+            elif ident == 'GM' and values[0].strip() not in ('4', ''):
+                game['error'] = f"not a Gomoku game / 不是五子棋: GM[{values[0]}]"
+            elif ident == 'GN':
+                game['name'] = values[0].strip() or None
+            elif ident in ('AB', 'AW'):
+                player = 1 if ident == 'AB' else 2
+                for value in values:
+                    point = _sgf_point(value, game['size'])
+                    if point is not None:
+                        game['setup'].append(point + (player,))
+            elif ident in ('B', 'W'):
+                point = _sgf_point(values[0], game['size'])
+                if point is not None:
+                    game['sequence'].append(point + (1 if ident == 'B' else 2,))
+        except (ValueError, IndexError) as e:
+            game['error'] = str(e)
+
+    if depth:
+        yield RecordError(source, games, "unterminated game tree / 棋谱树未结束")
+
+
+def build_pattern(raw, solution_plies=1, size=BOARD_SIZE):
+    """
+    把原始记录转换为 PatternManager 的棋谱结构，并检查坐标和重复落子
+
+    最后 solution_plies 手作为要求解的走法，其余放入初始局面。
+
+    Args:
+        raw (dict): 解析器产生的 {'id', 'setup', 'sequence'}
+        solution_plies (int): 作为 moves 的末尾手数
+        size (int): 棋盘大小
+
+    Returns:
+        dict: {'id', 'initial_setup', 'moves'}
+
+    Raises:
+        ValueError: 记录非法
+    """
+    stones = raw['setup'] + raw['sequence']
+    occupied = set()
+    for row, col, player in stones:
+        if not (0 <= row < size and 0 <= col < size):
+            raise ValueError(f"coordinate off board / 坐标越界: {(row, col)}")
+        if (row, col) in occupied:
+            raise ValueError(f"duplicate stone / 重复落子: {(row, col)}")
+        occupied.add((row, col))
+    if len(raw['sequence']) < max(solution_plies, 1):
+        raise ValueError("record too short / 记录过短")
+    split = len(stones) - solution_plies
+    return {
+        'id': raw['id'],
+        'initial_setup': stones[:split],
+        'moves': stones[split:]
+    }
+
+
+def _report(error):
+    """默认的错误处理：打印到标准错误"""
+    print(f"Skipped record / 跳过记录 {error}", file=sys.stderr)
+
+
+def import_file(path, file_format=None, solution_plies=1, on_error=None):
+    """
+    流式导入一个棋谱文件
+
+    Args:
+        path (str): 文件路径
+        file_format (str): 'renlib' / 'sgf' / 'text'，默认自动判断
+        solution_plies (int): 每条记录末尾作为 moves 的手数
+        on_error (callable): on_error(RecordError)，默认打印到标准错误
+
+    Yields:
+        dict: {'id', 'initial_setup', 'moves'}
+    """
+    file_format = file_format or detect_format(path)
+    if file_format not in FORMATS:
+        raise ValueError(f"unknown format / 未知格式: {file_format}")
+    on_error = on_error or _report
+    if file_format == 'renlib':
+        stream = open(path, 'rb')
+        raw_records = iter_renlib(stream, path)
+    else:
+        stream = open(path, encoding='utf-8', errors='replace')
+        raw_records = iter_sgf(stream, path) if file_format == 'sgf' else iter_text(stream, path)
+
+    with stream:
+        for raw in raw_records:
+            if isinstance(raw, RecordError):
+                on_error(raw)
+                continue
+            try:
+                yield build_pattern(raw, solution_plies)
+            except ValueError as e:
+                on_error(RecordError(path, raw['id'], str(e)))
+
+
+def to_pattern_record(pattern, difficulty='unknown', win_moves=0, number=0):
+    """
+    把导入结果转换为 PatternRecord，以便写入集合文件
+
+    Returns:
+        PatternRecord: 棋谱记录
+    """
+    return PatternRecord(pattern['id'], difficulty, win_moves, number,
+                         tuple(pattern['initial_setup']), tuple(pattern['moves']))
@@ -0,0 +1,184 @@
+"""
+Board Line Geometry
+棋盘线路几何
+Precompute the rows, columns and diagonals of a board that can hold a five
+预计算棋盘上所有可以容纳五连的行、列和对角线
+"""
+
+# 四个方向：水平、垂直、主对角线、反对角线
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# 线路窗口：以格子为中心，两侧各取 4 格，共 9 格
+WINDOW_RADIUS = 4
+WINDOW_SIZE = 2 * WINDOW_RADIUS + 1
+WINDOW_MASK = (1 << WINDOW_SIZE) - 1
+
+# 正方形棋盘的 8 种对称变换（二面体群 D4）
+SYMMETRY_COUNT = 8
+
+# 按棋盘大小缓存的几何信息
+_GEOMETRY_CACHE = {}
+_NEIGHBOUR_CACHE = {}
+_SYMMETRY_CACHE = {}
+
+
+class LineGeometry:
+    """Line geometry of a board / 棋盘线路几何信息
+
+    对 15x15 棋盘共有 72 条线：15 行、15 列、两组对角线各 21 条
+    （长度不足 5 的对角线不可能形成五连，不计入）。
+    线路中第 k 个格子对应该线路位掩码的第 k 位。
+    """
+
+    def __init__(self, size):
+        """
+        构建几何信息
+
+        Args:
+            size (int): 棋盘大小
+        """
+        self.size = size
+        self.lines = []  # line_id -> 格子下标元组（沿方向排列）
+        self.line_directions = []  # line_id -> 方向编号 (0-3)
+        # 每个格子在四个方向上的 (line_id, offset, edge_mask)，无线路时为 None
+        self.cell_lines = [[None] * len(DIRECTIONS) for _ in range(size * size)]
+        # 每个格子落子时需要更新的 (line_id, bit)
+        self.cell_updates = [[] for _ in range(size * size)]
+
+        for direction, (dr, dc) in enumerate(DIRECTIONS):
+            for row, col in self._line_starts(dr, dc):
+                cells = []
+                r, c = row, col
+                while 0 <= r < size and 0 <= c < size:
+                    cells.append(r * size + c)
+                    r += dr
+                    c += dc
+                if len(cells) >= 5:
+                    self._add_line(direction, cells)
+
+        self.cell_lines = [tuple(entries) for entries in self.cell_lines]
+        self.cell_updates = [tuple(entries) for entries in self.cell_updates]
+
+    def _line_starts(self, dr, dc):
+        """获取某方向上所有线路的起点"""
+        size = self.size
+        if (dr, dc) == (0, 1):
+            return [(row, 0) for row in range(size)]
+        if (dr, dc) == (1, 0):
+            return [(0, col) for col in range(size)]
+        if (dr, dc) == (1, 1):
+            return [(0, col) for col in range(size)] + [(row, 0) for row in range(1, size)]
+        return [(0, col) for col in range(size)] + [(row, size - 1) for row in range(1, size)]
+
+    def _add_line(self, direction, cells):
+        """登记一条线路及其格子"""
+        line_id = len(self.lines)
+        length = len(cells)
+        self.lines.append(tuple(cells))
+        self.line_directions.append(direction)
+        for offset, index in enumerate(cells):
+            # 窗口中超出线路两端的格子视为边界（与对方棋子同样起阻挡作用）
+            edge_mask = 0
+            for i in range(WINDOW_SIZE):
+                position = offset - WINDOW_RADIUS + i
+                if not (0 <= position < length):
+                    edge_mask |= 1 << i
+            self.cell_lines[index][direction] = (line_id, offset, edge_mask)
+            self.cell_updates[index].append((line_id, 1 << offset))
+
+    def window_cell(self, line_id, offset, bit):
+        """
+        将窗口中的位转换为格子下标
+
+        Args:
+            line_id (int): 线路编号
+            offset (int): 窗口中心在线路中的位置
+            bit (int): 窗口中的位 (0-8)
+
+        Returns:
+            int: 格子下标 row * size + col，超出线路时为 None
+        """
+        position = offset - WINDOW_RADIUS + bit
+        cells = self.lines[line_id]
+        if 0 <= position < len(cells):
+            return cells[position]
+        return None
+
+
+def get_line_geometry(size):
+    """获取（并缓存）指定大小棋盘的线路几何信息"""
+    geometry = _GEOMETRY_CACHE.get(size)
+    if geometry is None:
+        geometry = LineGeometry(size)
+        _GEOMETRY_CACHE[size] = geometry
+    return geometry
+
+
+def get_neighbours(size, radius):
+    """
+    获取（并缓存）每个格子切比雪夫距离 radius 以内的邻居
+
+    Args:
+        size (int): 棋盘大小
+        radius (int): 邻域半径
+
+    Returns:
+        list: 下标为 row * size + col，值为邻居格子下标元组（不含自身）
+    """
+    key = (size, radius)
+    neighbours = _NEIGHBOUR_CACHE.get(key)
+    if neighbours is None:
+        neighbours = []
+        for row in range(size):
+            for col in range(size):
+                cells = []
+                for r in range(max(0, row - radius), min(size, row + radius + 1)):
+                    for c in range(max(0, col - radius), min(size, col + radius + 1)):
+                        if (r, c) != (row, col):
+                            cells.append(r * size + c)
+                neighbours.append(tuple(cells))
+        _NEIGHBOUR_CACHE[key] = neighbours
+    return neighbours
+
+
+def transform_point(row, col, size, symmetry):
+    """
+    对坐标做一种对称变换
+
+    symmetry 的三个位依次表示：第 0 位左右翻转，第 1 位上下翻转，
+    第 2 位先沿主对角线转置；8 个取值恰好覆盖 4 种旋转和 4 种镜像，0 为恒等变换。
+
+    Args:
+        row (int): 行位置
+        col (int): 列位置
+        size (int): 棋盘大小
+        symmetry (int): 变换编号 0-7
+
+    Returns:
+        tuple: 变换后的 (row, col)
+    """
+    if symmetry & 4:
+        row, col = col, row
+    if symmetry & 2:
+        row = size - 1 - row
+    if symmetry & 1:
+        col = size - 1 - col
+    return row, col
+
+
+def get_symmetry_maps(size):
+    """
+    获取（并缓存）8 种对称变换的格子下标映射
+
+    Returns:
+        tuple: maps[symmetry][row * size + col] 为变换后的格子下标
+    """
+    maps = _SYMMETRY_CACHE.get(size)
+    if maps is None:
+        maps = tuple(
+            tuple(r * size + c
+                  for r, c in (transform_point(index // size, index % size, size, symmetry)
+                               for index in range(size * size)))
+            for symmetry in range(SYMMETRY_COUNT))
+        _SYMMETRY_CACHE[size] = maps
+    return maps
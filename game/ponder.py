@@ -0,0 +1,149 @@
+"""
+Pondering
+后台预想
+While the player is thinking, analyse their most likely replies in advance - the
+predicted reply first, then the engine's threat-ordered candidates - so that the
+move check or the computer's answer is ready the moment the player clicks
+玩家思考时提前分析其最可能的几手应手（先是预测的一手，再按引擎的威胁优先排序），
+玩家落子时走法检查或电脑的应手已经算好
+
+Pondering runs on a copy of the board (usually on a background thread) and
+shares the engine / solver transposition tables with the real move, so even a
+miss starts from a warm table
+预想在棋盘副本上进行（通常在后台线程），与真正落子时共用引擎 / 求解器的置换表，
+即使没有命中也能从预热过的置换表开始
+"""
+
+from .bitboard import BitBoard
+from .engine import SearchEngine
+
+
+class Ponderer:
+    """Ponderer / 预想器
+
+    ponder() 在玩家的回合分析候选应手，take() 在玩家真正落子前取出这一手的预想结果
+    并统计命中率：预想过的局面上玩家走了已分析完的一手为命中，否则为未命中。
+    """
+
+    def __init__(self, engine=None, replies=6):
+        """
+        初始化预想器
+
+        Args:
+            engine (SearchEngine): 给出候选应手并为电脑搜索应手的引擎，None 时新建
+            replies (int): 每个局面最多分析的玩家应手数（不含预测的一手）
+        """
+        self.engine = engine if engine is not None else SearchEngine()
+        self.replies = replies
+        self._position = None   # 预想的局面哈希
+        self.results = {}       # (row, col) -> 预想结果
+        # 统计
+        self.ponders = 0
+        self.analysed = 0
+        self.hits = 0
+        self.misses = 0
+
+    def ponder(self, board, player, analyse, predicted=None, should_stop=None):
+        """
+        分析 player 在 board 上最可能的几手
+
+        Args:
+            board (Board): 玩家回合的局面（会被复制，不会被修改）
+            player (int): 玩家颜色
+            analyse (callable): analyse(board, (row, col), should_stop) 分析一手，
+                                返回结果，None 表示没有结论（不计为已分析）
+            predicted (tuple): 预测的玩家应手 (row, col)，最先分析
+            should_stop (callable): 返回 True 时停止预想（例如玩家已经落子）
+
+        Returns:
+            list: 已分析完的走法 [(row, col), ...]
+        """
+        work = BitBoard.from_board(board)
+        if self._position != work.hash:
+            self._position = work.hash
+            self.results = {}
+        self.ponders += 1
+        moves = self.engine.candidate_moves(work, player, self.replies)
+        if predicted is not None and work.is_valid_move(*predicted):
+            moves = [predicted] + [move for move in moves if move != predicted]
+        for move in moves:
+            if should_stop is not None and should_stop():
+                break
+            if move in self.results:
+                continue
+            result = analyse(work, move, should_stop)
+            # 中途被取消的分析不完整，不保存
+            if result is not None and not (should_stop is not None and should_stop()):
+                self.results[move] = result
+                self.analysed += 1
+        return list(self.results)
+
+    def ponder_search(self, board, player, predicted=None, time_limit=None, should_stop=None):
+        """
+        自由对弈的预想：为每一手玩家应手提前搜索电脑的应手
+
+        Args:
+            board (Board): 玩家回合的局面
+            player (int): 玩家颜色
+            predicted (tuple): 预测的玩家应手（通常是上一次搜索主变例中的下一手）
+            time_limit (float): 每一手的搜索时间，默认使用引擎设置
+            should_stop (callable): 停止检查
+
+        Returns:
+            list: 已分析完的走法
+        """
+        engine = self.engine
+
+        def analyse(work, move, stop):
+            work.make_move(move[0], move[1], player)
+            try:
+                if work.check_winner(move[0], move[1], player):
+                    return None
+                return engine.search(work, 3 - player, time_limit=time_limit, should_stop=stop)
+            finally:
+                work.undo_move()
+
+        return self.ponder(board, player, analyse, predicted, should_stop)
+
+    def take(self, board, move):
+        """
+        玩家即将在 board 上走 move（落子前调用）：取出预想结果并统计命中率
+
+        Args:
+            board (Board): 落子前的局面
+            move (tuple): 玩家走法 (row, col)
+
+        Returns:
+            预想结果；未命中或这个局面没有预想过时为 None
+        """
+        if self._position is None or self._position != board.hash:
+            return None
+        result = self.results.get(tuple(move))
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self._position = None
+        self.results = {}
+        return result
+
+    def reset(self):
+        """丢弃未使用的预想结果（例如悔棋、重新开始后）"""
+        self._position = None
+        self.results = {}
+
+    def stats(self):
+        """
+        预想统计
+
+        Returns:
+            dict: {'ponders', 'analysed', 'hits', 'misses', 'hit_rate'}
+        """
+        total = self.hits + self.misses
+        return {
+            'ponders': self.ponders,
+            'analysed': self.analysed,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
@@ -0,0 +1,227 @@
+"""
+Training Session Replay
+训练会话回放
+Push recorded move logs (JSONL, one training session per line) through headless
+TrainingSessions across a process pool and write one summary per log in input order;
+the solver runs on a node budget so replays are reproducible
+把录制的操作日志（JSONL，每行一个训练会话）分发到进程池中的无界面训练会话，
+按输入顺序为每条日志输出一条摘要；求解器使用节点预算，因此回放结果可复现
+
+Log format / 日志格式:
+    {"id": "...", "pattern": "three_move_93",
+     "actions": [["play", 11, 5], ["play", "D10"], ["undo"], ["hint"], ["answer"], ["restart"]],
+     "expect": {"complete": true}}
+"""
+
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .pattern import PatternManager, coord_to_pos
+from .session import EVENT_REJECTED, EVENT_WRONG, TrainingSession
+from .vct import VCTSolver
+
+# 回放时求解器的节点预算（代替点击路径上的时间预算，使结果与机器速度无关）
+REPLAY_SOLVER_NODES = 2000
+
+# 操作名 -> 参数个数
+ACTIONS = {'play': 2, 'undo': 0, 'restart': 0, 'answer': 0, 'hint': 0, 'computer': 0}
+
+# 每个工作进程内复用的会话和回放参数（由 _init_worker 设置）
+_worker_session = None
+_worker_trace = False
+
+
+def parse_log(line):
+    """
+    解析一行操作日志
+
+    Args:
+        line (str): 一行 JSON 文本
+
+    Returns:
+        dict: {'id', 'pattern', 'actions': [(name, *args), ...], 'expect': dict}
+
+    Raises:
+        ValueError: 格式错误
+    """
+    data = json.loads(line)
+    if not isinstance(data, dict) or not data.get('pattern'):
+        raise ValueError("missing 'pattern' / 缺少 'pattern'")
+    if not isinstance(data['pattern'], str):
+        raise ValueError("'pattern' must be a string / 'pattern' 必须是字符串")
+    if not isinstance(data.get('actions', []), list):
+        raise ValueError("'actions' must be a list / 'actions' 必须是列表")
+    if not isinstance(data.get('expect') or {}, dict):
+        raise ValueError("'expect' must be an object / 'expect' 必须是对象")
+    actions = []
+    for action in data.get('actions', ()):
+        if isinstance(action, str):
+            action = [action]
+        if not isinstance(action, list) or not action:
+            raise ValueError(f"bad action / 操作错误: {action!r}")
+        name, args = action[0], list(action[1:])
+        if name == 'play' and len(args) == 1:
+            # 棋谱坐标，例如 "H8"
+            position = coord_to_pos(str(args[0]))
+            if position is None:
+                raise ValueError(f"bad coordinate / 坐标错误: {args[0]!r}")
+            args = list(position)
+        if ACTIONS.get(name) != len(args):
+            raise ValueError(f"bad action / 操作错误: {action!r}")
+        actions.append((name, *(int(arg) for arg in args)))
+    return {'id': data.get('id'), 'pattern': data['pattern'], 'actions': actions,
+            'expect': data.get('expect') or {}}
+
+
+def replay_log(log, session, trace=False):
+    """
+    在会话中回放一条日志（先加载棋谱，所以会话可以反复使用）
+
+    Args:
+        log (dict): parse_log 的返回值
+        session (TrainingSession): 训练会话（应使用 auto_reply=True）
+        trace (bool): 是否在摘要中保留全部事件
+
+    Returns:
+        dict: {'id', 'pattern', 'actions', 'events': {事件类型: 次数}, 'wrong', 'complete',
+               'plies': 初始局面之后的手数, 'ok': 与 expect 是否一致（没有 expect 时为 None）,
+               'mismatch': {字段: 实际值}}；棋谱不存在时为 {'id', 'pattern', 'error'}
+    """
+    events = session.load(log['pattern'])
+    if events and events[0]['type'] == EVENT_REJECTED:
+        return {'id': log['id'], 'pattern': log['pattern'], 'error': f"unknown pattern / 未知棋谱: {log['pattern']}"}
+    for name, *args in log['actions']:
+        if name == 'play':
+            events.extend(session.play(*args))
+        elif name == 'undo':
+            events.extend(session.undo())
+        elif name == 'restart':
+            events.extend(session.restart())
+        elif name == 'answer':
+            events.extend(session.reveal_answer())
+        elif name == 'hint':
+            events.extend(session.hint())
+        else:
+            events.extend(session.computer_move())
+
+    counts = {}
+    for event in events:
+        counts[event['type']] = counts.get(event['type'], 0) + 1
+    summary = {
+        'id': log['id'],
+        'pattern': log['pattern'],
+        'actions': len(log['actions']),
+        'events': counts,
+        'wrong': counts.get(EVENT_WRONG, 0),
+        'complete': session.is_complete(),
+        'plies': len(session.board.move_history) - session.setup_count,
+        'ok': None,
+        'mismatch': {}
+    }
+    if log['expect']:
+        summary['mismatch'] = {key: summary.get(key) for key, value in log['expect'].items()
+                               if summary.get(key) != value}
+        summary['ok'] = not summary['mismatch']
+    if trace:
+        summary['trace'] = events
+    return summary
+
+
+def make_session(patterns_dir='patterns', max_nodes=REPLAY_SOLVER_NODES, collections=None):
+    """创建回放用的会话：立即应答，求解器按节点预算"""
+    return TrainingSession(PatternManager(patterns_dir, collections), auto_reply=True,
+                           solver=VCTSolver(max_nodes=max_nodes, time_limit=None))
+
+
+def _init_worker(patterns_dir, max_nodes, trace):
+    """工作进程初始化：每个进程只创建一个会话，之后每条日志重新加载棋谱"""
+    global _worker_session, _worker_trace
+    _worker_session = make_session(patterns_dir, max_nodes)
+    _worker_trace = trace
+
+
+def _replay_chunk(chunk):
+    """工作进程入口：回放一批 (行号, 文本)，出错的行返回错误信息而不是中断"""
+    results = []
+    for number, line in chunk:
+        result = {'line_number': number}
+        try:
+            result.update(replay_log(parse_log(line), _worker_session, _worker_trace))
+        except (ValueError, TypeError, IndexError) as e:
+            result['error'] = str(e)
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        results.append(result)
+    return results
+
+
+def _read_chunks(stream, chunk_size):
+    """把输入流切成 [(行号, 文本), ...] 的小批，跳过空行和 # 注释"""
+    chunk = []
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        chunk.append((number, line))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def replay_stream(stream, output=None, workers=1, chunk_size=256, patterns_dir='patterns',
+                  max_nodes=REPLAY_SOLVER_NODES, trace=False):
+    """
+    流式回放：按输入顺序写出 JSONL 摘要
+
+    workers 为 1 时在当前进程中执行；否则使用进程池，同时在途的批次数量有上限（workers * 4）。
+
+    Args:
+        stream: 输入文本流（每行一条日志）
+        output: 输出文本流，None 表示不输出摘要
+        workers (int): 工作进程数，None 表示 CPU 核数
+        chunk_size (int): 每次交给工作进程的日志数
+        patterns_dir (str): 棋谱集合文件目录
+        max_nodes (int): 求解器检查非棋谱走法时的节点预算
+        trace (bool): 是否在摘要中保留全部事件
+
+    Returns:
+        dict: {'sessions', 'errors', 'complete', 'mismatches', 'time', 'sessions_per_second'}
+    """
+    stats = {'sessions': 0, 'errors': 0, 'complete': 0, 'mismatches': 0}
+    workers = workers or os.cpu_count() or 1
+    initargs = (patterns_dir, max_nodes, trace)
+    start = time.perf_counter()
+
+    def record(results):
+        for result in results:
+            stats['sessions'] += 1
+            stats['errors'] += 'error' in result
+            stats['complete'] += bool(result.get('complete'))
+            stats['mismatches'] += result.get('ok') is False
+            if output is not None:
+                output.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+    if workers == 1:
+        _init_worker(*initargs)
+        for chunk in _read_chunks(stream, chunk_size):
+            record(_replay_chunk(chunk))
+    else:
+        window = workers * 4
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            pending = deque()
+            for chunk in _read_chunks(stream, chunk_size):
+                pending.append(pool.submit(_replay_chunk, chunk))
+                while len(pending) > window:
+                    record(pending.popleft().result())
+            while pending:
+                record(pending.popleft().result())
+
+    elapsed = time.perf_counter() - start
+    stats['time'] = elapsed
+    stats['sessions_per_second'] = stats['sessions'] / elapsed if elapsed > 0 else 0.0
+    return stats
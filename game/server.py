@@ -0,0 +1,618 @@
+"""
+Training Server
+训练服务
+Asyncio HTTP / WebSocket service (standard library only) that hosts many endgame
+training sessions in one process: the compiled pattern catalog, collections, solver,
+proof cache and hint cache are shared, each session keeps only its board and validator state,
+and every request's latency is recorded per operation
+基于 asyncio 的 HTTP / WebSocket 服务（只用标准库），在一个进程中承载大量残局训练会话：
+编译好的棋谱目录、集合文件、求解器、证明缓存和提示缓存由所有会话共享，每个会话只保存自己的棋盘和验证器状态，
+并按操作记录每个请求的延迟
+
+HTTP:
+    GET    /patterns                    棋谱列表（?language=chinese）
+    POST   /sessions                    {"pattern": id, "language": ...} 新建会话
+    GET    /sessions/<id>               会话状态
+    POST   /sessions/<id>/play          {"row": r, "col": c}
+    POST   /sessions/<id>/undo | restart | answer | hint
+    DELETE /sessions/<id>               关闭会话
+    GET    /metrics                     延迟统计
+WebSocket (GET /ws): {"op": "new" | "play" | ..., "session": id, ...} -> {"ok": bool, ...}
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import secrets
+import struct
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+from .collection import open_collections
+from .hints import HintProvider
+from .pattern import PATTERN_TRANSLATIONS, PatternManager, get_built_in_catalog
+from .session import TrainingSession
+from .validator import MoveValidator
+from .vct import VCTSolver
+
+# WebSocket 握手用的固定 GUID（RFC 6455）
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+# 请求头和消息大小上限
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+
+# WebSocket 帧类型
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+HTTP_REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found',
+                405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+# 会话操作 -> TrainingSession 方法
+SESSION_ACTIONS = {'undo': 'undo', 'restart': 'restart', 'answer': 'reveal_answer', 'hint': 'hint'}
+# 只读、不涉及会话的操作，直接在事件循环中执行（其余操作在工作线程中依次执行）
+LOOP_OPERATIONS = ('patterns', 'metrics')
+
+
+class LatencyMetrics:
+    """Latency Metrics / 延迟统计
+
+    按操作统计请求数、平均值、最大值，以及最近 SAMPLES 个样本的分位数。
+    """
+
+    SAMPLES = 2048
+
+    def __init__(self):
+        self.operations = {}
+
+    def record(self, operation, seconds):
+        """记录一次请求的耗时（秒）"""
+        entry = self.operations.get(operation)
+        if entry is None:
+            entry = self.operations[operation] = {'count': 0, 'total': 0.0, 'max': 0.0,
+                                                  'samples': deque(maxlen=self.SAMPLES)}
+        entry['count'] += 1
+        entry['total'] += seconds
+        entry['max'] = max(entry['max'], seconds)
+        entry['samples'].append(seconds)
+
+    def snapshot(self):
+        """
+        汇总当前统计
+
+        Returns:
+            dict: {操作: {'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}}
+        """
+        result = {}
+        for operation, entry in self.operations.items():
+            samples = sorted(entry['samples'])
+
+            def percentile(fraction):
+                return round(samples[min(int(fraction * len(samples)), len(samples) - 1)] * 1000, 3)
+
+            result[operation] = {
+                'count': entry['count'],
+                'mean_ms': round(entry['total'] / entry['count'] * 1000, 3),
+                'p50_ms': percentile(0.50),
+                'p95_ms': percentile(0.95),
+                'p99_ms': percentile(0.99),
+                'max_ms': round(entry['max'] * 1000, 3)
+            }
+        return result
+
+
+def session_state(session_id, session):
+    """
+    会话状态（可序列化）
+
+    Returns:
+        dict: {'session', 'pattern', 'stones': [[row, col, player], ...], 'setup': 初始棋子数,
+               'player_color', 'player_turn', 'complete', 'errors'}
+    """
+    validator = session.validator
+    return {
+        'session': session_id,
+        'pattern': session.pattern['id'] if session.pattern else None,
+        'stones': [list(move) for move in session.board.move_history],
+        'setup': session.setup_count,
+        'player_color': validator.player_color,
+        'player_turn': validator.is_player_turn,
+        'complete': session.is_complete(),
+        'errors': validator.error_count
+    }
+
+
+class TrainingServer:
+    """Training Server / 训练服务
+
+    所有会话共享一份内置棋谱目录、已打开的集合文件、一个求解器和一份证明缓存；
+    操作在同一个工作线程中依次执行（求解不会阻塞事件循环），因此共享对象无需加锁。会话按最近使用排序，
+    超过 max_sessions 或空闲超过 idle_timeout 的会话会被关闭。
+    """
+
+    def __init__(self, patterns_dir='patterns', max_sessions=10000, idle_timeout=1800.0,
+                 solver_time_limit=MoveValidator.SOLVER_TIME_LIMIT):
+        """
+        初始化服务（不监听端口，见 start）
+
+        Args:
+            patterns_dir (str): 棋谱集合文件目录
+            max_sessions (int): 同时保留的会话数上限
+            idle_timeout (float): 会话空闲多少秒后关闭
+            solver_time_limit (float): 检查非棋谱走法时求解器的时间预算（秒）
+        """
+        self.patterns_dir = patterns_dir
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.catalog = get_built_in_catalog()
+        self.collections = open_collections(patterns_dir)
+        self.solver = VCTSolver(time_limit=solver_time_limit)
+        self.proofs = {}
+        self.hints = HintProvider()
+        self.sessions = OrderedDict()  # 会话ID -> (TrainingSession, 最近使用时间)，最久未用的在前
+        self.metrics = LatencyMetrics()
+        self.started = time.monotonic()
+        self.expired = 0
+        self._server = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='training')  # 执行操作的单线程池
+
+    # ---- 会话操作（HTTP 和 WebSocket 共用） ----
+
+    def _session(self, session_id):
+        """取出会话并标记为最近使用；不存在时抛出 KeyError"""
+        entry = self.sessions.get(session_id)
+        if entry is None:
+            raise KeyError(f"unknown session / 未知会话: {session_id}")
+        self.sessions[session_id] = (entry[0], time.monotonic())
+        self.sessions.move_to_end(session_id)
+        return entry[0]
+
+    def _expire(self):
+        """关闭空闲超时的会话，以及超出数量上限的最久未用会话"""
+        now = time.monotonic()
+        while self.sessions:
+            session_id, (_, last_used) = next(iter(self.sessions.items()))
+            if len(self.sessions) < self.max_sessions and now - last_used < self.idle_timeout:
+                break
+            del self.sessions[session_id]
+            self.expired += 1
+
+    def handle(self, operation, params):
+        """
+        执行一个操作
+
+        Args:
+            operation (str): 'patterns' / 'new' / 'state' / 'play' / 'undo' / 'restart' / 'answer' / 'hint' / 'close' / 'metrics'
+            params (dict): 操作参数
+
+        Returns:
+            dict: 响应内容
+
+        Raises:
+            KeyError: 会话或棋谱不存在
+            ValueError: 参数错误
+        """
+        language = params.get('language') or 'english'
+        if not isinstance(language, str) or language not in PATTERN_TRANSLATIONS:
+            raise ValueError(f"unknown language / 未知语言: {language}")
+        if operation == 'patterns':
+            return {'patterns': [dict(pattern) for pattern in self.catalog.listing(language)]}
+        if operation == 'metrics':
+            return self.metrics_snapshot()
+        if operation == 'new':
+            if not params.get('pattern'):
+                raise ValueError("missing 'pattern' / 缺少 'pattern'")
+            if not isinstance(params['pattern'], str):
+                raise ValueError("'pattern' must be a string / 'pattern' 必须是字符串")
+            manager = PatternManager(self.patterns_dir, self.collections)
+            manager.set_language(language)
+            session = TrainingSession(manager, proof_cache=self.proofs, solver=self.solver, hints=self.hints)
+            events = session.load(params['pattern'])
+            if session.pattern is None:
+                raise KeyError(f"unknown pattern / 未知棋谱: {params['pattern']}")
+            self._expire()
+            session_id = secrets.token_hex(8)
+            self.sessions[session_id] = (session, time.monotonic())
+            return {'events': events, 'state': session_state(session_id, session)}
+
+        session_id = params.get('session')
+        if not isinstance(session_id, str):
+            raise ValueError("'session' must be a string / 'session' 必须是字符串")
+        session = self._session(session_id)
+        if operation == 'state':
+            return {'state': session_state(session_id, session)}
+        if operation == 'close':
+            del self.sessions[session_id]
+            return {'closed': session_id}
+        if operation == 'play':
+            try:
+                row, col = int(params['row']), int(params['col'])
+            except (KeyError, TypeError, ValueError, OverflowError):
+                raise ValueError("'row' and 'col' must be integers / 'row' 和 'col' 必须是整数")
+            events = session.play(row, col)
+        elif isinstance(operation, str) and operation in SESSION_ACTIONS:
+            events = getattr(session, SESSION_ACTIONS[operation])()
+        else:
+            raise ValueError(f"unknown operation / 未知操作: {operation}")
+        return {'events': events, 'state': session_state(session_id, session)}
+
+    async def dispatch(self, operation, params):
+        """
+        在工作线程中执行操作并记录延迟，把异常转换为状态码
+
+        Returns:
+            tuple: (HTTP 状态码, 响应内容)
+        """
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            if operation in LOOP_OPERATIONS:
+                payload = self.handle(operation, params)
+            else:
+                payload = await loop.run_in_executor(self._executor, self.handle, operation, params)
+            status = 201 if operation == 'new' else 200
+        except KeyError as e:
+            status, payload = 404, {'error': e.args[0] if e.args else str(e)}
+        except ValueError as e:
+            status, payload = 400, {'error': str(e)}
+        except Exception as e:
+            status, payload = 500, {'error': f"internal error / 内部错误: {type(e).__name__}"}
+        if isinstance(operation, str):
+            self.metrics.record(operation, time.perf_counter() - start)
+        return status, payload
+
+    def metrics_snapshot(self):
+        """服务统计：会话数、证明缓存大小、运行时间和各操作的延迟"""
+        return {
+            'sessions': len(self.sessions),
+            'max_sessions': self.max_sessions,
+            'expired': self.expired,
+            'proof_cache': len(self.proofs),
+            'uptime': round(time.monotonic() - self.started, 3),
+            'latency': self.metrics.snapshot()
+        }
+
+    # ---- 网络层 ----
+
+    async def start(self, host='127.0.0.1', port=0):
+        """
+        开始监听
+
+        Args:
+            host (str): 监听地址
+            port (int): 端口，0 表示由系统分配
+
+        Returns:
+            int: 实际监听的端口
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='training')
+        self._server = await asyncio.start_server(self._handle_connection, host, port,
+                                                  limit=MAX_HEADER_BYTES)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """持续提供服务（需要先调用 start）"""
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """停止监听"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _handle_connection(self, reader, writer):
+        """处理一个连接：HTTP/1.1 keep-alive 请求，或升级为 WebSocket"""
+        try:
+            while True:
+                request = await read_http_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                url = urlsplit(target)
+                if url.path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+                    await self._handle_websocket(reader, writer, headers)
+                    break
+                status, payload = await self._route(method, url, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(http_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ValueError as e:
+            # 请求格式错误：回复后断开
+            writer.write(http_response(400, {'error': str(e)}, False))
+        finally:
+            writer.close()
+
+    async def _route(self, method, url, body):
+        """把 HTTP 请求映射为操作"""
+        parts = [part for part in url.path.split('/') if part]
+        params = dict(parse_qsl(url.query))
+        if body:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                return 400, {'error': 'body must be JSON / 请求体必须是 JSON'}
+            if not isinstance(data, dict):
+                return 400, {'error': 'body must be a JSON object / 请求体必须是 JSON 对象'}
+            params.update(data)
+
+        if parts == ['patterns'] and method == 'GET':
+            return await self.dispatch('patterns', params)
+        if parts == ['metrics'] and method == 'GET':
+            return await self.dispatch('metrics', params)
+        if parts == ['sessions'] and method == 'POST':
+            return await self.dispatch('new', params)
+        if len(parts) in (2, 3) and parts[0] == 'sessions':
+            params['session'] = parts[1]
+            if len(parts) == 2 and method in ('GET', 'DELETE'):
+                return await self.dispatch('state' if method == 'GET' else 'close', params)
+            if len(parts) == 3 and method == 'POST' and (parts[2] == 'play' or parts[2] in SESSION_ACTIONS):
+                return await self.dispatch(parts[2], params)
+            return 405, {'error': f"method not allowed / 不支持的请求: {method} {url.path}"}
+        return 404, {'error': f"not found / 未找到: {url.path}"}
+
+    async def _handle_websocket(self, reader, writer, headers):
+        """WebSocket 会话：每条文本消息是一个操作，按原样带回消息中的 'id'"""
+        key = headers.get('sec-websocket-key', '')
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                      f"Connection: Upgrade\r\nSec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+        await writer.drain()
+        while True:
+            opcode, payload = await read_websocket_message(reader)
+            if opcode == OPCODE_CLOSE:
+                writer.write(websocket_frame(OPCODE_CLOSE, payload[:2]))
+                await writer.drain()
+                return
+            if opcode == OPCODE_PING:
+                writer.write(websocket_frame(OPCODE_PONG, payload))
+                await writer.drain()
+                continue
+            if opcode != OPCODE_TEXT:
+                continue
+            try:
+                message = json.loads(payload.decode('utf-8'))
+                if not isinstance(message, dict):
+                    raise ValueError
+            except ValueError:
+                status, response = 400, {'error': 'message must be a JSON object / 消息必须是 JSON 对象'}
+                message = {}
+            else:
+                status, response = await self.dispatch(message.get('op'), message)
+            response = dict(response, ok=status < 400, status=status)
+            if 'id' in message:
+                response['id'] = message['id']
+            writer.write(websocket_frame(OPCODE_TEXT, json.dumps(response, ensure_ascii=False).encode('utf-8')))
+            await writer.drain()
+
+
+async def read_http_request(reader):
+    """
+    读取一个 HTTP 请求
+
+    Returns:
+        tuple: (method, target, headers（小写键）, body)，连接已关闭时为 None
+
+    Raises:
+        ValueError: 请求格式错误或过大
+    """
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise
+    except asyncio.LimitOverrunError:
+        raise ValueError("request header too large / 请求头过大")
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, _ = lines[0].split(' ', 2)
+    except ValueError:
+        raise ValueError(f"bad request line / 请求行错误: {lines[0]!r}")
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', 0) or 0)
+    if length > MAX_BODY_BYTES:
+        raise ValueError("request body too large / 请求体过大")
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target, headers, body
+
+
+def http_response(status, payload, keep_alive=True):
+    """构造 JSON 响应"""
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'Unknown')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+def websocket_frame(opcode, payload, mask=False):
+    """
+    构造一个完整的 WebSocket 帧（客户端发出的帧必须加掩码）
+
+    Args:
+        opcode (int): 帧类型
+        payload (bytes): 内容
+        mask (bool): 是否加掩码
+
+    Returns:
+        bytes: 帧
+    """
+    length = len(payload)
+    mask_bit = 0x80 if mask else 0
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, mask_bit | length)
+    elif length < 1 << 16:
+        header = struct.pack('!BBH', 0x80 | opcode, mask_bit | 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, mask_bit | 127, length)
+    if not mask:
+        return header + payload
+    key = os.urandom(4)
+    return header + key + _apply_mask(payload, key)
+
+
+def _apply_mask(payload, key):
+    """按 4 字节掩码异或（加掩码与去掩码相同）"""
+    if not payload:
+        return payload
+    repeated = (key * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')).to_bytes(len(payload), 'big')
+
+
+async def read_websocket_message(reader):
+    """
+    读取一条完整的 WebSocket 消息（合并分片帧，控制帧立即返回）
+
+    Returns:
+        tuple: (opcode, payload)
+
+    Raises:
+        ValueError: 消息过大
+    """
+    message_opcode = None
+    parts = []
+    size = 0
+    while True:
+        first, second = await reader.readexactly(2)
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', await reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', await reader.readexactly(8))[0]
+        size += length
+        if size > MAX_BODY_BYTES:
+            raise ValueError("message too large / 消息过大")
+        key = await reader.readexactly(4) if second & 0x80 else None
+        payload = await reader.readexactly(length)
+        if key is not None:
+            payload = _apply_mask(payload, key)
+        if opcode >= OPCODE_CLOSE:
+            return opcode, payload
+        if opcode != OPCODE_CONTINUATION:
+            message_opcode = opcode
+        parts.append(payload)
+        if first & 0x80:
+            return message_opcode, b''.join(parts)
+
+
+class TrainingClient:
+    """Training Client / 训练服务客户端
+
+    用于测试和压测的最小客户端：一个 HTTP keep-alive 连接，或一个 WebSocket 连接。
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.websocket = False
+        self._next_id = 0
+
+    async def connect(self, websocket=False):
+        """建立连接；websocket 为 True 时完成握手"""
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.websocket = websocket
+        if websocket:
+            key = base64.b64encode(os.urandom(16)).decode()
+            self.writer.write((f"GET /ws HTTP/1.1\r\nHost: {self.host}:{self.port}\r\nUpgrade: websocket\r\n"
+                               f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                               "Sec-WebSocket-Version: 13\r\n\r\n").encode())
+            await self.writer.drain()
+            head = await self.reader.readuntil(b'\r\n\r\n')
+            if not head.startswith(b'HTTP/1.1 101'):
+                raise ConnectionError(f"WebSocket handshake failed / WebSocket 握手失败: {head[:40]!r}")
+        return self
+
+    async def request(self, method, path, payload=None):
+        """
+        发送 HTTP 请求
+
+        Returns:
+            tuple: (状态码, 响应内容)
+        """
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.writer.write((f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                           f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode() + body)
+        await self.writer.drain()
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split(' ')[1])
+        length = 0
+        for line in lines[1:]:
+            if line.lower().startswith('content-length:'):
+                length = int(line.split(':', 1)[1])
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def send(self, op, **params):
+        """
+        通过 WebSocket 执行一个操作
+
+        Returns:
+            dict: 响应（含 'ok'、'status' 和请求的 'id'）
+        """
+        self._next_id += 1
+        message = dict(params, op=op, id=self._next_id)
+        self.writer.write(websocket_frame(OPCODE_TEXT, json.dumps(message).encode('utf-8'), mask=True))
+        await self.writer.drain()
+        _, payload = await read_websocket_message(self.reader)
+        return json.loads(payload)
+
+    async def close(self):
+        """关闭连接"""
+        if self.writer is None:
+            return
+        if self.websocket:
+            self.writer.write(websocket_frame(OPCODE_CLOSE, struct.pack('!H', 1000), mask=True))
+            await self.writer.drain()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        self.writer = None
+
+
+def run_server(host='127.0.0.1', port=8765, **options):
+    """
+    启动服务并一直运行（Ctrl+C 退出）
+
+    Args:
+        host (str): 监听地址
+        port (int): 端口
+        **options: 传给 TrainingServer 的参数
+    """
+    async def main():
+        server = TrainingServer(**options)
+        actual_port = await server.start(host, port)
+        print(f"Training server listening on / 训练服务监听于 http://{host}:{actual_port}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
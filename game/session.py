@@ -0,0 +1,278 @@
+"""
+Headless Training Session
+无界面训练会话
+One endgame training session (board, pattern manager and move validator) driven by
+pure calls - play / undo / restart - that return lists of event dicts, so the GUI,
+tests, replays and servers all share the same game flow without Tk
+一个残局训练会话（棋盘、棋谱管理器、走法验证器），通过纯调用 play / undo / restart
+驱动并返回事件字典列表；图形界面、测试、回放与服务端共用同一套流程，无需 Tk
+"""
+
+from .bitboard import BitBoard
+from .hints import HINT_LEVELS
+from .pattern import PatternManager
+from .validator import MoveValidator
+
+# 事件类型
+EVENT_RESTART = 'restart'            # 摆好初始局面，重新开始
+EVENT_MOVE = 'move'                  # 玩家走法被接受
+EVENT_WRONG = 'wrong'                # 玩家走法错误
+EVENT_COMPUTER = 'computer'          # 电脑应手
+EVENT_ANSWER = 'answer'              # 错误次数用完后演示正确走法
+EVENT_COMPLETE = 'complete'          # 残局完成
+EVENT_UNDO = 'undo'                  # 悔棋
+EVENT_HINT = 'hint'                  # 分级提示
+EVENT_REJECTED = 'rejected'          # 操作被拒绝（落点无效、未选棋谱、不是玩家回合等）
+
+
+def _event(event_type, message='', move=None, **fields):
+    """构造一个事件"""
+    return dict(fields, type=event_type, message=message, move=move)
+
+
+class TrainingSession:
+    """Training Session / 训练会话
+
+    每个公开方法返回本次操作产生的事件列表，例如玩家走对后依次为
+    move、computer（或 complete）。auto_reply 为 True 时电脑应手和答案演示在同一次调用中完成；
+    图形界面使用 auto_reply=False，根据事件中的 'computer_move' / 'show_answer' 自行延时调用
+    computer_move() / reveal_answer()。
+    """
+
+    def __init__(self, pattern_manager=None, board=None, language_manager=None,
+                 auto_reply=True, proof_cache=None, solver=None, ponderer=None, hints=None):
+        """
+        初始化会话
+
+        Args:
+            pattern_manager (PatternManager): 棋谱管理器，None 时新建
+            board (Board): 棋盘，None 时新建 BitBoard
+            language_manager: 语言管理器，None 时消息为英文
+            auto_reply (bool): 是否在同一次调用中完成电脑应手和答案演示
+            proof_cache (dict): 证明缓存（多个会话可共享）
+            solver (VCTSolver): 验证器使用的求解器（可共享，例如按节点预算、结果可复现的求解器），None 时使用默认值
+            ponderer (Ponderer): 预想器，None 时不支持 ponder()
+            hints (HintProvider): 分级提示生成器（可共享），None 时新建
+        """
+        self.board = board if board is not None else BitBoard()
+        self.pattern_manager = pattern_manager if pattern_manager is not None else PatternManager()
+        self.validator = MoveValidator(self.pattern_manager, self.board, language_manager, proof_cache, solver, hints)
+        self.auto_reply = auto_reply
+        self.ponderer = ponderer
+        self.setup_count = 0  # 初始局面的棋子数（悔棋不会撤销这些棋子）
+        self._hint_position = None  # 已给出提示的局面 (哈希, 手数) 和最高提示级别
+        self._hint_level = 0
+
+    def _text(self, key, *args):
+        """获取翻译文本"""
+        return self.validator._get_text(key, *args)
+
+    @property
+    def pattern(self):
+        """当前棋谱，未加载时为 None"""
+        return self.pattern_manager.current_pattern
+
+    def is_complete(self):
+        """当前残局是否已完成"""
+        return self.pattern is not None and self.validator.is_pattern_complete()
+
+    def load(self, pattern_id):
+        """
+        加载棋谱并重新开始
+
+        Args:
+            pattern_id (str): 棋谱ID
+
+        Returns:
+            list: 事件列表
+        """
+        if not self.pattern_manager.load_pattern(pattern_id):
+            return [_event(EVENT_REJECTED, self._text('load_pattern_failed'), reason='unknown_pattern')]
+        return self.restart()
+
+    def restart(self):
+        """
+        重新开始当前棋谱：清空棋盘、摆好初始局面、重置验证器
+
+        Returns:
+            list: 事件列表
+        """
+        if self.pattern is None:
+            return [_event(EVENT_REJECTED, self._text('please_select_first'), reason='no_pattern')]
+        self.board.reset()
+        self.pattern_manager.reset_pattern()
+        self.validator.reset_game()
+        setup = self.pattern.get('initial_setup', ())
+        for row, col, player in setup:
+            self.board.make_move(row, col, player)
+        self.setup_count = len(self.board.move_history)
+        self._hint_position = None
+        self.validator.initialize_player_colors()
+        events = [_event(EVENT_RESTART, self._text('endgame_restarted'),
+                         computer_move=self.validator.is_computer_turn())]
+        if self.auto_reply:
+            events.extend(self.computer_move())
+        return events
+
+    def play(self, row, col):
+        """
+        玩家在 (row, col) 落子
+
+        Args:
+            row (int): 行
+            col (int): 列
+
+        Returns:
+            list: 事件列表；被接受的走法已落在棋盘上
+        """
+        if not (0 <= row < self.board.size and 0 <= col < self.board.size):
+            return [_event(EVENT_REJECTED, reason='off_board')]
+        if not self.board.is_valid_move(row, col):
+            return [_event(EVENT_REJECTED, self._text('position_occupied'), reason='occupied')]
+        if self.pattern is None:
+            return [_event(EVENT_REJECTED, self._text('please_select_pattern_first'), reason='no_pattern')]
+        if not self.validator.is_player_turn:
+            return [_event(EVENT_REJECTED, self._text('computer_turn_wait'), reason='not_your_turn')]
+
+        if self.ponderer is not None:
+            # 只用于统计命中率：预想的检查结果已经在证明缓存里
+            self.ponderer.take(self.board, (row, col))
+        result = self.validator.validate_player_move(row, col)
+        if not result['valid']:
+            if result['pattern_complete']:
+                return [_event(EVENT_REJECTED, result['message'], reason='complete')]
+            if result['correct_move'] is None:
+                return [_event(EVENT_REJECTED, result['message'], reason='not_your_turn')]
+            events = [_event(EVENT_WRONG, result['message'], (row, col, self.validator.player_color),
+                             errors=self.validator.error_count, show_answer=result['show_answer'])]
+            if result['show_answer'] and self.auto_reply:
+                events.extend(self.reveal_answer())
+            return events
+
+        move = (row, col, result['correct_move'][2])
+        self.board.make_move(*move)
+        events = [_event(EVENT_MOVE, result['message'], move, computer_move=result['computer_move'])]
+        if result['pattern_complete']:
+            events.append(_event(EVENT_COMPLETE, self._text('pattern_completed')))
+        elif result['computer_move'] and self.auto_reply:
+            events.extend(self.computer_move())
+        return events
+
+    def hint(self, should_stop=None):
+        """
+        给出下一级提示：同一局面每次请求更具体一级（威胁类型、方向、候选点、具体走法），
+        走错后给过的提示不再重复
+
+        Args:
+            should_stop (callable): 分析的停止检查
+
+        Returns:
+            list: 事件列表；提示事件带 'level'、'purpose'、'threat'、'direction'、'candidates'，
+                  最后一级的 move 为应走的一手
+        """
+        if self.pattern is None:
+            return [_event(EVENT_REJECTED, self._text('please_select_first'), reason='no_pattern')]
+        if self.is_complete():
+            return [_event(EVENT_REJECTED, self._text('pattern_completed'), reason='complete')]
+        if not self.validator.is_player_turn:
+            return [_event(EVENT_REJECTED, self._text('computer_turn_wait'), reason='not_your_turn')]
+        position = (self.board.hash, len(self.board.move_history))
+        if position != self._hint_position:
+            self._hint_position = position
+            self._hint_level = 0
+        level = max(self._hint_level, self.validator.error_count) + 1
+        hint = self.validator.get_hint(level, should_stop)
+        if hint is None:
+            return []
+        self._hint_level = hint['level']
+        message = f"{self._text('hint_level', hint['level'], HINT_LEVELS)} {hint['message']}"
+        move = (*hint['move'], self.validator.player_color) if hint['level'] == HINT_LEVELS else None
+        return [_event(EVENT_HINT, message, move, level=hint['level'], purpose=hint['purpose'],
+                       threat=hint['threat'], direction=hint['direction'], candidates=hint['candidates'])]
+
+    def ponder(self, should_stop=None):
+        """
+        玩家思考时预想：提前检查玩家最可能的几手（棋谱走法在前），求解结果写入证明缓存，
+        玩家落子时不再调用求解器。在棋盘副本上进行，可以在后台线程运行，但期间不要修改会话
+
+        Args:
+            should_stop (callable): 返回 True 时停止
+
+        Returns:
+            list: 已检查完的走法 [(row, col), ...]
+        """
+        if self.ponderer is None or self.pattern is None or not self.validator.is_player_turn or self.is_complete():
+            return []
+        expected_move = self.validator.get_expected_move()
+
+        def analyse(board, move, stop):
+            return self.validator.precheck_move(move[0], move[1], board, should_stop=stop) or None
+
+        return self.ponderer.ponder(self.board, self.validator.player_color, analyse,
+                                    expected_move[:2] if expected_move else None, should_stop)
+
+    def computer_move(self):
+        """
+        电脑走出当前应手（不是电脑回合时不做任何事）
+
+        Returns:
+            list: 事件列表
+        """
+        if self.pattern is None or not self.validator.is_computer_turn():
+            return []
+        result = self.validator.make_computer_move()
+        if not result['move']:
+            return [_event(EVENT_REJECTED, result['message'], reason='computer_move_failed')]
+        events = [_event(EVENT_COMPUTER, result['message'], result['move'])]
+        if result['pattern_complete']:
+            events.append(_event(EVENT_COMPLETE, self._text('pattern_completed')))
+        return events
+
+    def reveal_answer(self):
+        """
+        演示当前步骤的正确走法（错误次数用完后）
+
+        Returns:
+            list: 事件列表
+        """
+        if self.pattern is None:
+            return []
+        move = self.validator.auto_make_correct_move()
+        if move is None:
+            return []
+        events = [_event(EVENT_ANSWER, self._text('system_demo_correct'), move,
+                         computer_move=self.validator.is_computer_turn())]
+        if self.validator.is_pattern_complete():
+            events.append(_event(EVENT_COMPLETE, self._text('pattern_completed')))
+        elif self.auto_reply:
+            events.extend(self.computer_move())
+        return events
+
+    def undo(self):
+        """
+        悔棋：撤销到上一次轮到玩家走棋的局面（通常是电脑的应手和玩家的一手）；初始局面不会被撤销
+
+        Returns:
+            list: 事件列表
+        """
+        history = self.board.move_history
+        if self.pattern is None or len(history) <= self.setup_count:
+            return [_event(EVENT_REJECTED, self._text('no_moves_undo'), reason='no_moves')]
+
+        undone = []
+        while len(history) > self.setup_count:
+            undone.append(self.board.undo_move())
+            # 回退棋谱步骤（偏离棋谱时回退证明树路径）
+            self.validator.undo_step()
+            expected_move = self.validator.get_expected_move()
+            if expected_move is None or expected_move[2] == self.validator.player_color:
+                break
+
+        self.validator.reset_errors()
+        expected_move = self.validator.get_expected_move()
+        self.validator.is_player_turn = expected_move is None or expected_move[2] == self.validator.player_color
+        if len(undone) == 1:
+            message = self._text('undid_one_move')
+        else:
+            message = self._text('undid_moves_back', len(undone))
+        return [_event(EVENT_UNDO, message, undone=undone)]
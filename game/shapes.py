@@ -0,0 +1,258 @@
+"""
+Line Shape Lookup Table
+线路棋型查找表
+Classify every 9-cell line window into Gomoku shapes once, cache it as a
+memory-mapped .npy file, and answer shape queries with a single indexed read
+预先把所有 9 格线路窗口分类为五子棋棋型，缓存为内存映射的 .npy 文件，
+运行时一次下标读取即可得到棋型
+
+窗口编码与 Board.line_window 相同：own | (blocked << 9)，第 4 位为中心格，
+blocked 包含对方棋子和棋盘边界（两者对棋型的作用相同）。
+表项按中心格已落己方棋子计算，因此中心为空时查到的是“在此落子后”的棋型。
+
+Usage / 用法: python -m game.shapes   # 构建并显示缓存路径
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .lines import WINDOW_RADIUS, WINDOW_SIZE, WINDOW_MASK
+
+# 表格式版本：修改分类规则或编码时递增，旧缓存会被自动忽略
+SHAPE_TABLE_VERSION = 1
+
+# 棋型编号（数值越大越强）
+SHAPE_NONE = 0
+SHAPE_TWO = 1          # 活二：再下一手可成活三
+SHAPE_THREE = 2        # 眠三：再下一手只能成冲四
+SHAPE_SPLIT_THREE = 3  # 跳活三：如 _X_XX_
+SHAPE_OPEN_THREE = 4   # 连活三：如 _XXX_
+SHAPE_FOUR = 5         # 冲四（含跳四 broken four）：只有一个成五点
+SHAPE_OPEN_FOUR = 6    # 活四：两个及以上成五点
+SHAPE_FIVE = 7         # 五连（含长连）
+
+SHAPE_NAMES = {
+    SHAPE_NONE: 'none',
+    SHAPE_TWO: 'two',
+    SHAPE_THREE: 'three',
+    SHAPE_SPLIT_THREE: 'split_three',
+    SHAPE_OPEN_THREE: 'open_three',
+    SHAPE_FOUR: 'four',
+    SHAPE_OPEN_FOUR: 'open_four',
+    SHAPE_FIVE: 'five',
+}
+
+# 表项编码：shape | five_points << 4 | four_points << 13
+# five_points: 窗口中下一手可成五的空位；four_points: 下一手可成（冲/活）四的空位
+SHAPE_BITS = 0xF
+FIVE_POINTS_SHIFT = 4
+FOUR_POINTS_SHIFT = FIVE_POINTS_SHIFT + WINDOW_SIZE
+
+CENTER_BIT = 1 << WINDOW_RADIUS
+TABLE_ENTRIES = 1 << (2 * WINDOW_SIZE)
+
+# 经过中心格的全部五格窗口
+_FIVE_MASKS = tuple(0x1F << start for start in range(WINDOW_RADIUS + 1))
+
+# 进程内缓存的查找表
+_TABLE = None
+
+
+def _has_five(own):
+    """检查经过中心格的五连"""
+    for mask in _FIVE_MASKS:
+        if own & mask == mask:
+            return True
+    return False
+
+
+def _center_run(own):
+    """获取包含中心格的连续己方棋子位掩码"""
+    run = CENTER_BIT
+    bit = CENTER_BIT >> 1
+    while bit and own & bit:
+        run |= bit
+        bit >>= 1
+    bit = CENTER_BIT << 1
+    while bit <= WINDOW_MASK and own & bit:
+        run |= bit
+        bit <<= 1
+    return run
+
+
+def _classify(own, blocked, memo):
+    """
+    计算窗口的棋型和关键点（中心格视为己方棋子）
+
+    Args:
+        own (int): 己方棋子位掩码（须包含中心位）
+        blocked (int): 对方棋子与边界位掩码
+        memo (dict): 记忆化缓存
+
+    Returns:
+        tuple: (shape, five_points, four_points)
+    """
+    key = (own, blocked)
+    result = memo.get(key)
+    if result is not None:
+        return result
+
+    if _has_five(own):
+        result = (SHAPE_FIVE, 0, 0)
+        memo[key] = result
+        return result
+
+    empties = [1 << i for i in range(WINDOW_SIZE) if not (own | blocked) & (1 << i)]
+
+    five_points = 0
+    for bit in empties:
+        if _has_five(own | bit):
+            five_points |= bit
+    if five_points:
+        shape = SHAPE_OPEN_FOUR if bin(five_points).count('1') >= 2 else SHAPE_FOUR
+        result = (shape, five_points, 0)
+        memo[key] = result
+        return result
+
+    four_points = 0
+    open_four_points = []
+    three_points = False
+    for bit in empties:
+        sub_shape = _classify(own | bit, blocked, memo)[0]
+        if sub_shape >= SHAPE_FOUR:
+            four_points |= bit
+            if sub_shape == SHAPE_OPEN_FOUR:
+                open_four_points.append(bit)
+        elif sub_shape in (SHAPE_SPLIT_THREE, SHAPE_OPEN_THREE):
+            three_points = True
+
+    if open_four_points:
+        # 补上的点位于四连端点说明原来是连三，否则是跳三
+        shape = SHAPE_SPLIT_THREE
+        for bit in open_four_points:
+            run = _center_run(own | bit)
+            if bit == run & -run or bit == 1 << (run.bit_length() - 1):
+                shape = SHAPE_OPEN_THREE
+                break
+    elif four_points:
+        shape = SHAPE_THREE
+    elif three_points:
+        shape = SHAPE_TWO
+    else:
+        shape = SHAPE_NONE
+
+    result = (shape, 0, four_points)
+    memo[key] = result
+    return result
+
+
+def build_shape_table():
+    """
+    枚举全部窗口并生成查找表
+
+    Returns:
+        numpy.ndarray: 长度 2^18 的 uint32 数组，下标为窗口编码
+    """
+    table = np.zeros(TABLE_ENTRIES, dtype=np.uint32)
+    memo = {}
+    cells = [1 << i for i in range(WINDOW_SIZE) if i != WINDOW_RADIUS]
+    # 中心以外 8 格各取 空/己方/阻挡，共 3^8 种
+    for code in range(3 ** len(cells)):
+        own = 0
+        blocked = 0
+        for bit in cells:
+            code, state = divmod(code, 3)
+            if state == 1:
+                own |= bit
+            elif state == 2:
+                blocked |= bit
+        shape, five_points, four_points = _classify(own | CENTER_BIT, blocked, memo)
+        entry = shape | (five_points << FIVE_POINTS_SHIFT) | (four_points << FOUR_POINTS_SHIFT)
+        # 中心为空与中心为己方共用同一表项
+        table[own | (blocked << WINDOW_SIZE)] = entry
+        table[own | CENTER_BIT | (blocked << WINDOW_SIZE)] = entry
+    return table
+
+
+def get_cache_dir():
+    """
+    获取缓存目录（可用环境变量 GOBANG_CACHE_DIR 覆盖）
+
+    Returns:
+        Path: 缓存目录
+    """
+    override = os.environ.get('GOBANG_CACHE_DIR')
+    if override:
+        return Path(override)
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(base) / 'gobang'
+
+
+def get_table_path():
+    """获取当前版本查找表的缓存文件路径"""
+    return get_cache_dir() / f"shape_table_v{SHAPE_TABLE_VERSION}.npy"
+
+
+def load_shape_table():
+    """
+    加载查找表：优先内存映射已有缓存，否则构建并写入缓存
+
+    Returns:
+        numpy.ndarray: 查找表（缓存可用时为只读内存映射）
+    """
+    path = get_table_path()
+    if path.exists():
+        try:
+            table = np.load(path, mmap_mode='r')
+            if table.shape == (TABLE_ENTRIES,) and table.dtype == np.uint32:
+                return table
+        except (OSError, ValueError) as e:
+            print(f"Shape table cache unreadable / 棋型表缓存无法读取: {e}")
+
+    table = build_shape_table()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'wb') as f:
+            np.save(f, table)
+        os.replace(temp_path, path)
+        return np.load(path, mmap_mode='r')
+    except OSError as e:
+        print(f"Shape table cache not written / 棋型表缓存写入失败: {e}")
+        return table
+
+
+def get_shape_table():
+    """
+    获取进程内共享的查找表
+
+    Returns:
+        memoryview: 以窗口编码为下标、值为 Python int 的只读视图
+    """
+    global _TABLE
+    if _TABLE is None:
+        _TABLE = memoryview(load_shape_table())
+    return _TABLE
+
+
+def entry_shape(entry):
+    """从表项取出棋型编号"""
+    return entry & SHAPE_BITS
+
+
+def entry_five_points(entry):
+    """从表项取出成五点（窗口位掩码）"""
+    return (entry >> FIVE_POINTS_SHIFT) & WINDOW_MASK
+
+
+def entry_four_points(entry):
+    """从表项取出成四点（窗口位掩码）"""
+    return (entry >> FOUR_POINTS_SHIFT) & WINDOW_MASK
+
+
+if __name__ == "__main__":
+    shape_table = load_shape_table()
+    print(f"Shape table v{SHAPE_TABLE_VERSION}: {get_table_path()} "
+          f"({shape_table.nbytes // 1024} KB)")
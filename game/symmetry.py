@@ -0,0 +1,117 @@
+"""
+Position Symmetry and Puzzle De-duplication
+局面对称与棋谱去重
+Canonical forms of stone lists under the 8 board symmetries (optionally also
+translation), and a pass over any puzzle source that clusters symmetric duplicates
+棋子列表在 8 种棋盘对称（可选再加平移）下的规范形式，
+以及对任意棋谱来源做一次遍历、把互为对称的重复题目聚成簇
+
+Whole-board positions should use Board.canonical_hash(), which is computed from
+the Zobrist keys; the functions here work on plain stone lists and are exact (no hashing).
+完整棋盘局面请使用基于 Zobrist 键的 Board.canonical_hash()；这里的函数直接处理棋子列表，结果精确（不依赖哈希）。
+"""
+
+from .lines import SYMMETRY_COUNT, transform_point
+
+
+def canonical_stones(stones, size=15, translate=False):
+    """
+    计算棋子列表的规范形式
+
+    Args:
+        stones (iterable): [(row, col, player), ...]
+        size (int): 棋盘大小
+        translate (bool): 是否同时忽略平移（把棋子外接矩形移到左上角）
+
+    Returns:
+        tuple: (key, symmetry)，key 为排序后的棋子元组，
+               symmetry 为把原局面变成 key 的变换编号（并列时取最小编号）
+    """
+    stones = tuple(stones)
+    best = None
+    best_symmetry = 0
+    for symmetry in range(SYMMETRY_COUNT):
+        moved = [transform_point(row, col, size, symmetry) + (player,) for row, col, player in stones]
+        if translate and moved:
+            top = min(row for row, _, _ in moved)
+            left = min(col for _, col, _ in moved)
+            moved = [(row - top, col - left, player) for row, col, player in moved]
+        key = tuple(sorted(moved))
+        if best is None or key < best:
+            best = key
+            best_symmetry = symmetry
+    return best, best_symmetry
+
+
+def record_key(record, size=15, translate=False, include_moves=False):
+    """
+    计算一条棋谱记录的去重键
+
+    默认只比较初始局面（同一局面就是同一道题）；include_moves 为 True 时
+    把解答走法也纳入比较（解答中的棋子用颜色 + 2 与初始棋子区分）。
+
+    Args:
+        record (PatternRecord): 棋谱记录
+        size (int): 棋盘大小
+        translate (bool): 是否忽略平移
+        include_moves (bool): 是否比较解答走法
+
+    Returns:
+        tuple: (key, symmetry)
+    """
+    stones = list(record.initial_setup)
+    if include_moves:
+        stones.extend((row, col, player + 2) for row, col, player in record.moves)
+    return canonical_stones(stones, size, translate)
+
+
+def find_duplicates(records, size=15, translate=False, include_moves=False):
+    """
+    找出互为对称的重复棋谱
+
+    Args:
+        records (iterable): PatternRecord 序列（棋谱目录、集合文件的 records() 或导入结果）
+        size (int): 棋盘大小
+        translate (bool): 是否忽略平移
+        include_moves (bool): 是否比较解答走法
+
+    Returns:
+        dict: {'records': 记录总数, 'unique': 去重后数量,
+               'clusters': [{'ids': [...], 'symmetries': [...]}, ...]}
+               每个簇至少两条记录，第一条为保留的记录，symmetries[i] 为 ids[i] 到规范形式的变换
+    """
+    groups = {}
+    total = 0
+    for record in records:
+        total += 1
+        key, symmetry = record_key(record, size, translate, include_moves)
+        groups.setdefault(key, []).append((record.id, symmetry))
+    clusters = [{'ids': [pattern_id for pattern_id, _ in members],
+                 'symmetries': [symmetry for _, symmetry in members]}
+                for members in groups.values() if len(members) > 1]
+    return {'records': total, 'unique': len(groups), 'clusters': clusters}
+
+
+def unique_records(records, size=15, translate=False, include_moves=False, on_duplicate=None):
+    """
+    流式去重：只产生每个对称类中第一次出现的记录
+
+    Args:
+        records (iterable): PatternRecord 序列
+        size (int): 棋盘大小
+        translate (bool): 是否忽略平移
+        include_moves (bool): 是否比较解答走法
+        on_duplicate (callable): on_duplicate(record, kept_id)，跳过重复记录时调用
+
+    Yields:
+        PatternRecord: 去重后的记录（保持原顺序）
+    """
+    seen = {}
+    for record in records:
+        key, _ = record_key(record, size, translate, include_moves)
+        kept_id = seen.get(key)
+        if kept_id is None:
+            seen[key] = record.id
+            yield record
+        elif on_duplicate is not None:
+            on_duplicate(record, kept_id)
@@ -0,0 +1,363 @@
+"""
+Threat Analysis Helpers
+威胁分析工具
+Read the shape table for candidate cells so engines and solvers can find fives,
+fours and threes without rescanning the board
+读取棋型表分析候选点，引擎和求解器无需重新扫描全盘即可找到成五、冲四和活三
+"""
+
+from .lines import WINDOW_MASK, WINDOW_RADIUS, WINDOW_SIZE
+from .shapes import (
+    FIVE_POINTS_SHIFT, FOUR_POINTS_SHIFT, SHAPE_BITS,
+    SHAPE_FOUR, SHAPE_FIVE, SHAPE_OPEN_FOUR, SHAPE_OPEN_THREE, SHAPE_SPLIT_THREE,
+    SHAPE_TWO, get_shape_table,
+)
+
+# 一手棋的威胁等级（数值越大越强）
+THREAT_NONE = 0
+THREAT_TWO = 1
+THREAT_THREE = 2          # 形成活三（含跳三）
+THREAT_DOUBLE_THREE = 3   # 双活三
+THREAT_FOUR = 4           # 形成冲四（不低于此等级的走法都是冲四）
+THREAT_FOUR_THREE = 5     # 四三
+THREAT_OPEN_FOUR = 6      # 活四或双四：对方无法同时防守
+THREAT_FIVE = 7           # 成五
+
+THREAT_NAMES = {
+    THREAT_NONE: 'none',
+    THREAT_TWO: 'two',
+    THREAT_THREE: 'three',
+    THREAT_DOUBLE_THREE: 'double_three',
+    THREAT_FOUR: 'four',
+    THREAT_FOUR_THREE: 'four_three',
+    THREAT_OPEN_FOUR: 'open_four',
+    THREAT_FIVE: 'five',
+}
+
+# 各棋型的启发式分值（下标为棋型编号），用于走法排序和局面评估
+SHAPE_SCORES = (0, 10, 40, 450, 500, 600, 10000, 100000)
+
+
+def cell_entries(board, index, player, table=None):
+    """
+    查表获取某格四个方向的表项（空位时为在此落子后的棋型）
+
+    Args:
+        board (Board): 棋盘
+        index (int): 格子下标 row * size + col
+        player (int): 视角玩家 (1=黑子, 2=白子)
+        table: 棋型表，默认使用进程内共享表
+
+    Returns:
+        list: 四个方向的表项，无线路的方向为 0
+    """
+    if table is None:
+        table = get_shape_table()
+    own_lines = board.line_bits[player]
+    opp_lines = board.line_bits[3 - player]
+    entries = []
+    for entry in board.geometry.cell_lines[index]:
+        if entry is None:
+            entries.append(0)
+            continue
+        line_id, offset, edge_mask = entry
+        own = ((own_lines[line_id] << WINDOW_RADIUS) >> offset) & WINDOW_MASK
+        blocked = (((opp_lines[line_id] << WINDOW_RADIUS) >> offset) & WINDOW_MASK) | edge_mask
+        entries.append(table[own | (blocked << WINDOW_SIZE)])
+    return entries
+
+
+def threat_level(entries):
+    """
+    根据四个方向的表项判断一手棋的威胁等级
+
+    Args:
+        entries (list): cell_entries 的返回值
+
+    Returns:
+        int: THREAT_* 常量
+    """
+    fours = 0
+    threes = 0
+    twos = 0
+    for entry in entries:
+        shape = entry & SHAPE_BITS
+        if shape == SHAPE_FIVE:
+            return THREAT_FIVE
+        if shape == SHAPE_OPEN_FOUR:
+            return THREAT_OPEN_FOUR
+        if shape == SHAPE_FOUR:
+            fours += 1
+        elif shape == SHAPE_OPEN_THREE or shape == SHAPE_SPLIT_THREE:
+            threes += 1
+        elif shape == SHAPE_TWO:
+            twos += 1
+    if fours >= 2:
+        return THREAT_OPEN_FOUR
+    if fours and threes:
+        return THREAT_FOUR_THREE
+    if threes >= 2:
+        return THREAT_DOUBLE_THREE
+    if fours:
+        return THREAT_FOUR
+    if threes:
+        return THREAT_THREE
+    if twos:
+        return THREAT_TWO
+    return THREAT_NONE
+
+
+# 四个方向的棋型组合（每个方向 3 位）-> 威胁等级，供 ThreatMap 一次查表得到等级
+LEVEL_BITS = 3
+LEVEL_TABLE = tuple(
+    threat_level([(code >> (LEVEL_BITS * direction)) & 7 for direction in range(4)])
+    for code in range(1 << (4 * LEVEL_BITS)))
+
+
+def entries_score(entries):
+    """四个方向棋型分值之和"""
+    return sum(SHAPE_SCORES[entry & SHAPE_BITS] for entry in entries)
+
+
+def _points_to_cells(board, index, entries, shift):
+    """把表项中的关键点位掩码转换为格子下标集合"""
+    cells = set()
+    geometry = board.geometry
+    for direction, entry in enumerate(entries):
+        points = (entry >> shift) & WINDOW_MASK
+        if not points:
+            continue
+        line_id, offset, _ = geometry.cell_lines[index][direction]
+        while points:
+            low = points & -points
+            cell = geometry.window_cell(line_id, offset, low.bit_length() - 1)
+            if cell is not None:
+                cells.add(cell)
+            points ^= low
+    return cells
+
+
+def five_cells(board, index, player, entries=None):
+    """
+    获取经过某格、下一手即可成五的空位（用于找冲四的防守点）
+
+    Args:
+        board (Board): 棋盘
+        index (int): 格子下标（通常是刚落下的棋子）
+        player (int): 该棋子所属玩家
+        entries (list): 可选，已计算好的表项
+
+    Returns:
+        set: 成五点格子下标
+    """
+    if entries is None:
+        entries = cell_entries(board, index, player)
+    return _points_to_cells(board, index, entries, FIVE_POINTS_SHIFT)
+
+
+def four_cells(board, index, player, entries=None):
+    """
+    获取经过某格、下一手即可成四的空位（用于找活三的防守点）
+
+    Args:
+        board (Board): 棋盘
+        index (int): 格子下标
+        player (int): 该棋子所属玩家
+        entries (list): 可选，已计算好的表项
+
+    Returns:
+        set: 成四点格子下标
+    """
+    if entries is None:
+        entries = cell_entries(board, index, player)
+    return _points_to_cells(board, index, entries, FOUR_POINTS_SHIFT)
+
+
+def find_threat_moves(board, player, minimum=THREAT_FOUR, table=None):
+    """
+    在候选点中查找威胁等级不低于 minimum 的走法
+
+    Args:
+        board (Board): 棋盘
+        player (int): 进攻方
+        minimum (int): 最低威胁等级
+        table: 棋型表
+
+    Returns:
+        list: [(level, index, entries), ...]，按威胁等级从高到低排序
+    """
+    if table is None:
+        table = get_shape_table()
+    moves = []
+    for index in board.frontier:
+        entries = cell_entries(board, index, player, table)
+        level = threat_level(entries)
+        if level >= minimum:
+            moves.append((level, index, entries))
+    moves.sort(key=lambda item: (-item[0], item[1]))
+    return moves
+
+
+def find_five_moves(board, player, table=None):
+    """
+    查找下一手即可成五的空位
+
+    Returns:
+        list: 格子下标列表（升序）
+    """
+    return [index for _, index, _ in find_threat_moves(board, player, THREAT_FIVE, table)]
+
+
+
+class ThreatMap:
+    """Incremental Threat Map / 增量威胁表
+
+    为双方记录每个空位在四个方向上的棋型和威胁等级（只保留不低于 minimum 的空位）。
+    落子时只重算经过该子的四条线上、窗口半径以内的空位，悔棋时按记录还原，
+    因此求解器不必在每个节点重新扫描全部候选点。落子和悔棋必须通过本对象进行。
+    """
+
+    def __init__(self, board, minimum=THREAT_THREE, table=None):
+        """
+        从当前局面建立威胁表
+
+        Args:
+            board (Board): 棋盘（之后的落子/悔棋要通过 make_move / undo_move）
+            minimum (int): threats() 返回的最低威胁等级
+            table: 棋型表
+        """
+        self.board = board
+        self.minimum = minimum
+        self.table = table if table is not None else get_shape_table()
+        cell_count = board.size * board.size
+        # codes[player][index]：四个方向的棋型编号，第 d 个方向占第 3d ~ 3d+2 位
+        self.codes = [None, [0] * cell_count, [0] * cell_count]
+        # levels[player]：{index: 威胁等级}，只含空位且等级不低于 minimum
+        self.levels = [None, {}, {}]
+        self._history = []
+        occupied = {row * board.size + col for row, col, _ in board.move_history}
+        for index in range(cell_count):
+            if index in occupied:
+                continue
+            for player in (1, 2):
+                code = 0
+                for direction, entry in enumerate(cell_entries(board, index, player, self.table)):
+                    code |= (entry & SHAPE_BITS) << (LEVEL_BITS * direction)
+                self._set(player, index, code)
+
+    def _set(self, player, index, code):
+        """写入某格的棋型组合并更新威胁等级"""
+        self.codes[player][index] = code
+        level = LEVEL_TABLE[code]
+        if level >= self.minimum:
+            self.levels[player][index] = level
+        else:
+            self.levels[player].pop(index, None)
+
+    def threats(self, player):
+        """
+        player 的威胁走法
+
+        Returns:
+            list: [(level, index), ...]，按威胁等级从高到低、下标从小到大排序
+                  （与 find_threat_moves 的顺序相同）
+        """
+        moves = [(-level, index) for index, level in self.levels[player].items()]
+        moves.sort()
+        return [(-level, index) for level, index in moves]
+
+    def make_move(self, row, col, player):
+        """
+        落子并更新受影响空位的棋型
+
+        Returns:
+            bool: 是否成功落子
+        """
+        board = self.board
+        if not board.make_move(row, col, player):
+            return False
+        size = board.size
+        index = row * size + col
+        codes = self.codes
+        levels = self.levels
+        minimum = self.minimum
+        table = self.table
+        geometry = board.geometry
+        line_bits = board.line_bits
+        # 还原记录：(player, index, 原棋型组合)
+        changes = [(1, index, codes[1][index]), (2, index, codes[2][index])]
+        levels[1].pop(index, None)
+        levels[2].pop(index, None)
+        cell_lines = geometry.cell_lines
+        black_codes = codes[1]
+        white_codes = codes[2]
+        black_levels = levels[1]
+        white_levels = levels[2]
+        for direction, entry in enumerate(cell_lines[index]):
+            if entry is None:
+                continue
+            line_id, offset, _ = entry
+            cells = geometry.lines[line_id]
+            black = line_bits[1][line_id]
+            white = line_bits[2][line_id]
+            occupied = black | white
+            # 窗口以 position 为中心：先整体左移半径，之后每格只需右移 position
+            black_shifted = black << WINDOW_RADIUS
+            white_shifted = white << WINDOW_RADIUS
+            shift = LEVEL_BITS * direction
+            clear = ~(7 << shift)
+            for position in range(max(0, offset - WINDOW_RADIUS), min(len(cells), offset + WINDOW_RADIUS + 1)):
+                if (occupied >> position) & 1:
+                    continue
+                cell = cells[position]
+                edge_mask = cell_lines[cell][direction][2]
+                black_window = (black_shifted >> position) & WINDOW_MASK
+                white_window = (white_shifted >> position) & WINDOW_MASK
+                # 黑方：己方为黑子，对方白子和边界都算阻挡
+                old = black_codes[cell]
+                new = (old & clear) | ((table[black_window | ((white_window | edge_mask) << WINDOW_SIZE)]
+                                        & SHAPE_BITS) << shift)
+                if new != old:
+                    changes.append((1, cell, old))
+                    black_codes[cell] = new
+                    level = LEVEL_TABLE[new]
+                    if level >= minimum:
+                        black_levels[cell] = level
+                    elif LEVEL_TABLE[old] >= minimum:
+                        del black_levels[cell]
+                old = white_codes[cell]
+                new = (old & clear) | ((table[white_window | ((black_window | edge_mask) << WINDOW_SIZE)]
+                                        & SHAPE_BITS) << shift)
+                if new != old:
+                    changes.append((2, cell, old))
+                    white_codes[cell] = new
+                    level = LEVEL_TABLE[new]
+                    if level >= minimum:
+                        white_levels[cell] = level
+                    elif LEVEL_TABLE[old] >= minimum:
+                        del white_levels[cell]
+        self._history.append(changes)
+        return True
+
+    def undo_move(self):
+        """
+        悔棋并还原威胁表
+
+        Returns:
+            tuple: 撤销的走法 (row, col, player) 或 None
+        """
+        last_move = self.board.undo_move()
+        if last_move is None:
+            return None
+        # 同一格可能记录多次（不同方向），倒序还原得到最早的值
+        codes = self.codes
+        levels = self.levels
+        minimum = self.minimum
+        for player, index, code in reversed(self._history.pop()):
+            codes[player][index] = code
+            level = LEVEL_TABLE[code]
+            if level >= minimum:
+                levels[player][index] = level
+            else:
+                levels[player].pop(index, None)
+        return last_move
@@ -0,0 +1,183 @@
+"""
+Puzzle Validation
+棋谱校验
+Check every puzzle of a collection for structural errors (coordinates, overlapping
+stones, colour order, fives) and optionally let a solver confirm the win is forced;
+large collections are spread over a process pool and summarised in a JSON report
+逐题检查棋谱集合的结构错误（坐标、重叠、颜色顺序、成五），可选用求解器确认胜利是否为必胜；
+大型集合分发到进程池并行校验，结果汇总为 JSON 报告
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .bitboard import BitBoard
+from .vcf import RESULT_WIN, pattern_start
+from .vct import RESULT_PROVEN
+
+# 检查项
+CHECK_BOUNDS = 'bounds'                  # 坐标在棋盘内
+CHECK_OVERLAP = 'overlap'                # 没有重叠的棋子
+CHECK_ALTERNATION = 'alternation'        # 黑先、黑白交替
+CHECK_PREMATURE_FIVE = 'premature_five'  # 最后一手之前没有人成五
+CHECK_FINAL_FIVE = 'final_five'          # 最后一手成五
+CHECK_FORCED = 'forced'                  # 求解器确认进攻方必胜（需要提供求解器）
+
+CHECKS = (CHECK_BOUNDS, CHECK_OVERLAP, CHECK_ALTERNATION, CHECK_PREMATURE_FIVE,
+          CHECK_FINAL_FIVE, CHECK_FORCED)
+
+# 每个工作进程内的求解器（由 _init_worker 设置）
+_worker_solver = None
+_worker_checks = CHECKS
+
+
+def _issue(check, message, ply=None):
+    """构造一条问题记录，ply 为出问题的手数（从 1 开始）"""
+    return {'check': check, 'message': message, 'ply': ply}
+
+
+def validate_record(record, solver=None, checks=CHECKS, size=15):
+    """
+    校验一道棋谱
+
+    初始局面和走法按顺序连成一个完整序列来检查；坐标或重叠有误的棋子不会被摆上棋盘。
+    只要局面本身合法（坐标、重叠、提前成五均无问题）就会调用求解器，与脚本走法是否成五无关。
+
+    Args:
+        record (PatternRecord): 棋谱记录
+        solver: VCFSolver / VCTSolver，为 None 时跳过必胜检查
+        checks (iterable): 要执行的检查项（见 CHECKS）
+        size (int): 棋盘大小
+
+    Returns:
+        dict: {'id', 'valid': bool, 'issues': [{'check', 'message', 'ply'}, ...],
+               'result': 求解结果或 None, 'nodes': 求解节点数}
+    """
+    checks = set(checks)
+    issues = []
+    stones = tuple(record.initial_setup) + tuple(record.moves)
+    board = BitBoard(size)
+    occupied = set()
+    winner_at = None
+    for ply, (row, col, player) in enumerate(stones, 1):
+        if not (0 <= row < size and 0 <= col < size):
+            if CHECK_BOUNDS in checks:
+                issues.append(_issue(CHECK_BOUNDS, f"coordinate off board / 坐标越界: {(row, col)}", ply))
+            continue
+        if (row, col) in occupied:
+            if CHECK_OVERLAP in checks:
+                issues.append(_issue(CHECK_OVERLAP, f"stone already at / 此处已有棋子: {(row, col)}", ply))
+            continue
+        if CHECK_ALTERNATION in checks and player != (1 if ply % 2 else 2):
+            issues.append(_issue(CHECK_ALTERNATION, f"wrong colour / 颜色错误: {player}", ply))
+        occupied.add((row, col))
+        board.make_move(row, col, player)
+        if winner_at is None and board.check_winner(row, col, player):
+            winner_at = ply
+
+    if CHECK_PREMATURE_FIVE in checks and winner_at is not None and winner_at < len(stones):
+        issues.append(_issue(CHECK_PREMATURE_FIVE, "five before the final move / 最后一手之前已成五", winner_at))
+    if CHECK_FINAL_FIVE in checks and winner_at != len(stones):
+        issues.append(_issue(CHECK_FINAL_FIVE, "final move does not make five / 最后一手没有成五", len(stones) or None))
+
+    result = None
+    nodes = 0
+    broken = any(issue['check'] in (CHECK_BOUNDS, CHECK_OVERLAP, CHECK_PREMATURE_FIVE) for issue in issues)
+    if solver is not None and CHECK_FORCED in checks and not broken and record.moves:
+        start, attacker = pattern_start(record._asdict(), BitBoard)
+        solved = solver.solve(start, attacker)
+        result = solved['result']
+        nodes = solved['nodes']
+        if result not in (RESULT_WIN, RESULT_PROVEN):
+            issues.append(_issue(CHECK_FORCED, f"win not proven / 未证明必胜: {result}"))
+
+    return {'id': record.id, 'valid': not issues, 'issues': issues, 'result': result, 'nodes': nodes}
+
+
+def _init_worker(solver, checks):
+    """工作进程初始化：每个进程持有一份求解器副本"""
+    global _worker_solver, _worker_checks
+    _worker_solver = solver
+    _worker_checks = checks
+
+
+def _validate_chunk(chunk):
+    """工作进程入口：校验一批记录"""
+    return [validate_record(record, _worker_solver, _worker_checks) for record in chunk]
+
+
+def _chunks(records, chunk_size):
+    """把记录序列切成小批"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validate_records(records, solver=None, checks=CHECKS, workers=1, chunk_size=32):
+    """
+    校验一批棋谱，按输入顺序逐条产生结果
+
+    workers 大于 1 时使用进程池，同时在途的批次数量有上限（workers * 4），
+    因此可以流式处理任意大的集合文件。
+
+    Args:
+        records (iterable): PatternRecord 序列
+        solver: 求解器（会复制到每个工作进程），为 None 时跳过必胜检查
+        checks (iterable): 要执行的检查项
+        workers (int): 工作进程数，None 表示 CPU 核数，1 表示在当前进程中执行
+        chunk_size (int): 每次交给工作进程的记录数
+
+    Yields:
+        dict: validate_record 的结果
+    """
+    checks = tuple(checks)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for record in records:
+            yield validate_record(record, solver, checks)
+        return
+
+    window = workers * 4
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(solver, checks)) as pool:
+        pending = deque()
+        for chunk in _chunks(records, chunk_size):
+            pending.append(pool.submit(_validate_chunk, chunk))
+            while len(pending) > window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def validation_report(results, include_valid=False):
+    """
+    汇总校验结果为可序列化的报告
+
+    Args:
+        results (iterable): validate_record 结果序列
+        include_valid (bool): 是否在 'results' 中保留通过校验的记录
+
+    Returns:
+        dict: {'records', 'valid', 'invalid', 'issues': {检查项: 次数}, 'time', 'results': [...]}
+    """
+    start = time.perf_counter()
+    report = {'records': 0, 'valid': 0, 'invalid': 0, 'issues': {}, 'time': 0.0, 'results': []}
+    for result in results:
+        report['records'] += 1
+        if result['valid']:
+            report['valid'] += 1
+        else:
+            report['invalid'] += 1
+            for issue in result['issues']:
+                report['issues'][issue['check']] = report['issues'].get(issue['check'], 0) + 1
+        if include_valid or not result['valid']:
+            report['results'].append(result)
+    report['time'] = round(time.perf_counter() - start, 6)
+    return report
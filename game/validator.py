@@ -7,11 +7,30 @@ Validate if player moves comply with pattern requirements, support player vs com
 
 from typing import Tuple, Optional
 
+from .board import get_zobrist_keys
+from .hints import HINT_LEVELS, HINT_THREAT, HintProvider, area_text, hint_message
+from .vcf import pattern_attacker
+from .vct import RESULT_DISPROVEN, RESULT_PROVEN, VCTSolver, proof_tree_size
+
 
 class MoveValidator:
-    """走法验证器 - 残局训练模式（玩家固定执行一种颜色）"""
+    """走法验证器 - 残局训练模式（玩家固定执行一种颜色）
+
+    玩家走了与棋谱不同的点时，用 VCT 求解器在点击延迟预算内检查这一手是否仍然必胜；
+    必胜则接受，并改为沿证明树推导电脑的应手。证明结果按局面哈希缓存。
+    """
     
-    def __init__(self, pattern_manager, board, language_manager=None):
+    # 点击的总延迟预算（秒）
+    CLICK_BUDGET = 0.05
+    # 点击路径上求解器的时间预算（秒），其余留给走错后的提示分析。
+    # 预算内没有结论的走法按错误处理、不缓存；预想会在后台用 PONDER_TIME_LIMIT 提前求解
+    SOLVER_TIME_LIMIT = 0.04
+    # 预想（玩家思考时在后台提前检查候选走法）中每一手的求解时间预算（秒）
+    PONDER_TIME_LIMIT = 0.5
+    # 证明缓存的最大项数，超出时清空
+    PROOF_CACHE_SIZE = 4096
+    
+    def __init__(self, pattern_manager, board, language_manager=None, proof_cache=None, solver=None, hints=None):
         """
         初始化验证器
         
@@ -19,6 +38,9 @@ class MoveValidator:
             pattern_manager: 棋谱管理器
             board: 棋盘对象
             language_manager: 语言管理器
+            proof_cache (dict): 证明缓存（多个验证器可共享），None 时新建
+            solver (VCTSolver): 检查非棋谱走法的求解器（多个验证器可共享），None 时按点击时间预算新建
+            hints (HintProvider): 分级提示生成器（多个验证器可共享），None 时新建
         """
         self.pattern_manager = pattern_manager
         self.board = board
@@ -29,6 +51,12 @@ class MoveValidator:
         self.player_color = None  # 玩家固定执行的颜色 (1=黑子, 2=白子)
         self.computer_color = None  # 电脑固定执行的颜色
         self.is_player_turn = True  # 当前是否轮到玩家
+        self.solver = solver if solver is not None else VCTSolver(time_limit=self.SOLVER_TIME_LIMIT)
+        # (走后局面哈希, 玩家) -> 证明树（None 表示已被反证）
+        self._proofs = proof_cache if proof_cache is not None else {}
+        self.hints = hints if hints is not None else HintProvider()
+        # 偏离棋谱后沿证明树前进的节点路径，为空表示按棋谱走
+        self._proof_path = []
     
     def _get_text(self, key, *args):
         """获取翻译文本"""
@@ -50,9 +78,37 @@ class MoveValidator:
                 'area_center': 'center',
                 'area_right': 'right',
                 'area_hint': '{} {} area',
+                'hint_level': 'Hint {}/{}:',
+                'hint_attack': 'look for an attacking move: {}.',
+                'hint_defend': "first block your opponent's {}.",
+                'hint_develop': 'there is no forcing move yet, strengthen your own shape.',
+                'hint_restrict': "there is no forcing move yet, hem in your opponent's stones.",
+                'hint_direction': 'the key line is {}, in the {}.',
+                'hint_candidates': 'the move is one of {}.',
+                'hint_play_at': 'play at {}.',
+                'direction_horizontal': 'horizontal',
+                'direction_vertical': 'vertical',
+                'direction_diagonal': 'diagonal (top-left to bottom-right)',
+                'direction_anti_diagonal': 'diagonal (top-right to bottom-left)',
+                'threat_five': 'five in a row',
+                'threat_open_four': 'open four',
+                'threat_four_three': 'four-three',
+                'threat_four': 'four',
+                'threat_double_three': 'double three',
+                'threat_three': 'open three',
+                'threat_two': 'two',
                 'its_player_turn': "It's player's turn!",
                 'computer_moved_your_turn': 'Computer moved, your turn!',
-                'computer_move_failed': 'Computer move failed!'
+                'computer_move_failed': 'Computer move failed!',
+                'position_occupied': 'Position occupied, please choose another one!',
+                'please_select_pattern_first': 'Please select an endgame pattern first!',
+                'please_select_first': 'Please select a pattern first!',
+                'load_pattern_failed': 'Failed to load pattern!',
+                'endgame_restarted': 'Endgame restarted! You use WHITE stones, computer uses BLACK.',
+                'system_demo_correct': 'System demo: Correct move',
+                'no_moves_undo': 'No moves to undo!',
+                'undid_one_move': 'Undid one move!',
+                'undid_moves_back': 'Undid {} moves, back to your turn!'
             }
             text = default_texts.get(key, key)
             if args:
@@ -89,7 +145,7 @@ class MoveValidator:
             }
         
         # 获取当前应该下的步骤
-        expected_move = self.pattern_manager.get_current_move()
+        expected_move = self.get_expected_move()
         if not expected_move:
             return {
                 'valid': False,
@@ -113,18 +169,26 @@ class MoveValidator:
                 'computer_move': False
             }
         
-        # 检查玩家走法是否正确
-        if row == expected_row and col == expected_col:
+        # 检查玩家走法是否正确：与棋谱相同，或经求解器证明同样必胜
+        alternative = None
+        if (row, col) != (expected_row, expected_col):
+            alternative = self._find_alternative(row, col)
+        if (row, col) == (expected_row, expected_col) or alternative is not None:
             # 走法正确
             self.error_count = 0  # 重置错误计数
             self.last_error_move = None
-            self.pattern_manager.advance_step()
+            if alternative is not None:
+                # 改为沿证明树继续：之后的电脑应手由证明树推导
+                self._proof_path.append(alternative)
+                expected_move = (row, col, self.player_color)
+            else:
+                self._advance(expected_move)
             
             # 切换到电脑回合
             self.is_player_turn = False
             
             # 检查棋谱是否完成
-            pattern_complete = self.pattern_manager.is_pattern_complete()
+            pattern_complete = self.is_pattern_complete()
             
             return {
                 'valid': True,
@@ -160,6 +224,116 @@ class MoveValidator:
                     'computer_move': False
                 }
     
+    def get_expected_move(self):
+        """
+        获取当前应走的一手：按棋谱走时为棋谱中的走法，偏离棋谱后为证明树中的走法
+        
+        Returns:
+            tuple: (row, col, player) or None
+        """
+        if not self._proof_path:
+            return self.pattern_manager.get_current_move()
+        node = self._proof_path[-1]
+        if not node['children']:
+            return None
+        if node['move'][2] == self.player_color:
+            # 电脑（防守方）应手：选子树最大的一手，让玩家多走几步
+            return max(node['children'], key=proof_tree_size)['move']
+        return node['children'][0]['move']
+    
+    def is_pattern_complete(self):
+        """
+        检查残局是否已完成（偏离棋谱后以证明树走到底为准）
+        
+        Returns:
+            bool: 是否完成
+        """
+        if not self._proof_path:
+            return self.pattern_manager.is_pattern_complete()
+        return not self._proof_path[-1]['children']
+    
+    def undo_step(self):
+        """悔棋时回退一步：先退证明树路径，退空后再回退棋谱步骤"""
+        if self._proof_path:
+            self._proof_path.pop()
+        elif self.pattern_manager.current_step > 0:
+            self.pattern_manager.current_step -= 1
+    
+    def _advance(self, move):
+        """走完 move 后前进一步"""
+        if not self._proof_path:
+            self.pattern_manager.advance_step()
+            return
+        for child in self._proof_path[-1]['children']:
+            if child['move'] == move:
+                self._proof_path.append(child)
+                return
+    
+    def precheck_move(self, row, col, board=None, time_limit=None, should_stop=None):
+        """
+        提前检查玩家的一手（预想用）：求解结果写入证明缓存，玩家真正落子时不再调用求解器
+        
+        Args:
+            row (int): 行
+            col (int): 列
+            board (Board): 当前局面（可以是棋盘副本），默认为验证器的棋盘
+            time_limit (float): 求解时间预算，默认 PONDER_TIME_LIMIT
+            should_stop (callable): 求解器的停止检查
+        
+        Returns:
+            bool: 落子时能否立即得到检查结果（棋谱走法、不需要求解或结果已缓存）
+        """
+        board = self.board if board is None else board
+        expected_move = self.get_expected_move()
+        if expected_move is None or expected_move[:2] == (row, col) or not self._can_prove(board, row, col):
+            return True
+        time_limit = self.PONDER_TIME_LIMIT if time_limit is None else time_limit
+        self._find_alternative(row, col, board, time_limit, should_stop)
+        return self._proof_key(board, row, col) in self._proofs
+    
+    def _can_prove(self, board, row, col):
+        """只在玩家是进攻方、且落点为空时用求解器检查"""
+        pattern = self.pattern_manager.current_pattern
+        if not pattern or pattern_attacker(pattern) != self.player_color:
+            return False
+        return board.is_valid_move(row, col)
+    
+    def _proof_key(self, board, row, col):
+        """证明缓存的键：(走后局面哈希, 玩家)"""
+        return (board.hash ^ get_zobrist_keys(board.size)[self.player_color][row * board.size + col],
+                self.player_color)
+    
+    def _find_alternative(self, row, col, board=None, time_limit=None, should_stop=None):
+        """
+        检查玩家与棋谱不同的走法是否仍然必胜（只在玩家是进攻方时检查）
+        
+        Args:
+            board (Board): 当前局面，默认为验证器的棋盘
+            time_limit (float): 求解时间预算，默认使用求解器设置（点击延迟预算）
+            should_stop (callable): 求解器的停止检查
+        
+        Returns:
+            dict: 以玩家这一手为根的证明树，不能证明时为 None
+        """
+        board = self.board if board is None else board
+        if not self._can_prove(board, row, col):
+            return None
+        key = self._proof_key(board, row, col)
+        if key in self._proofs:
+            return self._proofs[key]
+        solved = self.solver.solve_move(board, self.player_color, (row, col), time_limit, should_stop)
+        if solved['result'] == RESULT_PROVEN:
+            tree = solved['tree']
+        elif solved['result'] == RESULT_DISPROVEN:
+            tree = None
+        else:
+            # 预算内没有结论：不缓存，下次再试
+            return None
+        if len(self._proofs) >= self.PROOF_CACHE_SIZE:
+            self._proofs.clear()
+        self._proofs[key] = tree
+        return tree
+    
     def _format_position(self, row, col):
         """
         格式化位置信息
@@ -176,9 +350,30 @@ class MoveValidator:
         row_number = row + 1
         return f"{col_letter}{row_number} ({row}, {col})"
     
+    def get_hint(self, level, should_stop=None):
+        """
+        当前应走一手的分级提示
+        
+        Args:
+            level (int): 提示级别 HINT_THREAT ~ HINT_MOVE（威胁类型、方向、候选点、具体走法）
+            should_stop (callable): 分析的停止检查
+            
+        Returns:
+            dict: HintProvider.analyse 的结果加上 'level' 和 'message'；不是玩家回合或已完成时为 None
+        """
+        expected_move = self.get_expected_move()
+        if not self.is_player_turn or not expected_move or expected_move[2] != self.player_color:
+            return None
+        info = self.hints.analyse(self.board, self.player_color, expected_move[:2], should_stop)
+        if info is None:
+            return None
+        level = max(HINT_THREAT, min(level, HINT_LEVELS))
+        message = hint_message(info, level, self._get_text, self._format_position, self.board.size)
+        return dict(info, level=level, message=message)
+    
     def _get_hint(self, expected_row, expected_col):
         """
-        获取位置提示
+        走错后的提示：错得越多越具体（第一次提示威胁类型，第二次提示方向和区域）
         
         Args:
             expected_row (int): 期望的行
@@ -187,25 +382,10 @@ class MoveValidator:
         Returns:
             str: 提示信息
         """
-        # 根据棋盘区域给出提示
-        board_size = self.board.size
-        
-        # 确定区域
-        if expected_row < board_size // 3:
-            row_region = self._get_text("area_upper")
-        elif expected_row < 2 * board_size // 3:
-            row_region = self._get_text("area_middle")
-        else:
-            row_region = self._get_text("area_lower")
-            
-        if expected_col < board_size // 3:
-            col_region = self._get_text("area_left")
-        elif expected_col < 2 * board_size // 3:
-            col_region = self._get_text("area_center")
-        else:
-            col_region = self._get_text("area_right")
-        
-        return self._get_text("area_hint", row_region, col_region)
+        hint = self.get_hint(self.error_count)
+        if hint is None:
+            return area_text(expected_row, expected_col, self.board.size, self._get_text)
+        return hint['message']
     
     def make_computer_move(self):
         """
@@ -226,7 +406,7 @@ class MoveValidator:
                 'pattern_complete': False
             }
             
-        expected_move = self.pattern_manager.get_current_move()
+        expected_move = self.get_expected_move()
         
         if not expected_move:
             return {
@@ -247,12 +427,12 @@ class MoveValidator:
         
         # 电脑执行走法（使用棋谱中期望的颜色）
         if self.board.make_move(expected_row, expected_col, expected_color):
-            self.pattern_manager.advance_step()
+            self._advance(expected_move)
             # 切换到玩家回合
             self.is_player_turn = True
             
             # 检查棋谱是否完成
-            pattern_complete = self.pattern_manager.is_pattern_complete()
+            pattern_complete = self.is_pattern_complete()
             
             if pattern_complete:
                 message = self._get_text('pattern_completed')
@@ -278,14 +458,14 @@ class MoveValidator:
         Returns:
             tuple: (row, col, player) 或 None
         """
-        expected_move = self.pattern_manager.get_current_move()
+        expected_move = self.get_expected_move()
         
         if expected_move:
             row, col, expected_color = expected_move
             # 根据期望颜色决定使用哪个玩家的颜色
             actual_color = expected_color  # 保持原有的颜色
             if self.board.make_move(row, col, actual_color):
-                self.pattern_manager.advance_step()
+                self._advance(expected_move)
                 self.error_count = 0  # 重置错误计数
                 
                 # 正确处理回合切换：如果刚才是玩家的走法，现在轮到电脑；反之亦然
@@ -328,6 +508,7 @@ class MoveValidator:
         """重置游戏状态"""
         self.error_count = 0
         self.last_error_move = None
+        self._proof_path = []
         # 重新初始化玩家颜色
         self.initialize_player_colors()
     
@@ -0,0 +1,247 @@
+"""
+VCF Solver
+连续冲四（VCF）求解器
+Prove or refute a forced win by continuous fours and return the shortest winning line
+证明或否定连续冲四必胜，并返回最短的制胜序列
+"""
+
+import time
+
+from .bitboard import BitBoard
+from .board import Board
+from .engine import SIDE_KEY
+from .shapes import get_shape_table
+from .threats import THREAT_FOUR, cell_entries, find_five_moves, find_threat_moves, five_cells
+
+# 求解结果
+RESULT_WIN = 'win'          # 存在连续冲四必胜
+RESULT_NO_WIN = 'no_win'    # 在深度限制内不存在连续冲四必胜
+RESULT_UNKNOWN = 'unknown'  # 预算耗尽，未能得出结论
+
+
+class _BudgetExceeded(Exception):
+    """节点或时间预算耗尽"""
+
+
+class VCFSolver:
+    """VCF Solver / 连续冲四求解器
+
+    进攻方每一手都必须是冲四（或直接成五），防守方只能堵成五点。
+    采用迭代加深，因此找到的制胜序列是最短的。
+    """
+
+    def __init__(self, max_depth=12, max_nodes=200000, time_limit=None):
+        """
+        初始化求解器
+
+        Args:
+            max_depth (int): 进攻方最多的冲四手数
+            max_nodes (int): 节点预算，None 表示不限
+            time_limit (float): 时间预算（秒），None 表示不限
+        """
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.nodes = 0
+        self._failed = {}
+        self._deadline = None
+        self._table = None
+
+    def solve(self, board, attacker):
+        """
+        求解进攻方（轮到其走棋）是否有连续冲四必胜
+
+        Args:
+            board (Board): 当前棋盘（不会被修改）
+            attacker (int): 进攻方 (1=黑子, 2=白子)
+
+        Returns:
+            dict: {
+                'result': str,   # 'win' / 'no_win' / 'unknown'
+                'line': list,    # 制胜序列 [(row, col, player), ...]，含防守方应手
+                'nodes': int,    # 搜索节点数
+                'time': float    # 耗时（秒）
+            }
+        """
+        work = BitBoard.from_board(board)
+        self._table = get_shape_table()
+        self._failed = {}
+        self.nodes = 0
+        start = time.perf_counter()
+        self._deadline = start + self.time_limit if self.time_limit else None
+
+        defender = 3 - attacker
+        threats = find_five_moves(work, defender, self._table)
+        result = RESULT_NO_WIN
+        line = []
+        try:
+            for depth in range(1, self.max_depth + 1):
+                found = self._search(work, attacker, depth, threats)
+                if found is not None:
+                    result = RESULT_WIN
+                    line = [divmod(index, work.size) + (player,) for index, player in found]
+                    break
+        except _BudgetExceeded:
+            result = RESULT_UNKNOWN
+
+        return {
+            'result': result,
+            'line': line,
+            'nodes': self.nodes,
+            'time': time.perf_counter() - start
+        }
+
+    def _tick(self):
+        """节点计数并检查预算"""
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise _BudgetExceeded()
+        if self._deadline is not None and not self.nodes & 255:
+            if time.perf_counter() >= self._deadline:
+                raise _BudgetExceeded()
+
+    def _search(self, board, attacker, depth, threats):
+        """
+        进攻方走棋的节点
+
+        Args:
+            board (BitBoard): 工作棋盘
+            attacker (int): 进攻方
+            depth (int): 剩余冲四手数
+            threats (list): 防守方已有的成五点
+
+        Returns:
+            list: 制胜序列 [(index, player), ...]，失败时为 None
+        """
+        self._tick()
+        table = self._table
+        defender = 3 - attacker
+        size = board.size
+
+        fives = find_five_moves(board, attacker, table)
+        if fives:
+            return [(fives[0], attacker)]
+
+        pending = [index for index in threats if not board.cells[index]]
+        if len(set(pending)) > 1 or depth <= 0:
+            return None
+
+        # 与搜索引擎相同的走棋方键：白方进攻时异或 SIDE_KEY，不与局面哈希的低位混在一起
+        key = board.hash ^ SIDE_KEY if attacker == 2 else board.hash
+        if self._failed.get(key, -1) >= depth:
+            return None
+
+        candidates = find_threat_moves(board, attacker, THREAT_FOUR, table)
+        if pending:
+            # 防守方已有冲四：进攻方只能在其成五点上冲四
+            candidates = [item for item in candidates if item[1] == pending[0]]
+
+        for _, index, entries in candidates:
+            row, col = divmod(index, size)
+            board.make_move(row, col, attacker)
+            try:
+                points = five_cells(board, index, attacker, entries)
+                if len(points) >= 2:
+                    # 活四或双四：防守方只能堵住一个
+                    block = min(points)
+                    finish = max(points)
+                    return [(index, attacker), (block, defender), (finish, attacker)]
+                if len(points) != 1:
+                    continue
+                block = points.pop()
+                block_row, block_col = divmod(block, size)
+                board.make_move(block_row, block_col, defender)
+                try:
+                    if board.check_winner(block_row, block_col, defender):
+                        continue
+                    new_threats = five_cells(board, block, defender,
+                                             cell_entries(board, block, defender, table))
+                    rest = self._search(board, attacker, depth - 1, list(new_threats))
+                finally:
+                    board.undo_move()
+                if rest is not None:
+                    return [(index, attacker), (block, defender)] + rest
+            finally:
+                board.undo_move()
+
+        self._failed[key] = depth
+        return None
+
+
+def pattern_attacker(pattern):
+    """
+    棋谱的进攻方：第一手的颜色，即开局时轮到走棋、题目要求取胜的一方
+
+    验证、校验、评级和训练时的走法检查都以此为准。
+
+    Args:
+        pattern (dict): 棋谱数据（含 moves）
+
+    Returns:
+        int: 进攻方 (1=黑子, 2=白子)，没有走法时为 None
+    """
+    moves = pattern['moves']
+    return moves[0][2] if moves else None
+
+
+def pattern_start(pattern, board_class=Board):
+    """
+    摆出棋谱的求解起点：放置初始局面，轮到进攻方（见 pattern_attacker）走棋
+
+    Args:
+        pattern (dict): 棋谱数据（含 initial_setup 和 moves）
+        board_class (type): 棋盘类
+
+    Returns:
+        tuple: (board, attacker)
+    """
+    board = board_class()
+    for row, col, player in pattern['initial_setup']:
+        board.make_move(row, col, player)
+    return board, pattern_attacker(pattern)
+
+
+def verify_pattern(pattern, solver=None):
+    """
+    用 VCF 求解器验证棋谱：宣称获胜的一方是否真的有连续冲四必胜
+
+    Args:
+        pattern (dict): 棋谱数据
+        solver (VCFSolver): 求解器，默认新建
+
+    Returns:
+        dict: {
+            'id': str,
+            'attacker': int,         # 进攻方（见 pattern_attacker）
+            'result': str,           # 求解结果
+            'line': list,            # 求解得到的最短制胜序列
+            'script_wins': bool,     # 棋谱给出的走法最后是否真的成五
+            'nodes': int,
+            'time': float
+        }
+    """
+    solver = solver or VCFSolver()
+    board, attacker = pattern_start(pattern, BitBoard)
+    if attacker is None:
+        return {'id': pattern.get('id'), 'attacker': None, 'result': RESULT_NO_WIN,
+                'line': [], 'script_wins': False, 'nodes': 0, 'time': 0.0}
+
+    solved = solver.solve(board, attacker)
+
+    script_wins = False
+    for row, col, player in pattern['moves']:
+        if not board.make_move(row, col, player):
+            break
+        if board.check_winner(row, col, player):
+            script_wins = player == attacker
+            break
+
+    return {
+        'id': pattern.get('id'),
+        'attacker': attacker,
+        'result': solved['result'],
+        'line': solved['line'],
+        'script_wins': script_wins,
+        'nodes': solved['nodes'],
+        'time': solved['time']
+    }
@@ -0,0 +1,430 @@
+"""
+VCT Solver
+连续攻击（VCT）求解器
+Depth-first proof-number (df-pn) search over threat moves (fours and threes)
+with a bounded transposition table; returns proven/disproven/unknown and the proof tree
+在威胁走法（冲四和活三）上做深度优先证明数搜索（df-pn），置换表有容量上限，返回证明结果和证明树
+"""
+
+import time
+
+from .bitboard import BitBoard
+from .engine import SIDE_KEY
+from .shapes import get_shape_table
+from .threats import (
+    THREAT_DOUBLE_THREE, THREAT_FIVE, THREAT_FOUR, THREAT_FOUR_THREE, THREAT_OPEN_FOUR, THREAT_THREE,
+    ThreatMap,
+)
+
+# 求解结果
+RESULT_PROVEN = 'proven'        # 进攻方有连续攻击必胜
+RESULT_DISPROVEN = 'disproven'  # 在深度限制内没有连续攻击必胜
+RESULT_UNKNOWN = 'unknown'      # 预算耗尽，未能得出结论
+
+# 证明数 / 反证数的无穷大
+INFINITY = 1 << 30
+
+# 进攻方走法的初始证明数（按威胁等级）：威胁越强，防守方的应手越少
+INITIAL_PROOF = {
+    THREAT_FIVE: 1,
+    THREAT_OPEN_FOUR: 1,
+    THREAT_FOUR_THREE: 1,
+    THREAT_FOUR: 2,
+    THREAT_DOUBLE_THREE: 2,
+    THREAT_THREE: 8,
+}
+
+
+class _BudgetExceeded(Exception):
+    """节点或时间预算耗尽"""
+
+
+class VCTSolver:
+    """VCT Solver / 连续攻击求解器
+
+    进攻方（OR 节点）只走冲四或活三，防守方（AND 节点）只考虑
+    挡住成五点、挡住活四点、对方的冲四点以及自己的反冲四。
+    同一棋子集合离根的步数固定，因此深度限制不会破坏置换表的一致性。
+    """
+
+    def __init__(self, max_depth=10, max_nodes=200000, time_limit=None, tt_size=1 << 18):
+        """
+        初始化求解器
+
+        Args:
+            max_depth (int): 进攻方最多的攻击手数
+            max_nodes (int): 节点预算，None 表示不限
+            time_limit (float): 时间预算（秒），None 表示不限
+            tt_size (int): 置换表最大项数
+        """
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.tt_size = tt_size
+        self.tt = {}
+        self.nodes = 0
+        self._deadline = None
+        self._should_stop = None
+        self._table = None
+        self._threat_map = None
+        self._attacker = 1
+        self._root_moves = 0
+        self._root = None
+
+    def clear(self):
+        """清空置换表"""
+        self.tt = {}
+        self._root = None
+
+    def solve(self, board, attacker):
+        """
+        求解进攻方（轮到其走棋）是否有连续攻击必胜
+
+        Args:
+            board (Board): 当前棋盘（不会被修改）
+            attacker (int): 进攻方 (1=黑子, 2=白子)
+
+        Returns:
+            dict: {
+                'result': str,   # 'proven' / 'disproven' / 'unknown'
+                'move': tuple,   # 制胜第一手 (row, col)，未证明时为 None
+                'tree': dict,    # 证明树 {'move': (row, col, player) 或 None, 'children': [...]}
+                'nodes': int,    # 搜索节点数
+                'time': float    # 耗时（秒）
+            }
+        """
+        work, start = self._prepare(board, attacker)
+        result = RESULT_UNKNOWN
+        tree = None
+        move = None
+        try:
+            proof, disproof = self._mid(work, True, INFINITY, INFINITY)
+            if proof == 0:
+                tree = self._proof_tree(work, True, None)
+                result = RESULT_PROVEN
+                if tree['children']:
+                    move = tree['children'][0]['move'][:2]
+            elif disproof == 0:
+                result = RESULT_DISPROVEN
+        except _BudgetExceeded:
+            pass
+
+        return {
+            'result': result,
+            'move': move,
+            'tree': tree,
+            'nodes': self.nodes,
+            'time': time.perf_counter() - start
+        }
+
+    def solve_move(self, board, attacker, move, time_limit=None, should_stop=None):
+        """
+        求解进攻方（轮到其走棋）先走 move 之后是否仍然必胜
+
+        用于判断某一手是否为制胜走法（不要求是证明树中的那一手）。
+
+        Args:
+            board (Board): 当前棋盘（不会被修改）
+            attacker (int): 进攻方
+            move (tuple): 进攻方的走法 (row, col)
+            time_limit (float): 本次求解的时间预算，默认使用求解器设置
+            should_stop (callable): 每 16 个节点调用一次，返回 True 时像预算耗尽一样提前结束
+
+        Returns:
+            dict: {'result': str, 'tree': 以 move 为根的证明树（未证明时为 None）,
+                   'nodes': int, 'time': float}
+
+        Raises:
+            ValueError: move 不是空位
+        """
+        work, start = self._prepare(board, attacker, time_limit, should_stop)
+        row, col = move
+        if not self._threat_map.make_move(row, col, attacker):
+            raise ValueError(f"illegal move / 非法落子: {move}")
+
+        result = RESULT_UNKNOWN
+        tree = None
+        if work.check_winner(row, col, attacker):
+            result = RESULT_PROVEN
+            tree = {'move': (row, col, attacker), 'children': []}
+        else:
+            try:
+                proof, disproof = self._mid(work, False, INFINITY, INFINITY)
+                if proof == 0:
+                    tree = self._proof_tree(work, False, (row, col, attacker))
+                    result = RESULT_PROVEN
+                elif disproof == 0:
+                    result = RESULT_DISPROVEN
+            except _BudgetExceeded:
+                pass
+
+        return {'result': result, 'tree': tree, 'nodes': self.nodes, 'time': time.perf_counter() - start}
+
+    def _prepare(self, board, attacker, time_limit=None, should_stop=None):
+        """
+        每次求解前重置状态，返回 (工作棋盘, 开始时间)
+
+        根局面、进攻方和深度限制与上一次相同时保留置换表：深度限制都从同一个根计算，表项仍然有效，
+        因此预算耗尽的求解可以在下一次调用时接着搜索。
+        """
+        work = BitBoard.from_board(board)
+        self._table = get_shape_table()
+        root = (work.hash, attacker, len(work.move_history), self.max_depth)
+        if root != self._root:
+            self.tt = {}
+            self._root = root
+        self._attacker = attacker
+        self._root_moves = len(work.move_history)
+        # 双方的威胁走法随落子增量维护，节点展开时不再扫描候选点
+        self._threat_map = ThreatMap(work, THREAT_THREE, self._table)
+        self.nodes = 0
+        start = time.perf_counter()
+        time_limit = self.time_limit if time_limit is None else time_limit
+        self._deadline = start + time_limit if time_limit else None
+        self._should_stop = should_stop
+        return work, start
+
+    def _tick(self):
+        """节点计数并检查预算"""
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise _BudgetExceeded()
+        # VCT 节点较重，每 16 个节点检查一次时间，保证短时间预算不超时太多
+        if not self.nodes & 15:
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                raise _BudgetExceeded()
+            if self._should_stop is not None and self._should_stop():
+                raise _BudgetExceeded()
+
+    def _key(self, board, is_or):
+        """置换表键：局面哈希加节点类型"""
+        return board.hash if is_or else board.hash ^ SIDE_KEY
+
+    def _store(self, key, proof, disproof):
+        """
+        写入置换表；满了时一次淘汰到半满（均摊每次写入 O(1)），
+        依次保留已证明、已反证、未定论的项（证明树需要已证明的项）
+        """
+        if len(self.tt) >= self.tt_size and key not in self.tt:
+            proven, disproven, open_entries = [], [], []
+            for item in self.tt.items():
+                value = item[1]
+                (proven if value[0] == 0 else disproven if value[1] == 0 else open_entries).append(item)
+            kept = (proven + disproven + open_entries)[:self.tt_size // 2]
+            self.tt = dict(kept)
+        self.tt[key] = (proof, disproof)
+
+    def _threats(self, board, player):
+        """从增量威胁表取出 player 的活三及以上走法 [(level, index), ...]（从强到弱）"""
+        return self._threat_map.threats(player)
+
+    def _or_moves(self, board):
+        """
+        生成进攻方的走法
+
+        Returns:
+            tuple: (proof, disproof, moves)；moves 为 [(index, 初始证明数), ...]，
+                   已有定论时为成五点或空列表
+        """
+        threats = self._threats(board, self._attacker)
+        if threats and threats[0][0] == THREAT_FIVE:
+            return 0, INFINITY, [(threats[0][1], 1)]
+        if (len(board.move_history) - self._root_moves) // 2 >= self.max_depth:
+            return INFINITY, 0, []
+        blocks = [index for level, index in self._threats(board, 3 - self._attacker)
+                  if level == THREAT_FIVE]
+        if len(blocks) > 1:
+            return INFINITY, 0, []
+        if blocks:
+            # 防守方有冲四：只能先挡住
+            return 1, 1, [(blocks[0], 1)]
+        if not threats:
+            return INFINITY, 0, []
+        return 1, 1, [(index, INITIAL_PROOF[level]) for level, index in threats]
+
+    def _and_moves(self, board):
+        """
+        生成防守方的应手
+
+        Returns:
+            tuple: (proof, disproof, moves)；moves 为 [(index, 1), ...]
+        """
+        counters = self._threats(board, 3 - self._attacker)
+        if counters and counters[0][0] == THREAT_FIVE:
+            return INFINITY, 0, []
+        threats = self._threats(board, self._attacker)
+        fives = [index for level, index in threats if level == THREAT_FIVE]
+        if fives:
+            return 1, 1, [(index, 1) for index in fives]
+        if not threats or threats[0][0] < THREAT_OPEN_FOUR:
+            # 进攻方没有留下威胁，防守方可以自由走棋
+            return INFINITY, 0, []
+        # 挡活三：对方所有冲四点（含活四点），以及自己的反冲四
+        moves = {index for level, index in threats if level >= THREAT_FOUR}
+        moves.update(index for level, index in counters if level >= THREAT_FOUR)
+        return 1, 1, [(index, 1) for index in sorted(moves)]
+
+    def _mid(self, board, is_or, proof_threshold, disproof_threshold):
+        """
+        df-pn 的多重迭代加深（MID）
+
+        Args:
+            board (BitBoard): 工作棋盘
+            is_or (bool): 是否为进攻方走棋的 OR 节点
+            proof_threshold (int): 证明数阈值
+            disproof_threshold (int): 反证数阈值
+
+        Returns:
+            tuple: 节点的 (证明数, 反证数)
+        """
+        self._tick()
+        key = self._key(board, is_or)
+        proof, disproof, moves = self._or_moves(board) if is_or else self._and_moves(board)
+        if proof == 0 or disproof == 0:
+            self._store(key, proof, disproof)
+            return proof, disproof
+
+        player = self._attacker if is_or else 3 - self._attacker
+        keys = board._zobrist[player]
+        # 子节点：(下标, 置换表键, 未展开时的初始值)
+        child_base = self._key(board, not is_or)
+        children = [(index, child_base ^ keys[index], (initial, 1)) for index, initial in moves]
+        side = 0 if is_or else 1
+        threat_map = self._threat_map
+
+        while True:
+            tt = self.tt
+            values = [tt.get(child_key, initial) for _, child_key, initial in children]
+            if is_or:
+                proof = min(value[0] for value in values)
+                disproof = min(sum(value[1] for value in values), INFINITY)
+            else:
+                proof = min(sum(value[0] for value in values), INFINITY)
+                disproof = min(value[1] for value in values)
+            if proof >= proof_threshold or disproof >= disproof_threshold:
+                break
+
+            # OR 节点选证明数最小的子节点，AND 节点选反证数最小的子节点
+            best = 0
+            second = INFINITY
+            for i in range(1, len(values)):
+                if values[i][side] < values[best][side]:
+                    second = values[best][side]
+                    best = i
+                elif values[i][side] < second:
+                    second = values[i][side]
+            child_proof, child_disproof = values[best]
+            # 1+ε 技巧：让子节点多搜一会儿，减少在兄弟节点间来回切换
+            second = second + 1 + (second >> 2) if second < INFINITY else INFINITY
+            if is_or:
+                child_thresholds = (min(proof_threshold, second),
+                                    disproof_threshold - disproof + child_disproof)
+            else:
+                child_thresholds = (proof_threshold - proof + child_proof,
+                                    min(disproof_threshold, second))
+
+            row, col = divmod(children[best][0], board.size)
+            threat_map.make_move(row, col, player)
+            try:
+                self._mid(board, not is_or, *child_thresholds)
+            finally:
+                threat_map.undo_move()
+
+        self._store(key, proof, disproof)
+        return proof, disproof
+
+    def _proof_tree(self, board, is_or, move):
+        """
+        从置换表中提取证明树：OR 节点保留一个已证明的走法，AND 节点保留全部应手
+
+        子节点的表项被淘汰时先重新求解本节点再提取，不会跳过子节点：
+        AND 节点少一个应手，验证器就会把没走完的变化当作已完成。
+
+        Returns:
+            dict: {'move': (row, col, player) 或 None, 'children': [...]}
+
+        Raises:
+            _BudgetExceeded: 重新求解时预算耗尽，或仍然得不到完整的证明树
+        """
+        _, _, moves = self._or_moves(board) if is_or else self._and_moves(board)
+        player = self._attacker if is_or else 3 - self._attacker
+        chosen = self._proven_moves(board, is_or, player, moves)
+        if chosen is None:
+            self._mid(board, is_or, INFINITY, INFINITY)
+            chosen = self._proven_moves(board, is_or, player, moves)
+            if chosen is None:
+                raise _BudgetExceeded()
+        node = {'move': move, 'children': []}
+        size = board.size
+        threat_map = self._threat_map
+        for index, wins in chosen:
+            row, col = divmod(index, size)
+            if wins:
+                node['children'].append({'move': (row, col, player), 'children': []})
+                continue
+            threat_map.make_move(row, col, player)
+            try:
+                node['children'].append(self._proof_tree(board, not is_or, (row, col, player)))
+            finally:
+                threat_map.undo_move()
+        return node
+
+    def _proven_moves(self, board, is_or, player, moves):
+        """
+        按置换表选出证明树要保留的走法
+
+        Returns:
+            list: [(index, 是否直接成五), ...]；OR 节点为一个已证明的走法，AND 节点为全部应手；
+                  缺少已证明的表项时为 None
+        """
+        size = board.size
+        threat_map = self._threat_map
+        chosen = []
+        for index, _ in moves:
+            row, col = divmod(index, size)
+            threat_map.make_move(row, col, player)
+            try:
+                if is_or and board.check_winner(row, col, player):
+                    return [(index, True)]
+                entry = self.tt.get(self._key(board, not is_or))
+            finally:
+                threat_map.undo_move()
+            if entry is not None and entry[0] == 0:
+                if is_or:
+                    return [(index, False)]
+                chosen.append((index, False))
+            elif not is_or:
+                return None
+        return None if is_or else chosen
+
+
+def proof_tree_size(tree):
+    """
+    统计证明树的节点数（不含根）
+
+    Args:
+        tree (dict): VCTSolver.solve 返回的 'tree'
+
+    Returns:
+        int: 节点数
+    """
+    if not tree:
+        return 0
+    return sum(1 + proof_tree_size(child) for child in tree['children'])
+
+
+def principal_line(tree):
+    """
+    沿证明树的第一个子节点取出主变例
+
+    Args:
+        tree (dict): VCTSolver.solve 返回的 'tree'
+
+    Returns:
+        list: [(row, col, player), ...]，以进攻方成五结束
+    """
+    line = []
+    while tree and tree['children']:
+        tree = tree['children'][0]
+        line.append(tree['move'])
+    return line
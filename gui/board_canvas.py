@@ -0,0 +1,299 @@
+"""
+Board Canvas Rendering
+棋盘画布渲染
+Keep one tagged canvas item per stone plus a single last-move marker, and apply
+only the difference between what is drawn and Board.move_history, so a move,
+undo or restart costs canvas work proportional to the stones that changed
+每颗棋子对应一个带标签的画布对象，另有唯一的最后一手标记；只把已绘制内容与
+Board.move_history 的差异应用到画布上，走棋、悔棋、重新开始的画布开销只与变化的棋子数有关
+
+The board background (wood colour, grid, star points, coordinates) is rendered once
+per size / DPI into a cached PhotoImage and placed as a single canvas item; Pillow is
+used when installed, otherwise the image is filled with PhotoImage.put rectangles
+棋盘背景（木纹底色、线条、星位、坐标）按尺寸 / DPI 只渲染一次，缓存为 PhotoImage，
+作为单个画布对象放置；安装了 Pillow 时用它绘制，否则用 PhotoImage.put 填充矩形
+"""
+
+import tkinter as tk
+
+from game.board import get_zobrist_keys
+
+try:
+    from PIL import Image, ImageDraw, ImageTk
+except ImportError:
+    # Pillow 是可选依赖
+    Image = None
+
+# 画布标签
+STONE_TAG = 'stone'
+MARKER_TAG = 'last_move'
+BACKGROUND_TAG = 'background'
+
+STONE_COLORS = {1: 'black', 2: 'white'}
+
+# 背景颜色
+WOOD_COLOR = '#deb887'   # burlywood
+LINE_COLOR = '#000000'
+LABEL_COLOR = '#5a3a1a'
+
+# 3x5 点阵字体（坐标标签用），每行 3 位，从左到右
+GLYPHS = {
+    '0': ('111', '101', '101', '101', '111'), '1': ('010', '110', '010', '010', '111'),
+    '2': ('111', '001', '111', '100', '111'), '3': ('111', '001', '111', '001', '111'),
+    '4': ('101', '101', '111', '001', '001'), '5': ('111', '100', '111', '001', '111'),
+    '6': ('111', '100', '111', '101', '111'), '7': ('111', '001', '001', '001', '001'),
+    '8': ('111', '101', '111', '101', '111'), '9': ('111', '101', '111', '001', '111'),
+    'A': ('010', '101', '111', '101', '101'), 'B': ('110', '101', '110', '101', '110'),
+    'C': ('011', '100', '100', '100', '011'), 'D': ('110', '101', '101', '101', '110'),
+    'E': ('111', '100', '110', '100', '111'), 'F': ('111', '100', '110', '100', '100'),
+    'G': ('011', '100', '101', '101', '011'), 'H': ('101', '101', '111', '101', '101'),
+    'I': ('111', '010', '010', '010', '111'), 'J': ('001', '001', '001', '101', '010'),
+    'K': ('101', '101', '110', '101', '101'), 'L': ('100', '100', '100', '100', '111'),
+    'M': ('101', '111', '111', '101', '101'), 'N': ('110', '101', '101', '101', '101'),
+    'O': ('010', '101', '101', '101', '010'),
+}
+
+# (Tk 解释器, size, margin, cell_size, scale) -> PhotoImage
+_BACKGROUND_CACHE = {}
+
+
+def star_points(size):
+    """星位：15 路棋盘为四个三三和天元"""
+    edge = 3 if size >= 13 else 2
+    points = [(edge, edge), (edge, size - 1 - edge), (size - 1 - edge, edge), (size - 1 - edge, size - 1 - edge)]
+    if size % 2:
+        points.append((size // 2, size // 2))
+    return points
+
+
+def _label_rects(text, center_x, center_y, pixel):
+    """把文字按点阵字体拆成填充矩形（以 (center_x, center_y) 为中心）"""
+    width = len(text) * 4 * pixel - pixel
+    left = center_x - width // 2
+    top = center_y - 5 * pixel // 2
+    rects = []
+    for index, char in enumerate(text):
+        x0 = left + index * 4 * pixel
+        for row, bits in enumerate(GLYPHS[char]):
+            for col, bit in enumerate(bits):
+                if bit == '1':
+                    x = x0 + col * pixel
+                    y = top + row * pixel
+                    rects.append((x, y, x + pixel, y + pixel))
+    return rects
+
+
+def background_shapes(size, margin, cell_size, scale=1.0):
+    """
+    计算棋盘背景的图形
+
+    Args:
+        size (int): 棋盘路数
+        margin (int): 边距（像素）
+        cell_size (int): 格子大小（像素）
+        scale (float): 屏幕缩放（每点像素数，1.0 为 72 DPI），决定线宽和字号
+
+    Returns:
+        tuple: (图像宽, 图像高, [(kind, color, (x0, y0, x1, y1)), ...])，
+               kind 为 'rect'（右下角不含）或 'oval'，按绘制顺序排列
+    """
+    extent = margin * 2 + cell_size * (size - 1)
+    line = max(1, int(round(scale)))
+    half = line // 2
+    far = margin + cell_size * (size - 1)
+    shapes = [('rect', WOOD_COLOR, (0, 0, extent, extent))]
+    for i in range(size):
+        offset = margin + i * cell_size - half
+        shapes.append(('rect', LINE_COLOR, (offset, margin - half, offset + line, far - half + line)))
+        shapes.append(('rect', LINE_COLOR, (margin - half, offset, far - half + line, offset + line)))
+    radius = 3 * line
+    for row, col in star_points(size):
+        x = margin + col * cell_size
+        y = margin + row * cell_size
+        shapes.append(('oval', LINE_COLOR, (x - radius, y - radius, x + radius + 1, y + radius + 1)))
+    # 坐标：列用字母（上方），行用数字（左侧），与 pos_to_coord 一致
+    pixel = max(1, min(int(round(2 * scale)), margin // 8))
+    for i in range(size):
+        position = margin + i * cell_size
+        for rect in _label_rects(chr(ord('A') + i), position, margin // 2, pixel):
+            shapes.append(('rect', LABEL_COLOR, rect))
+        for rect in _label_rects(str(i + 1), margin // 2, position, pixel):
+            shapes.append(('rect', LABEL_COLOR, rect))
+    return extent, extent, shapes
+
+
+def _render_with_pillow(master, width, height, shapes):
+    """用 Pillow 绘制（星位是真正的圆）"""
+    image = Image.new('RGB', (width, height), WOOD_COLOR)
+    draw = ImageDraw.Draw(image)
+    for kind, color, (x0, y0, x1, y1) in shapes:
+        if kind == 'oval':
+            draw.ellipse((x0, y0, x1 - 1, y1 - 1), fill=color)
+        else:
+            draw.rectangle((x0, y0, x1 - 1, y1 - 1), fill=color)
+    return ImageTk.PhotoImage(image, master=master)
+
+
+def _render_with_tk(master, width, height, shapes):
+    """只用 tkinter：PhotoImage.put 填充矩形，圆按行拆成矩形"""
+    image = tk.PhotoImage(master=master, width=width, height=height)
+    for kind, color, (x0, y0, x1, y1) in shapes:
+        if kind == 'oval':
+            radius = (x1 - x0) / 2
+            cx = x0 + radius
+            cy = y0 + radius
+            for y in range(y0, y1):
+                dy = y + 0.5 - cy
+                dx = (radius * radius - dy * dy) ** 0.5
+                if dx > 0:
+                    image.put(color, to=(int(round(cx - dx)), y, int(round(cx + dx)), y + 1))
+        else:
+            image.put(color, to=(max(x0, 0), max(y0, 0), min(x1, width), min(y1, height)))
+    return image
+
+
+def get_background_image(master, size, margin, cell_size, scale=1.0):
+    """
+    获取（并缓存）棋盘背景图
+
+    Args:
+        master: Tk 根窗口或控件
+        size (int): 棋盘路数
+        margin (int): 边距（像素）
+        cell_size (int): 格子大小（像素）
+        scale (float): 屏幕缩放（见 background_shapes）
+
+    Returns:
+        PhotoImage: 背景图（调用方需要保持引用，缓存中也保留一份）
+    """
+    # 图像属于创建它的 Tk 解释器（缓存持有图像，解释器不会被回收，id 不会复用）
+    key = (id(getattr(master, 'tk', None)), size, margin, cell_size, round(scale, 2))
+    image = _BACKGROUND_CACHE.get(key)
+    if image is None:
+        width, height, shapes = background_shapes(size, margin, cell_size, scale)
+        if Image is not None:
+            image = _render_with_pillow(master, width, height, shapes)
+        else:
+            image = _render_with_tk(master, width, height, shapes)
+        _BACKGROUND_CACHE[key] = image
+    return image
+
+
+def screen_scale(widget):
+    """屏幕缩放：每点（1/72 英寸）对应的像素数"""
+    try:
+        return float(widget.tk.call('tk', 'scaling'))
+    except (tk.TclError, AttributeError, TypeError, ValueError):
+        return 1.0
+
+
+class StoneRenderer:
+    """Stone Renderer / 棋子渲染器
+
+    _drawn 与棋盘走棋历史的某个前缀一一对应：[(走法, 画布对象ID), ...]。
+    同步时从末尾向前找到第一手相同的走法，撤掉其后的棋子、补画缺少的棋子；
+    再用 Zobrist 哈希核对已绘制的局面，不一致（例如换了另一道题）时整盘重画。
+    """
+
+    def __init__(self, canvas, margin, cell_size, stone_radius=8, marker_radius=4):
+        """
+        初始化渲染器
+
+        Args:
+            canvas: tkinter Canvas
+            margin (int): 棋盘边距（像素）
+            cell_size (int): 格子大小（像素）
+            stone_radius (int): 棋子半径
+            marker_radius (int): 最后一手标记半径
+        """
+        self.canvas = canvas
+        self.margin = margin
+        self.cell_size = cell_size
+        self.stone_radius = stone_radius
+        self.marker_radius = marker_radius
+        self.size = None
+        self._drawn = []
+        self._hash = 0
+        self._marker = None
+        self._marker_move = None
+        # 统计：创建 / 删除的棋子对象数（用于测试和性能检查）
+        self.created = 0
+        self.deleted = 0
+
+    def _center(self, row, col):
+        """交叉点的画布坐标"""
+        return self.margin + col * self.cell_size, self.margin + row * self.cell_size
+
+    def _add(self, move, keys):
+        """画一颗棋子"""
+        row, col, player = move
+        x, y = self._center(row, col)
+        r = self.stone_radius
+        item = self.canvas.create_oval(x - r, y - r, x + r, y + r, fill=STONE_COLORS[player],
+                                       outline='black', width=1, tags=(STONE_TAG,))
+        self._drawn.append((move, item))
+        self._hash ^= keys[player][row * self.size + col]
+        self.created += 1
+
+    def _pop(self, keys):
+        """撤掉最后画的一颗棋子"""
+        (row, col, player), item = self._drawn.pop()
+        self.canvas.delete(item)
+        self._hash ^= keys[player][row * self.size + col]
+        self.deleted += 1
+
+    def clear(self):
+        """删除所有棋子和标记"""
+        self.canvas.delete(STONE_TAG)
+        self.canvas.delete(MARKER_TAG)
+        self.deleted += len(self._drawn)
+        self._drawn = []
+        self._hash = 0
+        self._marker = None
+        self._marker_move = None
+
+    def sync(self, board):
+        """
+        让画布与棋盘一致
+
+        Args:
+            board (Board): 棋盘
+        """
+        self.size = board.size
+        keys = get_zobrist_keys(board.size)
+        history = board.move_history
+        drawn = self._drawn
+        # 从末尾向前找共同前缀：走棋、悔棋时第一次比较就会命中
+        common = min(len(drawn), len(history))
+        while common and drawn[common - 1][0] != history[common - 1]:
+            common -= 1
+        while len(drawn) > common:
+            self._pop(keys)
+        for move in history[common:]:
+            self._add(move, keys)
+        if self._hash != board.hash:
+            # 前缀之前的棋子也不同：整盘重画
+            self.clear()
+            for move in history:
+                self._add(move, keys)
+        self._update_marker(history[-1] if history else None)
+
+    def _update_marker(self, move):
+        """把最后一手标记移到 move 上（没有棋子时隐藏）"""
+        if move == self._marker_move and self._marker is not None:
+            self.canvas.tag_raise(self._marker)
+            return
+        self._marker_move = move
+        if move is None:
+            if self._marker is not None:
+                self.canvas.itemconfigure(self._marker, state='hidden')
+            return
+        x, y = self._center(move[0], move[1])
+        r = self.marker_radius
+        if self._marker is None:
+            self._marker = self.canvas.create_oval(x - r, y - r, x + r, y + r, outline='red', width=2,
+                                                   fill='', tags=(MARKER_TAG,))
+        else:
+            self.canvas.coords(self._marker, x - r, y - r, x + r, y + r)
+            self.canvas.itemconfigure(self._marker, state='normal')
+        self.canvas.tag_raise(self._marker)
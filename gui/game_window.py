@@ -14,7 +14,18 @@ import json
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from game import Board, PatternManager, MoveValidator, sound_manager
+from game import BitBoard, Board, PatternManager, sound_manager
+from game.session import (EVENT_ANSWER, EVENT_COMPLETE, EVENT_COMPUTER, EVENT_HINT, EVENT_MOVE, EVENT_REJECTED,
+                          EVENT_RESTART, EVENT_UNDO, EVENT_WRONG, TrainingSession)
+from game.engine import SearchEngine
+from game.hints import HINT_LEVELS, HintProvider, hint_message
+from game.ponder import Ponderer
+from gui.board_canvas import BACKGROUND_TAG, StoneRenderer, get_background_image, screen_scale
+from gui.worker import BackgroundWorker
+
+# 后台任务分组：玩家落子时取消预想和还没给出的提示，不影响其他任务
+PONDER_GROUP = 'ponder'
+HINT_GROUP = 'hint'
 
 # 简单的双语配置
 CONFIG_FILE = "language_config.json"
@@ -32,6 +43,7 @@ TRANSLATIONS = {
         'restart': 'Restart',
         'undo': 'Undo',
         'show_answer': 'Show Answer',
+        'hint': 'Hint',
         'sound_on': '🔊 Sound ON',
         'sound_off': '🔇 Sound OFF',
         'hints': 'Hints:',
@@ -47,6 +59,7 @@ TRANSLATIONS = {
         'position_occupied': 'Position occupied, please choose another one!',
         'please_select_pattern_first': 'Please select an endgame pattern first!',
         'computer_turn_wait': "Computer's turn, please wait...",
+        'computer_thinking': 'Computer is thinking, please wait...',
         'no_moves_undo': 'No moves to undo!',
         'undid_one_move': 'Undid one move!',
         'undid_moves_back': 'Undid {} moves, back to your turn!',
@@ -81,9 +94,39 @@ TRANSLATIONS = {
         'area_center': 'center',
         'area_right': 'right',
         'area_hint': '{} {} area',
+        'hint_level': 'Hint {}/{}:',
+        'hint_attack': 'look for an attacking move: {}.',
+        'hint_defend': "first block your opponent's {}.",
+        'hint_develop': 'there is no forcing move yet, strengthen your own shape.',
+        'hint_restrict': "there is no forcing move yet, hem in your opponent's stones.",
+        'hint_direction': 'the key line is {}, in the {}.',
+        'hint_candidates': 'the move is one of {}.',
+        'hint_play_at': 'play at {}.',
+        'direction_horizontal': 'horizontal',
+        'direction_vertical': 'vertical',
+        'direction_diagonal': 'diagonal (top-left to bottom-right)',
+        'direction_anti_diagonal': 'diagonal (top-right to bottom-left)',
+        'threat_five': 'five in a row',
+        'threat_open_four': 'open four',
+        'threat_four_three': 'four-three',
+        'threat_four': 'four',
+        'threat_double_three': 'double three',
+        'threat_three': 'open three',
+        'threat_two': 'two',
         'its_player_turn': "It's player's turn!",
         'computer_moved_your_turn': 'Computer moved, your turn!',
-        'computer_move_failed': 'Computer move failed!'
+        'computer_move_failed': 'Computer move failed!',
+        'free_play': 'Free Play',
+        'free_play_started': 'Free play started! You use BLACK stones and move first.',
+        'free_play_mode': 'Free Play vs Computer',
+        'free_play_your_turn': 'Turn: Player(Black)',
+        'free_play_you_win': 'You win! Five in a row!',
+        'free_play_computer_wins': 'Computer wins!',
+        'free_play_draw': 'Board is full, draw!',
+        'free_play_game_over': 'Game over, press Restart to play again.',
+        'engine_move_stats': 'Computer played {} (depth {}, {} nodes, {:,.0f} nodes/s)',
+        'engine_move_pondered': 'Computer played {} instantly (analysed while you were thinking)',
+        'ponder_stats': 'Pondering: {} of {} moves analysed in advance ({:.0%})'
     },
     'chinese': {
         'app_title': '五子棋残局训练系统 - 徐慧聪制作',
@@ -96,6 +139,7 @@ TRANSLATIONS = {
         'restart': '重新开始',
         'undo': '悔棋',
         'show_answer': '显示答案',
+        'hint': '提示',
         'sound_on': '🔊 音效开',
         'sound_off': '🔇 音效关',
         'hints': '提示信息:',
@@ -111,6 +155,7 @@ TRANSLATIONS = {
         'position_occupied': '该位置已有棋子，请选择其他位置！',
         'please_select_pattern_first': '请先选择一个残局棋谱进行练习！',
         'computer_turn_wait': '现在轮到电脑下棋，请等待...',
+        'computer_thinking': '电脑正在计算，请稍候...',
         'no_moves_undo': '没有可以悔棋的步骤！',
         'undid_one_move': '已悔棋一步！',
         'undid_moves_back': '已悔棋{}步，回到你的回合！',
@@ -145,9 +190,39 @@ TRANSLATIONS = {
         'area_center': '中间',
         'area_right': '右侧',
         'area_hint': '棋盘{}{}区域',
+        'hint_level': '提示 {}/{}：',
+        'hint_attack': '找一手进攻的棋：{}。',
+        'hint_defend': '先挡住对方的{}。',
+        'hint_develop': '还没有冲四活三，先加强自己的棋形。',
+        'hint_restrict': '还没有冲四活三，先限制对方的棋子。',
+        'hint_direction': '关键的一条线是{}，位于{}。',
+        'hint_candidates': '正确走法是其中之一：{}。',
+        'hint_play_at': '下在 {}。',
+        'direction_horizontal': '横向',
+        'direction_vertical': '纵向',
+        'direction_diagonal': '斜向（左上到右下）',
+        'direction_anti_diagonal': '斜向（右上到左下）',
+        'threat_five': '五连',
+        'threat_open_four': '活四',
+        'threat_four_three': '四三',
+        'threat_four': '冲四',
+        'threat_double_three': '双活三',
+        'threat_three': '活三',
+        'threat_two': '活二',
         'its_player_turn': '现在轮到玩家下棋！',
         'computer_moved_your_turn': '电脑已下棋，轮到你了！',
-        'computer_move_failed': '电脑下棋失败！'
+        'computer_move_failed': '电脑下棋失败！',
+        'free_play': '自由对弈',
+        'free_play_started': '自由对弈开始！你执黑子先行。',
+        'free_play_mode': '与电脑自由对弈',
+        'free_play_your_turn': '轮到：玩家(黑子)',
+        'free_play_you_win': '你赢了！五子连珠！',
+        'free_play_computer_wins': '电脑获胜！',
+        'free_play_draw': '棋盘已满，和棋！',
+        'free_play_game_over': '对局已结束，请点击重新开始。',
+        'engine_move_stats': '电脑落子 {}（深度 {}，{} 个节点，每秒 {:,.0f} 个节点）',
+        'engine_move_pondered': '电脑立即落子 {}（在你思考时已经算好）',
+        'ponder_stats': '预想：{} / {} 手在你落子前已经算好（{:.0%}）'
     }
 }
 
@@ -265,7 +340,27 @@ class GameWindow:
         self.pattern_manager = PatternManager()
         # 同步语言设置到棋谱管理器
         self.pattern_manager.set_language(language_manager.current_language)
-        self.validator = MoveValidator(self.pattern_manager, self.board, language_manager)
+        # 自由对弈：玩家执黑先行，电脑用搜索引擎应对；玩家思考时预想器在后台分析其可能的应手
+        self.engine = SearchEngine(max_depth=6, time_limit=1.0)
+        self.ponderer = Ponderer(self.engine)
+        # 分级提示与引擎共用置换表；自由对弈中按局面记录已给出的提示级别
+        self.hints = HintProvider(self.engine)
+        self._free_play_hint_position = None
+        self._free_play_hint_level = 0
+        self.free_play = False
+        self.free_play_player = 1
+        self.free_play_over = False
+        self._predicted_reply = None
+        
+        # 训练流程由无界面的会话驱动，窗口只负责渲染事件和延时调度电脑应手
+        self.session = TrainingSession(self.pattern_manager, self.board, language_manager, auto_reply=False,
+                                       ponderer=self.ponderer, hints=self.hints)
+        self.validator = self.session.validator
+        
+        # 求解器 / 搜索引擎在后台线程运行，结果由主循环轮询取回；
+        # _scheduled 记录延时调度的电脑应手，悔棋、重新开始时一起取消
+        self.worker = BackgroundWorker(self.root)
+        self._scheduled = set()
         
         # 音效管理器
         self.sound_manager = sound_manager
@@ -300,6 +395,8 @@ class GameWindow:
             bg="burlywood"
         )
         self.canvas.pack()
+        self.stone_renderer = StoneRenderer(self.canvas, self.margin, self.cell_size)
+        self.background_image = None
         
         # 游戏控制按钮
         control_frame = ttk.Frame(game_frame)
@@ -308,7 +405,9 @@ class GameWindow:
         ttk.Button(control_frame, text=language_manager.get_text('select_pattern'), command=self.show_pattern_selection).pack(side=tk.LEFT, padx=5)
         ttk.Button(control_frame, text=language_manager.get_text('restart'), command=self.restart_pattern).pack(side=tk.LEFT, padx=5)
         ttk.Button(control_frame, text=language_manager.get_text('undo'), command=self.undo_move).pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text=language_manager.get_text('hint'), command=self.show_hint).pack(side=tk.LEFT, padx=5)
         ttk.Button(control_frame, text=language_manager.get_text('show_answer'), command=self.show_answer).pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text=language_manager.get_text('free_play'), command=self.start_free_play).pack(side=tk.LEFT, padx=5)
         
         # 音效控制按钮
         self.sound_button_text = tk.StringVar()
@@ -353,62 +452,20 @@ class GameWindow:
         self.draw_board()
     
     def draw_board(self):
-        """绘制棋盘"""
-        self.canvas.delete("all")
-        
-        # 绘制棋盘线条
-        for i in range(self.board.size):
-            x = self.margin + i * self.cell_size
-            y = self.margin + i * self.cell_size
-            
-            # 垂直线
-            self.canvas.create_line(
-                x, self.margin,
-                x, self.margin + (self.board.size - 1) * self.cell_size,
-                fill="black", width=1
-            )
-            
-            # 水平线
-            self.canvas.create_line(
-                self.margin, y,
-                self.margin + (self.board.size - 1) * self.cell_size, y,
-                fill="black", width=1
-            )
-        
-        # 绘制星位点
-        star_positions = [(3, 3), (3, 11), (11, 3), (11, 11), (7, 7)]
-        for row, col in star_positions:
-            x = self.margin + col * self.cell_size
-            y = self.margin + row * self.cell_size
-            self.canvas.create_oval(x-3, y-3, x+3, y+3, fill="black")
+        """绘制棋盘（背景图只放置一次，之后只同步棋子）"""
+        if self.background_image is None:
+            # 线条、星位和坐标预先渲染为一张按尺寸 / DPI 缓存的图片
+            self.background_image = get_background_image(self.root, self.board.size, self.margin,
+                                                          self.cell_size, screen_scale(self.root))
+            self.canvas.create_image(0, 0, image=self.background_image, anchor=tk.NW, tags=(BACKGROUND_TAG,))
+            self.canvas.tag_lower(BACKGROUND_TAG)
         
         # 绘制棋子
         self.draw_stones()
     
     def draw_stones(self):
-        """绘制棋子"""
-        board_state = self.board.get_board_state()
-        
-        for row in range(self.board.size):
-            for col in range(self.board.size):
-                if board_state[row, col] != 0:
-                    x = self.margin + col * self.cell_size
-                    y = self.margin + row * self.cell_size
-                    
-                    color = "black" if board_state[row, col] == 1 else "white"
-                    outline_color = "black"
-                    
-                    self.canvas.create_oval(
-                        x-8, y-8, x+8, y+8,
-                        fill=color, outline=outline_color, width=1
-                    )
-                    
-                    # 为最后一手棋标记
-                    if self.board.move_history and (row, col) == (self.board.move_history[-1][0], self.board.move_history[-1][1]):
-                        self.canvas.create_oval(
-                            x-4, y-4, x+4, y+4,
-                            outline="red", width=2, fill=""
-                        )
+        """绘制棋子：只把与走棋历史的差异应用到画布上"""
+        self.stone_renderer.sync(self.board)
     
     def on_canvas_click(self, event):
         """处理棋盘点击事件 - 玩家vs电脑模式"""
@@ -428,73 +485,107 @@ class GameWindow:
             self.add_hint(language_manager.get_text('position_occupied'))
             return
         
-        # 检查是否已选择棋谱 / Check if pattern is selected
-        if not self.pattern_manager.current_pattern:
-            self.add_hint(language_manager.get_text('please_select_pattern_first'))
+        # 停止预想和提示（等它们停下后才能安全读取预想结果）；上一手还在计算或等待电脑应手：忽略这次点击
+        self.worker.cancel(group=PONDER_GROUP, wait=True)
+        self.worker.cancel(group=HINT_GROUP, wait=True)
+        if self.worker.busy() or self._scheduled:
+            self.add_hint(language_manager.get_text('computer_thinking'))
             return
         
-        # 检查是否轮到玩家 / Check if it's player's turn
-        if not self.validator.is_player_turn:
-            self.add_hint(language_manager.get_text('computer_turn_wait'))
+        # 自由对弈模式 / Free play mode
+        if self.free_play:
+            self.on_free_play_click(row, col)
             return
         
-        # 验证玩家走法（动态确定玩家颜色）
-        result = self.validator.validate_player_move(row, col)
-        if result['valid']:
-            correct_move = result['correct_move']
-            if correct_move:
-                self.board.make_move(row, col, correct_move[2])
+        # 残局训练：交给会话验证（非棋谱走法可能要调用求解器，在后台线程运行），渲染返回的事件
+        self.worker.submit(self.session.play, row, col, on_done=self.render_events)
+    
+    def render_events(self, events):
+        """渲染训练会话返回的事件，并按事件要求延时调度电脑应手或答案演示"""
+        for event in events:
+            event_type = event['type']
+            if event_type == EVENT_REJECTED:
+                if event['message']:
+                    self.add_hint(event['message'])
+            elif event_type == EVENT_RESTART:
+                self.sound_manager.play_game_start()  # 播放游戏开始音效
+                self.add_hint(event['message'])
+                self.draw_board()
+                self.update_status()
+                self.clear_analysis()
+            elif event_type in (EVENT_MOVE, EVENT_COMPUTER):
                 self.sound_manager.play_stone_place()  # 播放落子音效
-            self.draw_stones()
-            self.add_hint(result['message'])
-            self.update_status()
-            if result['pattern_complete']:
+                self.draw_stones()
+                self.add_hint(event['message'])
+                self.update_status()
+            elif event_type == EVENT_WRONG:
+                self.sound_manager.play_error()  # 播放错误音效
+                self.add_hint(event['message'])
+                if event['show_answer']:
+                    self._schedule(1000, self.auto_make_correct_move)
+            elif event_type == EVENT_ANSWER:
+                self.draw_stones()
+                # 显示正确走法
+                self.add_hint(f"{event['message']} {self._format_move(event['move'])}")
+                self.update_status()
+            elif event_type == EVENT_HINT:
+                self.add_hint(event['message'])
+            elif event_type == EVENT_UNDO:
+                self.draw_board()
+                self.update_status()
+                self.add_hint(event['message'])
+            elif event_type == EVENT_COMPLETE:
                 self.sound_manager.play_pattern_complete()  # 播放完成音效
                 self.show_pattern_analysis()
-            elif result.get('computer_move', False):
-                # 延迟一点时间让玩家看到自己的走法，然后电脑走棋
-                self.root.after(800, self.make_computer_move)
-        else:
-            self.sound_manager.play_error()  # 播放错误音效
-            self.add_hint(result['message'])
-            if result['show_answer']:
-                self.root.after(1000, self.auto_make_correct_move)
+                self.show_ponder_stats()
+        
+        # 还没完成且轮到电脑：延迟一点时间让玩家看到上一手，然后电脑走棋
+        if events and events[-1]['type'] != EVENT_COMPLETE and events[-1].get('computer_move'):
+            delay = 1500 if events[-1]['type'] == EVENT_ANSWER else 800
+            self._schedule(delay, self.make_computer_move)
+        elif not self._scheduled:
+            self.start_pondering()
+    
+    def start_pondering(self):
+        """轮到玩家思考时在后台预想（玩家落子、悔棋、重新开始时取消）"""
+        if self.free_play:
+            if self.free_play_over or not self._is_free_play_player_turn():
+                return
+            self.worker.submit(self.ponderer.ponder_search, BitBoard.from_board(self.board), self.free_play_player,
+                               self._predicted_reply, group=PONDER_GROUP, cancellable=True)
+        elif self.validator.is_player_turn and not self.session.is_complete():
+            self.worker.submit(self.session.ponder, group=PONDER_GROUP, cancellable=True)
+    
+    def show_ponder_stats(self):
+        """显示预想命中率"""
+        stats = self.ponderer.stats()
+        total = stats['hits'] + stats['misses']
+        if total:
+            self.add_hint(language_manager.get_text('ponder_stats').format(stats['hits'], total, stats['hit_rate']))
+    
+    def _schedule(self, delay, func):
+        """延时调用 func，记录下来以便悔棋 / 重新开始时取消"""
+        def run():
+            self._scheduled.discard(after_id)
+            func()
+        after_id = self.root.after(delay, run)
+        self._scheduled.add(after_id)
+    
+    def cancel_pending(self):
+        """取消后台计算和延时调度的电脑应手（之后可以安全修改棋盘）"""
+        for after_id in self._scheduled:
+            self.root.after_cancel(after_id)
+        self._scheduled.clear()
+        # 搜索会在几个节点内响应取消；会话验证最多运行求解器的时间预算
+        self.worker.cancel(wait=True)
     
     def make_computer_move(self):
         """电脑自动下棋"""
-        if not self.validator.is_computer_turn():
-            return
-        
-        result = self.validator.make_computer_move()
-        
-        if result['move']:
-            row, col, player = result['move']
-            self.sound_manager.play_stone_place()  # 播放落子音效
-            self.draw_stones()  # 重新绘制棋盘
-            self.add_hint(result['message'])
-            self.update_status()
-            
-            if result['pattern_complete']:
-                self.show_pattern_analysis()
-        else:
-            self.add_hint(result['message'])
+        self.render_events(self.session.computer_move())
     
     def auto_make_correct_move(self):
         """自动执行正确走法（3次错误后）"""
-        correct_move = self.validator.auto_make_correct_move()
-        if correct_move:
-            self.draw_stones()
-            # 显示正确走法
-            self.add_hint(f"{language_manager.get_text('system_demo_correct')} {self._format_move(correct_move)}")
-            self.update_status()
-            
-            # 检查棋谱是否完成
-            if self.pattern_manager.is_pattern_complete():
-                self.show_pattern_analysis()
-            else:
-                # 如果还没完成，继续下一步，可能需要电脑走棋
-                if self.validator.is_computer_turn():
-                    self.root.after(1500, self.make_computer_move)
+        self.render_events(self.session.reveal_answer())
     
     def show_pattern_selection(self):
         """显示棋谱选择对话框"""
@@ -522,11 +613,14 @@ class GameWindow:
             selection = listbox.curselection()
             if selection:
                 pattern_id = patterns[selection[0]]['id']
-                if self.pattern_manager.load_pattern(pattern_id):
-                    self.restart_pattern()
-                    selection_window.destroy()
-                else:
+                self.cancel_pending()
+                events = self.session.load(pattern_id)
+                if events[0]['type'] == EVENT_REJECTED:
                     messagebox.showerror(language_manager.get_text('error'), language_manager.get_text('load_pattern_failed'))
+                else:
+                    self.free_play = False
+                    self.render_events(events)
+                    selection_window.destroy()
         
         button_frame = ttk.Frame(selection_window)
         button_frame.pack(pady=10)
@@ -536,75 +630,170 @@ class GameWindow:
     
     def restart_pattern(self):
         """重新开始当前棋谱 / Restart current pattern"""
-        if not self.pattern_manager.current_pattern:
-            self.add_hint(language_manager.get_text('please_select_first'))
+        self.cancel_pending()
+        if self.free_play:
+            self.start_free_play()
             return
         
-        self.sound_manager.play_game_start()  # 播放游戏开始音效
-        self.board.reset()
-        self.pattern_manager.reset_pattern()
-        self.validator.reset_game()
-        
-        # 设置残局初始局面
-        self.setup_endgame_initial_position()
-        
-        # 初始化固定的玩家和电脑颜色
-        self.validator.initialize_player_colors()
-        
-        # 显示玩家执子颜色提示
-        self.add_hint(language_manager.get_text('endgame_restarted'))
+        self.render_events(self.session.restart())
+    
+    def undo_move(self):
+        """悔棋 - 撤销到上一次轮到玩家的局面（玩家+电脑）"""
+        self.cancel_pending()
+        if not self.free_play:
+            self.render_events(self.session.undo())
+            return
         
+        if len(self.board.move_history) == 0:
+            self.add_hint(language_manager.get_text('no_moves_undo'))
+            return
+        self.undo_free_play()
+    
+    def start_free_play(self):
+        """开始与电脑自由对弈 / Start free play against the computer"""
+        self.cancel_pending()
+        self.sound_manager.play_game_start()
+        self.free_play = True
+        self.free_play_over = False
+        self.board.reset()
+        self.engine.clear()
+        self.ponderer.reset()
+        self._predicted_reply = None
+        self.add_hint(language_manager.get_text('free_play_started'))
         self.draw_board()
         self.update_status()
         self.clear_analysis()
+        self.start_pondering()
     
-    def undo_move(self):
-        """悔棋 - 撤销最近的一步或两步（玩家+电脑）"""
-        if len(self.board.move_history) == 0:
-            self.add_hint(language_manager.get_text('no_moves_undo'))
+    def on_free_play_click(self, row, col):
+        """自由对弈中玩家落子"""
+        if self.free_play_over:
+            self.add_hint(language_manager.get_text('free_play_game_over'))
+            return
+        if not self._is_free_play_player_turn():
+            self.add_hint(language_manager.get_text('computer_turn_wait'))
             return
         
-        # 如果最后一步是电脑下的，需要撤销两步回到玩家回合
-        moves_to_undo = 1
-        if len(self.board.move_history) > 0:
-            last_move = self.board.move_history[-1]
-            # 动态判断最后一步是否是电脑下的
-            expected_move = self.pattern_manager.get_current_move()
-            is_computer_last = expected_move and last_move[2] != expected_move[2]
-            if is_computer_last:  # 最后一步是电脑下的
-                moves_to_undo = 2
-        
-        # 执行悔棋
-        undone_moves = []
-        for _ in range(min(moves_to_undo, len(self.board.move_history))):
-            undone_move = self.board.undo_move()
-            if undone_move:
-                undone_moves.append(undone_move)
-                # 回退棋谱步骤
-                if self.pattern_manager.current_step > 0:
-                    self.pattern_manager.current_step -= 1
-        
-        if undone_moves:
-            self.validator.reset_errors()
-            # 确保轮到玩家（根据棋谱动态确定）
-            if self.pattern_manager.current_pattern:
-                current_move = self.pattern_manager.get_current_move()
-                if current_move:
-                    # 根据当前应该下的棋子颜色判断轮到谁
-                    self.validator.is_player_turn = (current_move[2] == self.validator.player_color)
-            self.draw_board()
-            self.update_status()
-            if len(undone_moves) == 1:
-                self.add_hint(language_manager.get_text('undid_one_move'))
-            else:
-                self.add_hint(language_manager.get_text('undid_moves_back').format(len(undone_moves)))
+        pondered = self.ponderer.take(self.board, (row, col))
+        self.board.make_move(row, col, self.free_play_player)
+        self.sound_manager.play_stone_place()
+        self.draw_stones()
+        if self._finish_free_play_if_over(row, col, self.free_play_player):
+            return
+        self.update_status()
+        if pondered is not None and pondered['move'] is not None:
+            # 预想命中：电脑的应手已经算好
+            self.apply_free_play_computer_move(pondered, instant=True)
         else:
-            self.add_hint(language_manager.get_text('undo_failed'))
+            self.make_free_play_computer_move()
+    
+    def make_free_play_computer_move(self):
+        """自由对弈中电脑用搜索引擎走棋：在后台线程搜索棋盘副本，界面保持响应"""
+        if not self.free_play or self.free_play_over or self._is_free_play_player_turn():
+            return
+        
+        computer = 3 - self.free_play_player
+        self.worker.submit(self.engine.search, BitBoard.from_board(self.board), computer,
+                           on_done=self.apply_free_play_computer_move, cancellable=True)
+    
+    def apply_free_play_computer_move(self, result, instant=False):
+        """在界面线程落下后台搜索（或预想）得到的走法，然后开始预想玩家的应手"""
+        if result['move'] is None:
+            return
+        computer = 3 - self.free_play_player
+        row, col = result['move']
+        self.board.make_move(row, col, computer)
+        self.sound_manager.play_stone_place()
+        self.draw_stones()
+        if instant:
+            self.add_hint(language_manager.get_text('engine_move_pondered').format(self._format_position(row, col)))
+        else:
+            self.add_hint(language_manager.get_text('engine_move_stats').format(
+                self._format_position(row, col), result['depth'], result['nodes'], result['nps']))
+        if self._finish_free_play_if_over(row, col, computer):
+            return
+        self.update_status()
+        # 主变例中电脑这一手之后的一手就是预测的玩家应手，最先分析
+        self._predicted_reply = result['pv'][1][:2] if len(result['pv']) > 1 else None
+        self.start_pondering()
+    
+    def undo_free_play(self):
+        """自由对弈悔棋：撤销到玩家回合"""
+        undone = 0
+        while self.board.move_history:
+            self.board.undo_move()
+            undone += 1
+            if self._is_free_play_player_turn():
+                break
+        self.free_play_over = False
+        self.draw_board()
+        self.update_status()
+        if undone == 1:
+            self.add_hint(language_manager.get_text('undid_one_move'))
+        else:
+            self.add_hint(language_manager.get_text('undid_moves_back').format(undone))
+        self._predicted_reply = None
+        self.start_pondering()
+    
+    def _is_free_play_player_turn(self):
+        """自由对弈中是否轮到玩家（黑先）"""
+        if not self.board.move_history:
+            return self.free_play_player == 1
+        return self.board.move_history[-1][2] != self.free_play_player
+    
+    def _finish_free_play_if_over(self, row, col, player):
+        """检查自由对弈是否结束，结束时显示结果"""
+        if self.board.check_winner(row, col, player):
+            key = 'free_play_you_win' if player == self.free_play_player else 'free_play_computer_wins'
+        elif self.board.is_full():
+            key = 'free_play_draw'
+        else:
+            return False
+        self.free_play_over = True
+        self.sound_manager.play_pattern_complete()
+        self.add_hint(language_manager.get_text(key))
+        self.show_ponder_stats()
+        self.status_var.set(language_manager.get_text(key))
+        return True
+    
+    def show_hint(self):
+        """给出下一级提示：在后台线程分析，同一局面的分析结果有缓存"""
+        if self.worker.busy(group=HINT_GROUP):
+            return
+        # 先停止预想，提示不必排在预想的搜索后面；提示交付后重新开始预想
+        self.worker.cancel(group=PONDER_GROUP, wait=True)
+        if not self.free_play:
+            # render_events 结束时会重新开始预想
+            self.worker.submit(self.session.hint, on_done=self.render_events, group=HINT_GROUP, cancellable=True)
+            return
+        if self.free_play_over:
+            self.add_hint(language_manager.get_text('free_play_game_over'))
+        elif not self._is_free_play_player_turn():
+            self.add_hint(language_manager.get_text('computer_turn_patient'))
+        else:
+            # 自由对弈没有标准答案：先用引擎搜索最佳走法再分析
+            self.worker.submit(self.hints.analyse, BitBoard.from_board(self.board), self.free_play_player,
+                               on_done=self.show_free_play_hint, group=HINT_GROUP, cancellable=True)
+    
+    def show_free_play_hint(self, info):
+        """显示自由对弈的提示：同一局面每次更具体一级，然后重新开始预想"""
+        if info is None:
+            self.start_pondering()
+            return
+        position = (self.board.hash, len(self.board.move_history))
+        if position != self._free_play_hint_position:
+            self._free_play_hint_position = position
+            self._free_play_hint_level = 0
+        level = min(self._free_play_hint_level + 1, HINT_LEVELS)
+        self._free_play_hint_level = level
+        message = hint_message(info, level, language_manager.get_text, self._format_position, self.board.size)
+        self.add_hint(f"{language_manager.get_text('hint_level', level, HINT_LEVELS)} {message}")
+        self.start_pondering()
     
     def show_answer(self):
         """显示当前步骤的正确答案"""
         if self.validator.is_player_turn:
-            expected_move = self.pattern_manager.get_current_move()
+            expected_move = self.validator.get_expected_move()
             if expected_move:
                 row, col, player = expected_move
                 self.add_hint(f"{language_manager.get_text('hint_should_play')} {self._format_position(row, col)}")
@@ -615,6 +804,16 @@ class GameWindow:
     
     def update_status(self):
         """更新状态信息"""
+        if self.free_play:
+            colon = "：" if language_manager.current_language == 'chinese' else ": "
+            self.pattern_info_var.set(language_manager.get_text('free_play_mode'))
+            self.step_var.set(f"{language_manager.get_text('steps')}{colon}{len(self.board.move_history)}")
+            if self._is_free_play_player_turn():
+                self.status_var.set(language_manager.get_text('free_play_your_turn'))
+            else:
+                self.status_var.set(language_manager.get_text('computer_turn_thinking'))
+            return
+        
         if not self.pattern_manager.current_pattern:
             return
         
@@ -630,7 +829,7 @@ class GameWindow:
         self.step_var.set(step_text)
         
         # 更新当前状态 / Update current status
-        if self.pattern_manager.is_pattern_complete():
+        if self.validator.is_pattern_complete():
             self.status_var.set(language_manager.get_text('pattern_complete'))
         else:
             if self.validator.is_player_turn:
@@ -674,21 +873,6 @@ class GameWindow:
         """清空分析区域"""
         self.analysis_text.delete(1.0, tk.END)
     
-    def setup_endgame_initial_position(self):
-        """设置残局初始局面"""
-        if not self.pattern_manager.current_pattern:
-            return
-        
-        # 获取初始局面设置
-        initial_setup = self.pattern_manager.current_pattern.get('initial_setup', [])
-        
-        # 在棋盘上放置初始棋子
-        for row, col, player in initial_setup:
-            self.board.make_move(row, col, player)
-        
-        # 重新绘制棋盘
-        self.draw_stones()
-    
     def _format_move(self, move):
         """格式化走法"""
         row, col, player = move
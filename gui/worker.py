@@ -0,0 +1,191 @@
+"""
+Background Worker
+后台计算线程
+Run engine / solver jobs on a daemon thread so the Tk mainloop never blocks; results
+come back through a queue that the UI thread drains with root.after, and callbacks
+always run on the UI thread
+在守护线程上运行搜索引擎 / 求解器任务，Tk 主循环不会被阻塞；结果通过队列返回，
+由界面线程用 root.after 轮询取出，回调总是在界面线程上执行
+
+Cancelled jobs never deliver their result. A cancellable job receives
+should_stop=job.is_cancelled (see SearchEngine.search) and returns early
+被取消的任务不会交付结果；可取消的任务会收到 should_stop=job.is_cancelled
+（见 SearchEngine.search），取消后提前返回
+"""
+
+import queue
+import threading
+import time
+
+
+class Job:
+    """Background Job / 后台任务"""
+
+    def __init__(self, job_id, func, args, on_done, on_error, group, cancellable):
+        self.id = job_id
+        self.func = func
+        self.args = args
+        self.cancellable = cancellable
+        self.on_done = on_done
+        self.on_error = on_error
+        self.group = group
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+
+    def cancel(self):
+        """取消任务（可从任意线程调用）"""
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        """是否已取消：传给长时间运行的函数作为停止检查"""
+        return self._cancelled.is_set()
+
+    def is_finished(self):
+        """后台线程是否已经执行完（或跳过）这个任务"""
+        return self._finished.is_set()
+
+
+class BackgroundWorker:
+    """Background Worker / 后台计算线程
+
+    任务按提交顺序在一个守护线程上依次执行；界面线程每 poll_interval 毫秒
+    取一次结果队列，只在还有未完成的任务时轮询，空闲时不占用主循环。
+    """
+
+    POLL_INTERVAL = 16   # 毫秒，约一帧
+
+    def __init__(self, root, poll_interval=POLL_INTERVAL):
+        """
+        初始化后台线程
+
+        Args:
+            root: Tk 根窗口（只用到 after / after_cancel）
+            poll_interval (int): 轮询结果队列的间隔（毫秒）
+        """
+        self.root = root
+        self.poll_interval = poll_interval
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._pending = []          # 已提交、结果还没被界面线程取走的任务
+        self._next_id = 0
+        self._poll_id = None
+        self._thread = None
+        # 统计：交付 / 丢弃（已取消）的结果数
+        self.delivered = 0
+        self.dropped = 0
+
+    def submit(self, func, *args, on_done=None, on_error=None, group=None, cancellable=False):
+        """
+        提交后台任务
+
+        Args:
+            func (callable): 在后台线程执行的函数，返回值交给 on_done
+            *args: 函数参数（不要传界面线程还会修改的对象，先复制棋盘）
+            on_done (callable): 在界面线程调用 on_done(result)
+            on_error (callable): 在界面线程调用 on_error(exception)，None 时异常被忽略
+            group (str): 任务分组，cancel(group) 只取消同组任务
+            cancellable (bool): 以 func(*args, should_stop=job.is_cancelled) 调用，
+                                让函数在取消后尽快返回
+
+        Returns:
+            Job: 任务
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='background-worker', daemon=True)
+            self._thread.start()
+        self._next_id += 1
+        job = Job(self._next_id, func, args, on_done, on_error, group, cancellable)
+        self._pending.append(job)
+        self._jobs.put(job)
+        self._schedule_poll()
+        return job
+
+    def cancel(self, group=None, wait=False, timeout=1.0):
+        """
+        取消任务：排队中的任务不再执行，正在执行的任务结果被丢弃
+
+        Args:
+            group (str): 只取消这一组，None 取消全部
+            wait (bool): 等正在执行的任务结束后再返回（之后可以安全修改它用到的对象）
+            timeout (float): 最多等待的总秒数（不论有多少个任务）
+
+        Returns:
+            int: 取消的任务数
+        """
+        cancelled = 0
+        for job in self._pending:
+            if (group is None or job.group == group) and not job.is_cancelled():
+                job.cancel()
+                cancelled += 1
+        if wait:
+            deadline = time.monotonic() + timeout
+            for job in self._pending:
+                if job.is_cancelled():
+                    job._finished.wait(max(0.0, deadline - time.monotonic()))
+        return cancelled
+
+    def busy(self, group=None):
+        """是否还有未交付的任务"""
+        return any(not job.is_cancelled() and (group is None or job.group == group) for job in self._pending)
+
+    def poll(self):
+        """
+        在界面线程取出已完成的结果并调用回调（由 after 定时调用，也可以直接调用）
+
+        Returns:
+            int: 交付的结果数
+        """
+        self._poll_id = None
+        delivered = 0
+        while True:
+            try:
+                job, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.remove(job)
+            if job.is_cancelled():
+                self.dropped += 1
+                continue
+            delivered += 1
+            self.delivered += 1
+            if error is not None:
+                if job.on_error is not None:
+                    job.on_error(error)
+            elif job.on_done is not None:
+                job.on_done(result)
+        self._schedule_poll()
+        return delivered
+
+    def shutdown(self):
+        """取消所有任务并结束后台线程"""
+        self.cancel()
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        if self._thread is not None:
+            self._jobs.put(None)
+            self._thread.join(1.0)
+            self._thread = None
+
+    def _schedule_poll(self):
+        """还有未交付的任务时安排下一次轮询"""
+        if self._pending and self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_interval, self.poll)
+
+    def _run(self):
+        """后台线程主循环"""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            result = error = None
+            if not job.is_cancelled():
+                try:
+                    if job.cancellable:
+                        result = job.func(*job.args, should_stop=job.is_cancelled)
+                    else:
+                        result = job.func(*job.args)
+                except Exception as exc:
+                    error = exc
+            job._finished.set()
+            self._results.put((job, result, error))
@@ -21,19 +21,32 @@ import os
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
-try:
-    from gui.game_window import GameWindow
-except ImportError as e:
-    print(f"Import Error / 导入错误：{e}")
-    print("Please ensure all required modules are properly installed.")
-    print("请确保所有必需的模块都已正确安装。")
-    print("Run 'pip install -r requirements.txt' to install dependencies.")
-    print("运行 'pip install -r requirements.txt' 安装依赖。")
-    sys.exit(1)
+
+def load_game_window():
+    """Import the GUI lazily so command line tools work without a display / 延迟导入图形界面，命令行工具无需显示器"""
+    try:
+        from gui.game_window import GameWindow
+    except ImportError as e:
+        print(f"Import Error / 导入错误：{e}")
+        print("Please ensure all required modules are properly installed.")
+        print("请确保所有必需的模块都已正确安装。")
+        print("Run 'pip install -r requirements.txt' to install dependencies.")
+        print("运行 'pip install -r requirements.txt' 安装依赖。")
+        sys.exit(1)
+    return GameWindow
 
 
 def main():
     """Main game function / 游戏主函数"""
+    # 命令行子命令（gobang solve / gobang import）不启动图形界面
+    if len(sys.argv) > 1 and sys.argv[1] in ('solve', 'import', 'dedup', 'validate', 'generate', 'grade', 'replay', 'serve'):
+        # 标准输出留给结果：隐藏 pygame 横幅，无声卡的服务器上使用空音频驱动
+        os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        from game.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+
+    GameWindow = load_game_window()
     print("Starting Gobang Pattern Battle System...")
     print("正在启动五子棋棋谱对战系统...")
     print("Author / 作者：Xu Huicong")
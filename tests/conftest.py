@@ -0,0 +1,31 @@
+"""
+测试共用的局面工具
+"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import BitBoard
+
+# 黑子走 (7, 8) 形成双活三，只能靠 VCT 取胜（黑白交替，轮到黑子）
+DOUBLE_THREE = ((7, 6, 1), (0, 0, 2), (7, 7, 1), (0, 14, 2), (5, 8, 1), (14, 0, 2), (6, 8, 1), (14, 14, 2))
+
+
+def board_with(moves, board_class=BitBoard):
+    """
+    按 (row, col, player) 列表摆出局面
+
+    Args:
+        moves (iterable): 走法列表
+        board_class (type): 棋盘类
+
+    Returns:
+        Board: 摆好的棋盘
+    """
+    board = board_class()
+    for row, col, player in moves:
+        board.make_move(row, col, player)
+    return board
@@ -0,0 +1,74 @@
+"""
+批量棋盘测试
+"""
+
+import random
+import sys
+import os
+
+import numpy as np
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import Board, BitBoard, BoardBatch
+
+
+class TestBoardBatch:
+    """批量棋盘测试"""
+
+    def test_make_and_undo_moves(self):
+        """测试批量落子、非法落子和悔棋"""
+        batch = BoardBatch(3)
+        ok = batch.make_moves([7, 7, 20], [7, 8, 0], 1)
+        assert ok.tolist() == [True, True, False]
+        assert batch.boards[0, 7, 7] == 1
+        ok = batch.make_moves([7, 7], [7, 9], 2, active=[0, 1])
+        assert ok.tolist() == [False, True]
+        assert batch.move_counts.tolist() == [1, 2, 0]
+        undone = batch.undo_moves()
+        assert undone.tolist() == [[7, 7, 1], [7, 9, 2], [-1, -1, -1]]
+        assert batch.boards[0].sum() == 0
+        assert batch.boards[1, 7, 8] == 1 and batch.boards[1, 7, 9] == 0
+        assert batch.move_counts.tolist() == [0, 1, 0]
+
+    def test_winners_all_directions(self):
+        """测试四个方向的批量胜负判断"""
+        lines = [
+            [(3, c) for c in range(2, 7)],
+            [(r, 9) for r in range(5, 10)],
+            [(k, k) for k in range(10, 15)],
+            [(k, 14 - k) for k in range(0, 5)],
+        ]
+        boards = []
+        for player, cells in zip((1, 2, 1, 2), lines):
+            board = Board()
+            for row, col in cells:
+                board.make_move(row, col, player)
+            boards.append(board)
+        boards.append(Board())
+        batch = BoardBatch.from_boards(boards)
+        assert batch.winners().tolist() == [1, 2, 1, 2, 0]
+
+    def test_matches_single_boards(self):
+        """测试随机局面与逐个 Board 判断一致，并可往返转换"""
+        rng = random.Random(5)
+        boards = []
+        for _ in range(50):
+            board = BitBoard()
+            cells = [(r, c) for r in range(15) for c in range(15)]
+            rng.shuffle(cells)
+            winner = 0
+            for i, (row, col) in enumerate(cells[:rng.randint(10, 120)]):
+                player = 1 + i % 2
+                board.make_move(row, col, player)
+                if board.check_winner(row, col, player):
+                    winner = player
+                    break
+            boards.append((board, winner))
+        batch = BoardBatch.from_boards([board for board, _ in boards])
+        assert batch.winners().tolist() == [winner for _, winner in boards]
+        restored = batch.to_board(7, BitBoard)
+        assert restored.move_history == boards[7][0].move_history
+        assert restored.hash == boards[7][0].hash
+        assert np.array_equal(restored.get_board_state(), batch.boards[7])
@@ -0,0 +1,277 @@
+"""
+棋盘后端测试
+"""
+
+import random
+import sys
+import os
+
+import pytest
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import Board, BitBoard, lines, shapes
+
+
+class TestBitBoard:
+    """位棋盘测试"""
+
+    def test_drop_in_api(self):
+        """测试与 Board 相同的基本接口"""
+        board = BitBoard()
+        assert board.size == 15
+        assert board.board.shape == (15, 15)
+        assert board.make_move(7, 7, 1) == True
+        assert board.make_move(7, 7, 2) == False
+        assert board.is_valid_move(7, 7) == False
+        assert board.is_valid_move(15, 0) == False
+        assert board.board[7, 7] == 1
+        assert board.undo_move() == (7, 7, 1)
+        assert board.board[7, 7] == 0
+        assert len(board.get_empty_positions()) == 225
+        # 数组视图只读：写入报错而不是被悄悄丢弃
+        with pytest.raises(ValueError):
+            board.board[7, 7] = 1
+
+    def test_win_directions(self):
+        """测试四个方向的五连判断"""
+        for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            board = BitBoard()
+            start_col = 4 if dc < 0 else 0
+            cells = [(k * dr, start_col + k * dc) for k in range(5)]
+            for row, col in cells[:4]:
+                board.make_move(row, col, 2)
+                assert board.check_winner(row, col, 2) == False
+            row, col = cells[4]
+            board.make_move(row, col, 2)
+            assert board.check_winner(row, col, 2) == True
+            assert board.check_winner(row, col, 1) == False
+
+    def test_matches_numpy_board(self):
+        """测试随机对局中与 NumPy 棋盘结果一致"""
+        rng = random.Random(7)
+        reference = Board()
+        board = BitBoard()
+        cells = [(r, c) for r in range(15) for c in range(15)]
+        rng.shuffle(cells)
+        for i, (row, col) in enumerate(cells[:120]):
+            player = 1 + i % 2
+            assert board.make_move(row, col, player) == reference.make_move(row, col, player)
+            assert board.check_winner(row, col, player) == reference.check_winner(row, col, player)
+        assert (board.get_board_state() == reference.get_board_state()).all()
+        assert sorted(board.get_empty_positions()) == sorted(reference.get_empty_positions())
+
+    def test_from_board(self):
+        """测试从 NumPy 棋盘转换"""
+        reference = Board()
+        reference.make_move(3, 4, 1)
+        reference.make_move(5, 6, 2)
+        board = BitBoard.from_board(reference)
+        assert board.move_history == reference.move_history
+        assert (board.board == reference.board).all()
+
+
+class TestZobristHash:
+    """Zobrist 哈希测试"""
+
+    def test_incremental_hash(self):
+        """测试落子/悔棋时哈希增量更新并可还原"""
+        for board_class in (Board, BitBoard):
+            board = board_class()
+            assert board.hash == 0
+            board.make_move(7, 7, 1)
+            board.make_move(7, 8, 2)
+            assert board.hash == board.compute_hash()
+            after_two = board.hash
+            board.make_move(8, 8, 1)
+            assert board.hash != after_two
+            board.undo_move()
+            assert board.hash == after_two
+            board.undo_move()
+            board.undo_move()
+            assert board.hash == 0
+
+    def test_hash_order_independent_and_reproducible(self):
+        """测试相同局面不同落子顺序得到相同哈希，且跨棋盘实例一致"""
+        first = Board()
+        second = BitBoard()
+        for row, col, player in [(7, 7, 1), (7, 8, 2), (8, 8, 1)]:
+            first.make_move(row, col, player)
+        for row, col, player in [(8, 8, 1), (7, 8, 2), (7, 7, 1)]:
+            second.make_move(row, col, player)
+        assert first.hash == second.hash
+        assert 0 < first.hash < 2 ** 64
+
+    def test_symmetry_hashes(self):
+        """测试 8 个对称哈希与变换后局面的哈希一致，并随悔棋还原"""
+        rng = random.Random(3)
+        moves = []
+        board = BitBoard()
+        while len(moves) < 12:
+            row, col = rng.randrange(15), rng.randrange(15)
+            if board.make_move(row, col, len(moves) % 2 + 1):
+                moves.append((row, col, len(moves) % 2 + 1))
+        hashes = board.symmetry_hashes()
+        assert hashes[0] == board.hash
+        for symmetry in range(lines.SYMMETRY_COUNT):
+            mirrored = Board()
+            for row, col, player in moves:
+                mirrored.make_move(*lines.transform_point(row, col, 15, symmetry), player)
+            assert mirrored.hash == hashes[symmetry]
+            assert mirrored.canonical_hash() == board.canonical_hash()
+        while board.undo_move():
+            pass
+        assert board.symmetry_hashes() == (0,) * lines.SYMMETRY_COUNT
+
+    def test_canonical_symmetry(self):
+        """测试规范变换把局面变成哈希最小的形式"""
+        board = Board()
+        board.make_move(2, 3, 1)
+        board.make_move(4, 9, 2)
+        canonical, symmetry = board.canonical_symmetry()
+        assert canonical == board.canonical_hash() == min(board.symmetry_hashes())
+        assert board.symmetry_hashes()[symmetry] == canonical
+
+
+class TestLineTables:
+    """线路表测试"""
+
+    def test_line_count(self):
+        """测试 15x15 棋盘共 72 条线路"""
+        board = Board()
+        assert len(board.geometry.lines) == 72
+        assert len(board.line_bits[1]) == 72
+
+    def test_line_window(self):
+        """测试窗口编码与逐格扫描结果一致"""
+        board = BitBoard()
+        for row, col, player in [(7, 5, 1), (7, 6, 1), (7, 8, 2), (6, 6, 1), (5, 5, 2)]:
+            board.make_move(row, col, player)
+        # 水平方向，以 (7, 7) 为中心：列 3..11
+        window = board.line_window(7, 7, 0, 1)
+        own = window & 0x1FF
+        blocked = window >> 9
+        assert own == (1 << 2) | (1 << 3)   # 列 5、6
+        assert blocked == (1 << 5)          # 列 8 的白子
+        # 靠近边界的窗口会把棋盘外标记为阻挡
+        corner = board.line_window(0, 0, 0, 1)
+        assert corner >> 9 == 0b1111
+
+    def test_incremental_matches_rescan(self):
+        """测试随机落子/悔棋后线路表与重新扫描一致"""
+        rng = random.Random(3)
+        board = Board()
+        cells = [(r, c) for r in range(15) for c in range(15)]
+        rng.shuffle(cells)
+        for i, (row, col) in enumerate(cells[:60]):
+            board.make_move(row, col, 1 + i % 2)
+        for _ in range(20):
+            board.undo_move()
+        state = board.get_board_state()
+        for line_id, line_cells in enumerate(board.geometry.lines):
+            for player in (1, 2):
+                expected = 0
+                for k, index in enumerate(line_cells):
+                    if state[divmod(index, 15)] == player:
+                        expected |= 1 << k
+                assert board.line_bits[player][line_id] == expected
+
+
+class TestShapeTable:
+    """棋型查找表测试"""
+
+    def test_board_shapes(self):
+        """测试棋盘查表得到的棋型"""
+        board = BitBoard()
+        for col in (5, 6, 7):
+            board.make_move(7, col, 1)
+        # (7, 8) 落子后水平方向成活四；(7, 4) 同理
+        assert board.get_shapes(7, 8, 1)[0] == shapes.SHAPE_OPEN_FOUR
+        assert board.get_shapes(7, 6, 1)[0] == shapes.SHAPE_OPEN_THREE
+        board.make_move(7, 8, 2)
+        assert board.get_shapes(7, 6, 1)[0] == shapes.SHAPE_THREE
+        assert board.get_shapes(7, 4, 1)[0] == shapes.SHAPE_FOUR
+        # 靠边的三连被边界挡住
+        edge = BitBoard()
+        for col in (0, 1, 2):
+            edge.make_move(0, col, 2)
+        assert edge.get_shapes(0, 1, 2)[0] == shapes.SHAPE_THREE
+
+    def test_split_three_and_points(self):
+        """测试跳三识别以及成四点"""
+        board = Board()
+        for col in (5, 7, 8):
+            board.make_move(7, col, 1)
+        assert board.get_shapes(7, 7, 1)[0] == shapes.SHAPE_SPLIT_THREE
+        entry = shapes.get_shape_table()[board.line_window(7, 7, 0, 1)]
+        # 窗口第 4 位为 (7, 7)，空位 (7, 6) 对应第 3 位
+        assert shapes.entry_four_points(entry) & (1 << 3)
+
+    def test_table_cache_is_versioned(self):
+        """测试缓存文件名包含版本号并可内存映射"""
+        table = shapes.load_shape_table()
+        assert f"v{shapes.SHAPE_TABLE_VERSION}" in shapes.get_table_path().name
+        assert table.shape == (shapes.TABLE_ENTRIES,)
+
+
+class TestFrontier:
+    """候选点测试"""
+
+    def _expected_frontier(self, board):
+        """逐格扫描得到的候选点"""
+        state = board.get_board_state()
+        radius = board.FRONTIER_RADIUS
+        expected = set()
+        for row in range(15):
+            for col in range(15):
+                if state[row, col]:
+                    continue
+                for r in range(max(0, row - radius), min(15, row + radius + 1)):
+                    for c in range(max(0, col - radius), min(15, col + radius + 1)):
+                        if state[r, c]:
+                            expected.add(row * 15 + col)
+        return expected
+
+    def test_empty_board_centre(self):
+        """测试空棋盘候选点为天元"""
+        assert list(BitBoard().candidate_moves()) == [(7, 7)]
+
+    def test_frontier_matches_rescan(self):
+        """测试随机落子/悔棋后候选集与扫描结果一致"""
+        rng = random.Random(11)
+        board = BitBoard()
+        cells = [(r, c) for r in range(15) for c in range(15)]
+        rng.shuffle(cells)
+        for i, (row, col) in enumerate(cells[:40]):
+            board.make_move(row, col, 1 + i % 2)
+            assert board.frontier == self._expected_frontier(board)
+        for _ in range(39):
+            board.undo_move()
+            assert board.frontier == self._expected_frontier(board)
+        board.undo_move()
+        assert board.frontier == set()
+        assert sorted(BitBoard.from_board(board).candidate_moves()) == [(7, 7)]
+
+    def test_built_on_demand(self):
+        """测试线路表和候选点在第一次读取时建立，之后与增量维护的结果一致"""
+        rng = random.Random(5)
+        cells = [(r, c) for r in range(15) for c in range(15)]
+        rng.shuffle(cells)
+        for board_class in (Board, BitBoard):
+            lazy = board_class()
+            eager = board_class()
+            eager.frontier, eager.line_bits
+            for i, (row, col) in enumerate(cells[:30]):
+                lazy.make_move(row, col, 1 + i % 2)
+                eager.make_move(row, col, 1 + i % 2)
+            # 只落子判胜时不维护线路表和候选点
+            assert not lazy._track_lines and not lazy._track_frontier
+            assert lazy.frontier == eager.frontier == self._expected_frontier(lazy)
+            assert lazy.line_bits == eager.line_bits
+            for _ in range(10):
+                lazy.undo_move()
+                eager.undo_move()
+            assert lazy.frontier == eager.frontier and lazy.line_bits == eager.line_bits
+            lazy.reset()
+            assert 'frontier' not in lazy.__dict__ and lazy.frontier == set()
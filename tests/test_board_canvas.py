@@ -0,0 +1,169 @@
+"""
+棋盘画布增量渲染测试（使用记录调用的假画布，不需要显示器）
+"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import BitBoard, Board
+import gui.board_canvas as board_canvas
+from gui.board_canvas import MARKER_TAG, STONE_TAG, StoneRenderer, background_shapes, get_background_image
+
+
+class FakeCanvas:
+    """只记录画布对象的假画布"""
+
+    def __init__(self):
+        self.items = {}
+        self.next_id = 0
+        self.calls = 0
+
+    def create_oval(self, *coords, **options):
+        self.calls += 1
+        self.next_id += 1
+        self.items[self.next_id] = {'coords': coords, **options}
+        return self.next_id
+
+    def delete(self, target):
+        self.calls += 1
+        if target in self.items:
+            del self.items[target]
+        else:
+            for item in [item for item, options in self.items.items() if target in options.get('tags', ())]:
+                del self.items[item]
+
+    def coords(self, item, *coords):
+        self.calls += 1
+        self.items[item]['coords'] = coords
+
+    def itemconfigure(self, item, **options):
+        self.calls += 1
+        self.items[item].update(options)
+
+    def tag_raise(self, item):
+        self.calls += 1
+
+    def stones(self):
+        return {options['coords'] for options in self.items.values() if STONE_TAG in options['tags']}
+
+    def marker(self):
+        markers = [options for options in self.items.values() if MARKER_TAG in options['tags']]
+        assert len(markers) <= 1
+        return markers[0] if markers else None
+
+
+def expected(board, renderer):
+    r = renderer.stone_radius
+    result = set()
+    for row, col, _ in board.move_history:
+        x, y = renderer._center(row, col)
+        result.add((x - r, y - r, x + r, y + r))
+    return result
+
+
+class TestStoneRenderer:
+    """棋子渲染器"""
+
+    def test_incremental_moves(self):
+        """测试每手只创建一个棋子对象，标记只有一个且跟随最后一手"""
+        canvas = FakeCanvas()
+        renderer = StoneRenderer(canvas, 30, 34)
+        board = BitBoard()
+        for i in range(40):
+            board.make_move(i // 15, i % 15, 1 + i % 2)
+            before = canvas.calls
+            renderer.sync(board)
+            # 画一颗棋子 + 移动并置顶标记：与棋盘上已有的棋子数无关
+            assert canvas.calls - before <= 4
+        assert renderer.created == 40 and renderer.deleted == 0
+        assert canvas.stones() == expected(board, renderer)
+        x, y = renderer._center(2, 9)
+        assert canvas.marker()['coords'] == (x - 4, y - 4, x + 4, y + 4)
+
+    def test_undo_and_restart(self):
+        """测试悔棋只删除撤销的棋子，同一局面重新开始只删除多出的棋子"""
+        canvas = FakeCanvas()
+        renderer = StoneRenderer(canvas, 30, 34)
+        board = Board()
+        setup = [(7, 7, 1), (7, 8, 2), (8, 8, 1)]
+        for move in setup + [(6, 6, 2), (9, 9, 1)]:
+            board.make_move(*move)
+        renderer.sync(board)
+        board.undo_move()
+        renderer.sync(board)
+        assert renderer.deleted == 1
+        assert canvas.stones() == expected(board, renderer)
+
+        board.reset()
+        for move in setup:
+            board.make_move(*move)
+        renderer.sync(board)
+        assert renderer.created == 5 and renderer.deleted == 2
+        assert canvas.stones() == expected(board, renderer)
+
+        board.reset()
+        renderer.sync(board)
+        assert canvas.stones() == set()
+        assert canvas.marker()['state'] == 'hidden'
+
+    def test_different_position_redraws(self):
+        """测试最后一手相同但之前的棋子不同时整盘重画"""
+        canvas = FakeCanvas()
+        renderer = StoneRenderer(canvas, 30, 34)
+        board = BitBoard()
+        for move in [(0, 0, 1), (1, 1, 2), (7, 7, 1)]:
+            board.make_move(*move)
+        renderer.sync(board)
+        board.reset()
+        for move in [(3, 3, 1), (4, 4, 2), (7, 7, 1)]:
+            board.make_move(*move)
+        renderer.sync(board)
+        assert canvas.stones() == expected(board, renderer)
+
+
+class FakePhotoImage:
+    """按像素记录 put 的假 PhotoImage"""
+
+    def __init__(self, master=None, width=0, height=0):
+        self.width = width
+        self.height = height
+        self.pixels = {}
+        self.puts = 0
+
+    def put(self, color, to):
+        self.puts += 1
+        x0, y0, x1, y1 = to
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                self.pixels[x, y] = color
+
+
+class TestBackground:
+    """棋盘背景图"""
+
+    def test_shapes(self):
+        """测试背景图形：底色、每路两条线、五个星位，尺寸覆盖整个棋盘"""
+        width, height, shapes = background_shapes(15, 30, 34)
+        assert width == height == 30 * 2 + 34 * 14
+        assert shapes[0] == ('rect', board_canvas.WOOD_COLOR, (0, 0, width, height))
+        lines = [shape for shape in shapes if shape[1] == board_canvas.LINE_COLOR and shape[0] == 'rect']
+        assert len(lines) == 30
+        assert len([shape for shape in shapes if shape[0] == 'oval']) == 5
+        # 高 DPI 时线条更粗
+        _, _, thick = background_shapes(15, 30, 34, scale=2.0)
+        assert thick[1][2][2] - thick[1][2][0] == 2
+
+    def test_tk_rendering_and_cache(self, monkeypatch):
+        """测试没有 Pillow 时用 PhotoImage.put 绘制，且同一尺寸只渲染一次"""
+        monkeypatch.setattr(board_canvas, 'Image', None)
+        monkeypatch.setattr(board_canvas.tk, 'PhotoImage', FakePhotoImage)
+        monkeypatch.setattr(board_canvas, '_BACKGROUND_CACHE', {})
+        image = get_background_image(None, 15, 30, 34)
+        assert get_background_image(None, 15, 30, 34) is image
+        assert get_background_image(None, 15, 30, 34, scale=2.0) is not image
+        assert image.pixels[30 + 34 * 7, 30 + 34 * 7] == board_canvas.LINE_COLOR   # 天元
+        assert image.pixels[30 + 17, 30 + 17] == board_canvas.WOOD_COLOR           # 格子中间
+        assert image.pixels[0, 0] == board_canvas.WOOD_COLOR
@@ -0,0 +1,63 @@
+"""
+棋谱目录测试
+"""
+
+import sys
+import os
+
+import pytest
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.catalog import PatternCatalog, PatternRecord
+from game.pattern import PatternManager, get_built_in_catalog
+
+
+class TestPatternCatalog:
+    """棋谱目录测试"""
+
+    def test_built_in_catalog_is_compiled_once(self):
+        """测试内置目录只编译一次，所有管理器共享"""
+        catalog = get_built_in_catalog()
+        assert get_built_in_catalog() is catalog
+        assert PatternManager().catalog is catalog
+        assert len(catalog) == 40
+        assert catalog.ids_by_win_moves(2) == tuple(f"two_move_{i}" for i in range(31, 36))
+        assert catalog.ids_by_difficulty('advanced') == catalog.ids_by_win_moves(3)
+        assert catalog.ids_by_difficulty('unknown') == ()
+
+    def test_load_is_lookup(self):
+        """测试加载棋谱是查表：同一语言下返回同一个只读对象"""
+        pm = PatternManager()
+        assert pm.load_pattern("two_move_31")
+        first = pm.current_pattern
+        assert pm.load_pattern("two_move_31")
+        assert pm.current_pattern is first
+        assert first["initial_setup"][0] == (5, 5, 1)
+        assert pm.get_current_move() == (5, 7, 2)
+        with pytest.raises(TypeError):
+            first["name"] = "changed"
+        assert not pm.load_pattern("missing")
+        assert pm.current_pattern is first
+
+    def test_language_switch(self):
+        """测试切换语言：列表按语言缓存，当前棋谱换成新语言视图"""
+        pm = PatternManager()
+        english = pm.get_patterns_list()
+        assert len(english) == 13
+        pm.load_pattern("one_move_1")
+        pm.current_step = 1
+        pm.set_language('chinese')
+        assert pm.get_patterns_list()[0]["name"] == "一手胜 1"
+        assert pm.current_pattern["difficulty"] == "初级"
+        assert pm.current_pattern["analysis"]["win_reason"] == "一手制胜：白子F8完成制胜连接"
+        assert pm.current_step == 1
+        pm.set_language('english')
+        assert pm.get_patterns_list() is english
+
+    def test_duplicate_ids_rejected(self):
+        """测试重复 ID 会被拒绝"""
+        record = PatternRecord("a", 'beginner', 1, 1, (), ())
+        with pytest.raises(ValueError):
+            PatternCatalog([record, record], lambda rec, language: {})
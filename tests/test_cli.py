@@ -0,0 +1,59 @@
+"""
+命令行工具测试
+"""
+
+import io
+import json
+import sys
+import os
+
+import pytest
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.cli import parse_position, side_to_move, solve_stream
+from tests.conftest import DOUBLE_THREE
+
+
+class TestSolveCommand:
+    """gobang solve 批量求解测试"""
+
+    def test_parse_position(self):
+        """测试 JSON 和纯文本两种输入格式"""
+        position = parse_position('{"id": "a", "moves": [[7, 7, 1], [7, 8, 2]], "attacker": 1}')
+        assert position == {'id': 'a', 'moves': [(7, 7, 1), (7, 8, 2)], 'attacker': 1}
+        position = parse_position('{"initial_setup": [[7, 7, 1]]}')
+        assert position['moves'] == [(7, 7, 1)]
+        position = parse_position('7,7 7,8 8,8')
+        assert position['moves'] == [(7, 7, 1), (7, 8, 2), (8, 8, 1)]
+        assert side_to_move(position['moves']) == 2
+        assert side_to_move([]) == 1
+        for line in ('{"moves": [[7, 7, 1], [7, 8, 3]]}', '{"moves": [[7, 7, 1]], "attacker": 0}',
+                     '{"moves": [[7, 7, 1]], "attacker": [1]}'):
+            with pytest.raises(ValueError):
+                parse_position(line)
+
+    def test_stream_keeps_input_order(self):
+        """测试结果按输入顺序输出，错误行不会中断整个批次"""
+        lines = ['# comment', json.dumps({'id': 'win', 'moves': DOUBLE_THREE, 'attacker': 1}),
+                 '', '7,7 7,8 8,8 6,6', '{"id": "bad", "moves": [[7, 7]]}', '7,7 7,7',
+                 '{"id": "colour", "moves": [[7, 7, 1], [7, 8, 3]]}']
+        lines += ['7,7 7,8 %d,%d' % (i // 15, i % 15) for i in range(20)]
+        output = io.StringIO()
+        stats = solve_stream(io.StringIO('\n'.join(lines)), output, solver='vct',
+                             workers=2, chunk_size=3)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+
+        assert stats['positions'] == len(results) == 25
+        assert stats['errors'] == 3
+        assert stats['positions_per_second'] > 0
+        assert [result['line_number'] for result in results] == sorted(
+            result['line_number'] for result in results)
+        assert results[0]['id'] == 'win'
+        assert results[0]['result'] == 'proven'
+        assert results[0]['move'] == [7, 8]
+        assert results[0]['line'][-1][2] == 1
+        assert results[1]['result'] == 'disproven'
+        assert 'error' in results[2] and 'error' in results[3]
+        assert results[4]['line_number'] == 7 and 'player' in results[4]['error']
@@ -0,0 +1,106 @@
+"""
+棋谱集合文件测试
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+
+import pytest
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.catalog import PatternRecord
+from game.collection import CollectionError, PatternCollection, write_collection
+from game.pattern import PatternManager, compile_built_in_records
+
+
+def _synthetic_records(count):
+    """生成 count 道简单题目（ID 倒序写入，检验排序索引）"""
+    records = []
+    for i in reversed(range(count)):
+        row, col = divmod(i % 180, 14)
+        records.append(PatternRecord(f"gen_{i:06d}", 'advanced', 2, i,
+                                     ((row, col, 1), (row, col + 1, 2)), ((row + 1, col, 1),)))
+    return records
+
+
+class TestPatternCollection:
+    """棋谱集合文件测试"""
+
+    def test_round_trip(self, tmp_path):
+        """测试内置棋谱写入后原样读回，非交替颜色的局面也能保存"""
+        records = compile_built_in_records()
+        records.append(PatternRecord("mixed", 'unknown', 0, 7,
+                                     ((0, 0, 1), (0, 1, 1), (14, 14, 2), (3, 4, 1), (5, 6, 2),
+                                      (6, 6, 2), (7, 7, 1), (8, 8, 1), (9, 9, 2)), ()))
+        path = str(tmp_path / "all.gpc")
+        assert write_collection(path, records) == len(records)
+        with PatternCollection(path) as collection:
+            assert len(collection) == len(records)
+            assert list(collection.records()) == records
+            assert list(collection.ids()) == [record.id for record in records]
+            assert collection.record("three_move_93") == records[37]
+            assert collection.record("missing") is None
+            assert "mixed" in collection
+
+    def test_open_is_lazy(self, tmp_path):
+        """测试打开集合只读文件头：打开时间与题目数量无关，按 ID 二分查找"""
+        small = str(tmp_path / "small.gpc")
+        large = str(tmp_path / "large.gpc")
+        write_collection(small, _synthetic_records(10))
+        write_collection(large, _synthetic_records(20000))
+        start = time.perf_counter()
+        collection = PatternCollection(large)
+        assert time.perf_counter() - start < 0.05
+        assert len(collection) == 20000
+        record = collection.record("gen_012345")
+        assert record.number == 12345
+        assert record.moves == ((divmod(12345 % 180, 14)[0] + 1, divmod(12345 % 180, 14)[1], 1),)
+        collection.close()
+        assert os.path.getsize(large) < 20000 * 32
+
+    def test_streams_generator(self, tmp_path):
+        """测试从生成器流式写入：记录不全部留在内存中，峰值内存远小于记录数据的总大小"""
+        stones = tuple((i // 15, i % 15, 1 + i % 2) for i in range(225))
+
+        def generate(count):
+            for i in reversed(range(count)):
+                yield PatternRecord(f"big_{i:05d}", 'advanced', 2, i, stones, stones[::-1])
+
+        path = str(tmp_path / "big.gpc")
+        tracemalloc.start()
+        try:
+            assert write_collection(path, generate(8000)) == 8000
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert peak < os.path.getsize(path) // 3
+        assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+        with PatternCollection(path) as collection:
+            assert collection.record("big_00042").moves == stones[::-1]
+            assert collection.record("big_07999").number == 7999
+
+    def test_invalid_files(self, tmp_path):
+        """测试错误文件和重复 ID"""
+        path = tmp_path / "bad.gpc"
+        path.write_bytes(b"not a collection file")
+        with pytest.raises(CollectionError):
+            PatternCollection(str(path))
+        record = PatternRecord("a", 'beginner', 1, 1, (), ())
+        with pytest.raises(CollectionError):
+            write_collection(str(tmp_path / "dup.gpc"), [record, record])
+
+    def test_pattern_manager_reads_patterns_dir(self, tmp_path):
+        """测试 PatternManager 从 patterns_dir 加载集合中的题目"""
+        write_collection(str(tmp_path / "extra.gpc"), _synthetic_records(50))
+        pm = PatternManager(patterns_dir=str(tmp_path))
+        assert pm.load_pattern("gen_000042")
+        assert pm.current_pattern["initial_setup"] == ((3, 0, 1), (3, 1, 2))
+        assert pm.current_pattern["difficulty"] == "Advanced"
+        pm.set_language('chinese')
+        assert pm.current_pattern["difficulty"] == "高级"
+        assert pm.load_pattern("one_move_1")
+        assert not pm.load_pattern("gen_999999")
@@ -0,0 +1,85 @@
+"""
+搜索引擎测试
+"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import BitBoard, Board
+from game.engine import FOUR_SCORE, SearchEngine, WIN_SCORE, WIN_THRESHOLD
+from game.shapes import get_shape_table
+from tests.conftest import board_with
+
+
+class TestSearchEngine:
+    """搜索引擎测试"""
+
+    def test_takes_five(self):
+        """测试能直接成五时走成五点"""
+        board = board_with([(7, 3, 1), (0, 0, 2), (7, 4, 1), (0, 2, 2),
+                            (7, 5, 1), (0, 4, 2), (7, 6, 1), (1, 1, 2)], Board)
+        result = SearchEngine(max_depth=3).search(board, 1)
+        assert result['move'] in [(7, 2), (7, 7)]
+        assert result['score'] >= WIN_THRESHOLD
+        assert len(board.move_history) == 8  # 传入的棋盘未被修改
+
+    def test_mate_score_from_table_uses_current_ply(self):
+        """测试置换表中的胜负分值按探测时的步数还原，而不是沿用写入时的步数"""
+        board = board_with([(7, 3, 1), (0, 0, 2), (7, 4, 1), (0, 2, 2),
+                            (7, 5, 1), (0, 4, 2), (7, 6, 1), (1, 1, 2)], Board)
+        engine = SearchEngine(max_depth=3, time_limit=None)
+        assert engine.search(board, 1)['score'] == WIN_SCORE - 1
+        # 同一局面在第 4 步出现时：置换表命中，下一手成五即 WIN_SCORE - 5
+        engine._table = get_shape_table()
+        engine.nodes = 0
+        work = BitBoard.from_board(board)
+        assert engine._pvs(work, 1, 1, -WIN_SCORE - 1, WIN_SCORE + 1, 4) == WIN_SCORE - 5
+        assert engine.nodes == 1
+
+    def test_heuristic_four_below_mate_range(self):
+        """测试静态评估中的四只是估计分值，不进入胜负分值区间"""
+        board = board_with([(7, 3, 1), (0, 0, 2), (7, 4, 1), (0, 2, 2),
+                            (7, 5, 1), (0, 4, 2), (7, 6, 1), (1, 1, 2)], Board)
+        engine = SearchEngine()
+        assert engine.evaluate(board, 1) == FOUR_SCORE < WIN_THRESHOLD
+        assert engine.evaluate(board, 2) == -FOUR_SCORE
+
+    def test_blocks_four(self):
+        """测试对方冲四时必须防守"""
+        board = board_with([(7, 3, 2), (7, 2, 1), (7, 4, 2), (0, 0, 1),
+                            (7, 5, 2), (14, 14, 1), (7, 6, 2)], Board)
+        result = SearchEngine(max_depth=3).search(board, 1)
+        assert result['move'] == (7, 7)
+
+    def test_finds_open_four_win(self):
+        """测试活三时走成活四并识别为必胜"""
+        board = board_with([(7, 5, 1), (0, 0, 2), (7, 6, 1), (0, 14, 2),
+                            (7, 7, 1), (14, 0, 2)], Board)
+        result = SearchEngine(max_depth=5, time_limit=5.0).search(board, 1)
+        assert result['move'] in [(7, 4), (7, 8)]
+        assert result['score'] >= WIN_THRESHOLD
+
+    def test_budget_and_stats(self):
+        """测试节点预算与速度统计"""
+        board = board_with([(7, 7, 1), (7, 8, 2), (8, 8, 1), (6, 6, 2)], Board)
+        result = SearchEngine(max_depth=8, time_limit=None, max_nodes=200).search(board)
+        assert result['nodes'] <= 200
+        assert result['move'] is not None
+        assert result['nps'] > 0
+
+    def test_should_stop(self):
+        """测试 should_stop 返回 True 时提前结束，仍给出合法走法"""
+        board = board_with([(7, 7, 1), (7, 8, 2), (8, 8, 1), (6, 6, 2)], Board)
+        calls = []
+
+        def should_stop():
+            calls.append(1)
+            return len(calls) > 2
+
+        result = SearchEngine(max_depth=12, time_limit=None).search(board, should_stop=should_stop)
+        assert len(calls) == 3
+        assert result['nodes'] <= 256 * 3
+        assert board.is_valid_move(*result['move'])
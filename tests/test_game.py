@@ -2,6 +2,7 @@
 游戏核心功能测试
 """
 
+import time
 import sys
 import os
 
@@ -9,6 +10,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from game import Board, PatternManager, MoveValidator
+from game.session import TrainingSession
 
 
 class TestGameBasics:
@@ -90,6 +92,91 @@ class TestGameBasics:
         assert board.check_winner(4, 4, 1) == True
 
 
+class TestAlternativeMoves:
+    """验证器接受棋谱之外的制胜走法"""
+
+    # 白子已有活三 F8-H8，棋谱走 I8 成活四；E8 同样成活四
+    SETUP = [(0, 0, 1), (7, 5, 2), (0, 14, 1), (7, 6, 2), (14, 0, 1), (7, 7, 2)]
+    MOVES = [(7, 8, 2), (7, 9, 1), (7, 4, 2)]
+
+    def _validator(self):
+        board = Board()
+        for row, col, player in self.SETUP:
+            board.make_move(row, col, player)
+        pm = PatternManager()
+        pm.current_pattern = {'id': 'alt', 'initial_setup': self.SETUP, 'moves': self.MOVES}
+        pm.current_step = 0
+        validator = MoveValidator(pm, board)
+        validator.initialize_player_colors()
+        return validator, board, pm
+
+    def test_accepts_winning_alternative(self):
+        """测试不同但同样必胜的走法被接受，电脑应手改由证明树推导"""
+        validator, board, pm = self._validator()
+        result = validator.validate_player_move(7, 4)
+        assert result['valid'] == True
+        assert result['correct_move'] == (7, 4, 2)
+        assert result['computer_move'] == True
+        board.make_move(7, 4, 2)
+        assert pm.current_step == 0   # 棋谱步骤不再前进
+
+        reply = validator.make_computer_move()['move']
+        assert reply[2] == 1 and reply[:2] in ((7, 3), (7, 8))
+        finish = validator.get_expected_move()
+        assert finish[:2] == ((7, 8) if reply[:2] == (7, 3) else (7, 3))
+        result = validator.validate_player_move(*finish[:2])
+        assert result['valid'] == True
+        assert result['pattern_complete'] == True
+
+    def test_rejects_and_caches(self):
+        """测试不能取胜的走法被拒绝，证明结果按局面哈希缓存"""
+        validator, board, pm = self._validator()
+        assert validator.validate_player_move(3, 3)['valid'] == False
+        assert len(validator._proofs) == 1
+        validator.validate_player_move(3, 3)
+        assert len(validator._proofs) == 1
+        assert validator.error_count == 2
+
+    def test_undo_returns_to_script(self):
+        """测试悔棋退出证明树后回到棋谱"""
+        validator, board, pm = self._validator()
+        validator.validate_player_move(7, 4)
+        validator.undo_step()
+        assert validator.get_expected_move() == (7, 8, 2)
+
+    def test_built_in_alternative(self):
+        """测试内置三手胜 three_move_92：白子 M10 不是棋谱走法但同样必胜，被接受并沿证明树走完"""
+        session = TrainingSession()
+        session.load('three_move_92')
+        assert session.validator.get_expected_move() == (6, 7, 2)
+        events = session.play(9, 12)
+        assert events[0]['type'] == 'move' and events[0]['move'] == (9, 12, 2)
+        assert session.pattern_manager.current_step == 0   # 已改为沿证明树继续
+        while not session.is_complete():
+            row, col, player = session.validator.get_expected_move()
+            assert player == 2
+            assert session.play(row, col)[0]['type'] == 'move'
+        assert session.board.check_winner(row, col, 2)
+
+    def test_click_budget(self):
+        """测试内置三手胜 three_move_92 / 94 第一手的每个候选点击都在 CLICK_BUDGET（50 毫秒）内完成判定"""
+        for pattern_id in ('three_move_92', 'three_move_94'):
+            session = TrainingSession()
+            session.load(pattern_id)
+            board, validator = session.board, session.validator
+            candidates = [(row, col) for row in range(board.size) for col in range(board.size)
+                          if board.is_valid_move(row, col)]
+            slowest = 0.0
+            for row, col in candidates:
+                validator._proofs.clear()
+                start = time.perf_counter()
+                result = validator.validate_player_move(row, col)
+                slowest = max(slowest, time.perf_counter() - start)
+                if result['valid']:
+                    validator.undo_step()   # 回到第一手，继续测下一个候选点
+            assert slowest < MoveValidator.CLICK_BUDGET
+
+
 if __name__ == "__main__":
     # 简单的测试运行器
     import traceback
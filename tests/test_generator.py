@@ -0,0 +1,82 @@
+"""
+自对弈棋谱生成器测试
+"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.bitboard import BitBoard
+from game.cli import main
+from game.collection import PatternCollection
+from game.generator import _is_shortest_win, generate_collection, generate_shard, puzzle_difficulty
+from game.validation import validate_records
+from game.vcf import VCFSolver
+from game.vct import VCTSolver
+from tests.conftest import board_with
+
+
+class TestPuzzleGenerator:
+    """棋谱生成测试"""
+
+    def test_shard_is_seeded(self):
+        """测试同一 (seed, shard) 结果相同，不同分片结果不同"""
+        first = generate_shard(0, seed=5, games=4)
+        second = generate_shard(0, seed=5, games=4)
+        other = generate_shard(1, seed=5, games=4)
+        assert first['puzzles'] == second['puzzles']
+        assert first['puzzles'] != other['puzzles']
+        assert first['positions'] > 0
+
+    def test_puzzles_are_exact_wins(self):
+        """测试生成的棋谱通过全部校验，且最短必胜恰好为 win_moves 手"""
+        puzzles = generate_shard(2, seed=1, games=6, win_moves=(2,))['puzzles']
+        assert puzzles
+        for record in puzzles:
+            assert record.win_moves == 2
+            assert record.difficulty == puzzle_difficulty(2) == 'intermediate'
+            assert len(record.moves) == 3
+        results = list(validate_records(puzzles, VCFSolver()))
+        assert all(result['valid'] for result in results)
+        # 不限深度重新求解，最短制胜序列与棋谱给出的一样长
+        for record in puzzles:
+            board = BitBoard()
+            for row, col, player in record.initial_setup:
+                board.make_move(row, col, player)
+            assert len(VCFSolver().solve(board, record.moves[0][2])['line']) == len(record.moves)
+
+    def test_shorter_vct_win_rejected(self):
+        """测试最短连续冲四为 4 手、但借助活三 3 手即可取胜的局面不会被标为 4 手胜"""
+        board = board_with([(7, 4, 1), (7, 5, 1), (7, 6, 1), (7, 3, 2), (9, 8, 1), (10, 8, 1),
+                            (11, 8, 2), (5, 10, 1), (4, 11, 1), (3, 12, 2), (14, 0, 2), (0, 7, 2), (2, 14, 2)])
+        line = VCFSolver().solve(board, 1)['line']
+        assert (len(line) + 1) // 2 == 4
+        assert not _is_shortest_win(board, 1, 4, VCTSolver())
+        # 白子在第一行有反冲四时活三不再奏效，4 手就是最短胜法
+        board = board_with([(7, 4, 1), (7, 5, 1), (7, 6, 1), (7, 3, 2), (9, 8, 1), (10, 8, 1),
+                            (11, 8, 2), (5, 10, 1), (4, 11, 1), (3, 12, 2), (0, 0, 2), (0, 2, 2), (0, 4, 2)])
+        assert (len(VCFSolver().solve(board, 1)['line']) + 1) // 2 == 4
+        assert _is_shortest_win(board, 1, 4, VCTSolver())
+
+    def test_workers_do_not_change_output(self, tmp_path):
+        """测试并行与串行写出的集合文件完全相同"""
+        serial = str(tmp_path / 'serial.gpc')
+        parallel = str(tmp_path / 'parallel.gpc')
+        stats = generate_collection(serial, range(3), workers=1, seed=3, games=3)
+        generate_collection(parallel, range(3), workers=2, seed=3, games=3)
+        with open(serial, 'rb') as f, open(parallel, 'rb') as g:
+            assert f.read() == g.read()
+        assert stats['games'] == 9
+        assert stats['puzzles_per_hour'] > 0
+        with PatternCollection(serial) as collection:
+            assert len(collection) == stats['puzzles']
+            assert [record.number for record in collection.records()] == list(range(1, stats['puzzles'] + 1))
+
+    def test_generate_command(self, tmp_path):
+        """测试 gobang generate 命令"""
+        target = str(tmp_path / 'nightly.gpc')
+        assert main(['generate', '-o', target, '--shards', '2', '--games', '2', '-j', '1']) == 0
+        with PatternCollection(target) as collection:
+            assert all(record.id.startswith('gen_0_') for record in collection.records())
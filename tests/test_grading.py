@@ -0,0 +1,103 @@
+"""
+棋谱难度评级测试
+"""
+
+import io
+import json
+import sys
+import os
+from contextlib import redirect_stdout
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import PatternManager
+from game.catalog import PatternRecord
+from game.cli import main
+from game.collection import PatternCollection, write_collection
+from game.grading import GradeCache, grade_key, grade_position, grade_records, rating_difficulty
+from tests.conftest import DOUBLE_THREE, board_with
+
+# 黑子已有活三，一手活四
+OPEN_THREE = ((7, 5, 1), (0, 0, 2), (7, 6, 1), (0, 14, 2), (7, 7, 1), (14, 0, 2))
+
+
+def mirror(moves):
+    return tuple((row, 14 - col, player) for row, col, player in moves)
+
+
+def record(pattern_id, setup):
+    return PatternRecord(pattern_id, 'beginner', 1, 0, setup, ((1, 1, 1),))
+
+
+class TestGradePosition:
+    """单个局面评级测试"""
+
+    def test_rating_components(self):
+        """测试评级指标：唯一解、多诱着的三手胜比活三变活四更难"""
+        easy = grade_position(board_with(OPEN_THREE), 1)
+        assert easy['result'] == 'proven'
+        assert easy['solutions'] == 2   # 活三两端都能成活四
+        assert easy['threats'] >= easy['solutions'] + easy['decoys']
+        # 内置 three_move_93 白子第一手之后的局面：黑子的唯一解三手胜
+        pattern = PatternManager().catalog.record('three_move_93')
+        hard = grade_position(board_with(pattern.initial_setup + pattern.moves[:1]), 1)
+        assert hard['result'] == 'proven'
+        assert hard['solutions'] == 1
+        assert hard['decoys'] > 0
+        assert hard['win_moves'] > easy['win_moves']
+        assert hard['rating'] > easy['rating']
+        assert hard['difficulty'] == rating_difficulty(hard['rating']) == 'advanced'
+
+    def test_not_proven(self):
+        """测试没有必胜的局面不评分"""
+        grade = grade_position(board_with(((7, 7, 1), (7, 8, 2))), 1)
+        assert grade['result'] == 'disproven'
+        assert grade['rating'] is None
+        assert rating_difficulty(None) == 'unknown'
+
+
+class TestGradeBatch:
+    """批量评级与缓存测试"""
+
+    def test_mirrored_positions_share_cache(self):
+        """测试镜像局面使用同一缓存键，第二次直接命中缓存"""
+        assert grade_key(board_with(DOUBLE_THREE), 1) == grade_key(board_with(mirror(DOUBLE_THREE)), 1)
+        cache = GradeCache()
+        records = [record('a', DOUBLE_THREE), record('b', OPEN_THREE)]
+        first = list(grade_records(records, cache=cache))
+        assert [grade['cached'] for grade in first] == [False, False]
+        second = list(grade_records([record('c', mirror(DOUBLE_THREE))], cache=cache))
+        assert second[0]['cached'] == True
+        assert second[0]['rating'] == first[0]['rating']
+
+    def test_parallel_and_persistent(self, tmp_path):
+        """测试并行结果与串行一致，缓存文件可重新加载，参数变化时失效"""
+        path = str(tmp_path / 'grades.json')
+        records = [record('a', DOUBLE_THREE), record('b', OPEN_THREE), record('c', mirror(OPEN_THREE))]
+        cache = GradeCache(path, {'max_nodes': 50000})
+        parallel = list(grade_records(records, workers=2, cache=cache, chunk_size=1, max_nodes=50000))
+        serial = list(grade_records(records, cache=GradeCache(), max_nodes=50000))
+        assert [grade['rating'] for grade in parallel] == [grade['rating'] for grade in serial]
+        cache.save()
+        assert len(GradeCache(path, {'max_nodes': 50000})) == 2
+        assert len(GradeCache(path, {'max_nodes': 1000})) == 0
+
+    def test_grade_command(self, tmp_path):
+        """测试 gobang grade 输出 JSONL 并按评分重写难度"""
+        source = str(tmp_path / 'puzzles.gpc')
+        target = str(tmp_path / 'graded.gpc')
+        cache = str(tmp_path / 'grades.json')
+        write_collection(source, [record('a', DOUBLE_THREE), record('b', ((7, 7, 1), (7, 8, 2)))])
+        output = io.StringIO()
+        with redirect_stdout(output):
+            assert main(['grade', source, '--cache', cache, '--relabel', target, '-j', '1']) == 0
+        grades = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [grade['id'] for grade in grades] == ['a', 'b']
+        with PatternCollection(target) as collection:
+            assert collection.record('a').difficulty == grades[0]['difficulty']
+            assert collection.record('b').difficulty == 'beginner'
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(['grade', source, '--cache', cache, '-j', '1'])
+        assert all(json.loads(line)['cached'] for line in output.getvalue().splitlines())
@@ -0,0 +1,119 @@
+"""
+分级提示测试
+"""
+
+import time
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import PatternManager
+from game.engine import SearchEngine
+from game.hints import (
+    HINT_CANDIDATES, HINT_DIRECTION, HINT_MOVE, HINT_THREAT, HintProvider, hint_message,
+)
+from game.session import TrainingSession
+from tests.conftest import board_with
+
+
+def _text(key, *args):
+    return f"{key}({', '.join(str(arg) for arg in args)})"
+
+
+def _position(row, col):
+    return f"{row}/{col}"
+
+
+class TestHintProvider:
+    """提示生成器"""
+
+    def test_attack_and_defend(self):
+        """测试进攻（成四）和防守（挡五）的威胁类型与方向"""
+        provider = HintProvider()
+        board = board_with([(7, 4, 1), (0, 0, 2), (7, 5, 1), (0, 2, 2), (7, 6, 1), (0, 4, 2)])
+        info = provider.analyse(board, 1, (7, 7))
+        assert info['purpose'] == 'attack' and info['threat'] == 'open_four'
+        assert info['direction'] == 'horizontal'
+
+        board = board_with([(3, 3, 1), (4, 3, 1), (5, 3, 1), (6, 3, 1), (7, 7, 2)])
+        info = provider.analyse(board, 2, (7, 3))
+        assert info['purpose'] == 'defend' and info['threat'] == 'five'
+        assert info['direction'] == 'vertical'
+
+    def test_candidates_and_cache(self):
+        """测试候选点包含目标走法且按坐标排序；同一局面重复请求命中缓存"""
+        provider = HintProvider(candidates=4)
+        board = board_with([(7, 7, 1), (7, 8, 2), (8, 8, 1), (6, 6, 2)])
+        info = provider.analyse(board, 1, (9, 9))
+        assert (9, 9) in info['candidates'] and len(info['candidates']) == 4
+        assert info['candidates'] == sorted(info['candidates'])
+        assert provider.analyse(board, 1, (9, 9)) is info
+        assert provider.cache_hits == 1 and provider.analysed == 1
+
+    def test_search_when_move_unknown(self):
+        """测试没有目标走法时用引擎找出最佳走法（例如成五）"""
+        provider = HintProvider(SearchEngine(max_depth=2, time_limit=None))
+        board = board_with([(7, 3, 1), (0, 0, 2), (7, 4, 1), (0, 2, 2), (7, 5, 1), (0, 4, 2), (7, 6, 1), (0, 6, 2)])
+        info = provider.analyse(board, 1)
+        assert info['move'] in ((7, 2), (7, 7)) and info['threat'] == 'five'
+        assert provider.analyse(board, 1, should_stop=lambda: True) is info   # 缓存命中，不再搜索
+
+    def test_messages(self):
+        """测试四级提示文字由浅入深"""
+        info = {'move': (2, 12), 'purpose': 'attack', 'threat': 'four_three', 'direction': 'diagonal',
+                'candidates': [(1, 1), (2, 12)]}
+        assert hint_message(info, HINT_THREAT, _text, _position) == 'hint_attack(threat_four_three())'
+        assert hint_message(info, HINT_DIRECTION, _text, _position) == \
+            'hint_direction(direction_diagonal(), area_hint(area_upper(), area_right()))'
+        assert hint_message(info, HINT_CANDIDATES, _text, _position) == 'hint_candidates(1/1, 2/12)'
+        assert hint_message(info, HINT_MOVE, _text, _position) == 'hint_play_at(2/12)'
+
+
+class TestSessionHints:
+    """训练会话中的提示"""
+
+    def test_levels_progress(self):
+        """测试同一局面每次提示更具体一级，最后一级给出走法；走错后跳过已给出的级别"""
+        session = TrainingSession()
+        session.load('three_move_93')
+        levels = [session.hint()[0]['level'] for _ in range(5)]
+        assert levels == [1, 2, 3, 4, 4]
+        assert session.hint()[0]['move'] == (11, 5, 2)
+
+        session.restart()
+        session.play(0, 0)
+        events = session.hint()
+        assert events[0]['level'] == 2 and events[0]['move'] is None
+        assert (11, 5) in events[0]['candidates']
+
+    def test_rejections(self):
+        """测试未选棋谱、电脑回合时拒绝提示"""
+        assert TrainingSession().hint()[0]['reason'] == 'no_pattern'
+        session = TrainingSession(auto_reply=False)
+        session.load('three_move_93')
+        session.play(11, 5)
+        assert session.hint()[0]['reason'] == 'not_your_turn'
+
+    def test_wrong_move_hint(self):
+        """测试走错后的提示来自威胁分析而不是区域划分"""
+        session = TrainingSession()
+        session.load('one_move_1')
+        message = session.play(0, 0)[0]['message']
+        assert "hem in your opponent's stones" in message
+        message = session.play(0, 1)[0]['message']
+        assert 'horizontal' in message
+
+    def test_built_in_patterns_fast(self):
+        """测试所有内置棋谱每一步的四级提示都在交互延迟内给出"""
+        session = TrainingSession()
+        for pattern in PatternManager().get_patterns_list():
+            session.load(pattern['id'])
+            while not session.is_complete():
+                for _ in range(4):
+                    start = time.perf_counter()
+                    events = session.hint()
+                    assert time.perf_counter() - start < 0.05
+                    assert events[0]['type'] == 'hint'
+                assert session.play(*events[0]['move'][:2])[0]['type'] == 'move'
@@ -0,0 +1,96 @@
+"""
+棋谱导入器测试
+"""
+
+import sys
+import os
+import tracemalloc
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.collection import PatternCollection, write_collection
+from game.importer import RENLIB_COMMENT, RENLIB_DOWN, RENLIB_RIGHT, import_file, to_pattern_record
+
+
+def _renlib_pos(row, col):
+    """RenLib 坐标字节"""
+    return row * 16 + col + 1
+
+
+def _collect(path, **kwargs):
+    """导入文件，返回 (结果列表, 错误列表)"""
+    errors = []
+    patterns = list(import_file(str(path), on_error=errors.append, **kwargs))
+    return patterns, errors
+
+
+class TestImporter:
+    """流式导入测试"""
+
+    def test_text(self, tmp_path):
+        """测试纯文本走法：坏行被报告并跳过"""
+        path = tmp_path / "games.txt"
+        path.write_text("# header\nH8 I8 G8 F8\n\nH8 Z99\nH8 H8 I9\nh8 i9 j10  # tail comment\n")
+        patterns, errors = _collect(path, solution_plies=1)
+        assert [pattern['id'] for pattern in patterns] == ["games.txt:2", "games.txt:6"]
+        assert patterns[0]['initial_setup'] == [(7, 7, 1), (7, 8, 2), (7, 6, 1)]
+        assert patterns[0]['moves'] == [(7, 5, 2)]
+        assert patterns[1]['moves'] == [(9, 9, 1)]
+        assert [error.position for error in errors] == ["games.txt:4", "games.txt:5"]
+
+    def test_renlib_tree(self, tmp_path):
+        """测试 RenLib 变化树：每个叶子产生一条从根开始的走法，注释被跳过"""
+        nodes = bytes((
+            _renlib_pos(7, 7), RENLIB_DOWN,
+            _renlib_pos(7, 8), RENLIB_DOWN | RENLIB_RIGHT,
+            _renlib_pos(7, 6), RENLIB_COMMENT,
+        )) + b"hi\x00\x00" + bytes((
+            _renlib_pos(8, 8), RENLIB_DOWN,
+            _renlib_pos(6, 6), 0,
+        ))
+        path = tmp_path / "book.lib"
+        path.write_bytes(b"\xffRenLib" + bytes(13) + nodes)
+        patterns, errors = _collect(path, solution_plies=0)
+        assert not errors
+        assert [pattern['initial_setup'] for pattern in patterns] == [
+            [(7, 7, 1), (7, 8, 2), (7, 6, 1)],
+            [(7, 7, 1), (8, 8, 2), (6, 6, 1)],
+        ]
+        path.write_bytes(b"not renlib at all!!!!")
+        assert _collect(path, file_format='renlib')[1][0].position == 0
+
+    def test_sgf_main_line(self, tmp_path):
+        """测试 SGF：读取摆子和主线，忽略变化，拒绝其它棋类"""
+        path = tmp_path / "games.sgf"
+        path.write_text(
+            "(;GM[4]SZ[15]GN[first]AB[aa][ab]AW[oo]C[note \\] here];B[hh];W[ih]"
+            "(;B[gh];W[fh])(;B[ii]))\n"
+            "(;GM[1]SZ[19];B[dd])\n"
+            "(;GM[4]SZ[15];B[hh];W[hh])\n")
+        patterns, errors = _collect(path, solution_plies=2)
+        assert len(patterns) == 1 and len(errors) == 2
+        assert patterns[0]['id'] == "games.sgf:first"
+        assert patterns[0]['initial_setup'] == [(0, 0, 1), (1, 0, 1), (14, 14, 2), (7, 7, 1), (7, 8, 2)]
+        assert patterns[0]['moves'] == [(7, 6, 1), (7, 5, 2)]
+
+    def test_streaming_to_collection(self, tmp_path):
+        """测试大文件流式导入内存有上限，结果可写入集合文件"""
+        path = tmp_path / "many.txt"
+        with open(path, 'w') as f:
+            for i in range(20000):
+                f.write(f"H8 I{1 + i % 15} {chr(ord('A') + i % 7)}3\n")
+        tracemalloc.start()
+        count = 0
+        for _ in import_file(str(path), on_error=lambda error: None):
+            count += 1
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert count == 20000
+        assert peak < 1 << 20
+
+        patterns, _ = _collect(path)
+        target = str(tmp_path / "many.gpc")
+        write_collection(target, (to_pattern_record(pattern) for pattern in patterns[:100]))
+        with PatternCollection(target) as collection:
+            assert collection.record("many.txt:5").moves == ((2, 4, 1),)
@@ -0,0 +1,83 @@
+"""
+后台预想测试
+"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.engine import SearchEngine
+from game.ponder import Ponderer
+from game.session import TrainingSession
+from tests.conftest import board_with
+
+
+class TestPonderer:
+    """预想器"""
+
+    def test_candidates_and_hit_rate(self):
+        """测试预测的一手最先分析，命中返回结果，换了局面的落子不计入统计"""
+        board = board_with([(7, 7, 1), (7, 8, 2), (8, 8, 1)])
+        ponderer = Ponderer(SearchEngine(max_depth=2, time_limit=None), replies=3)
+        analysed = ponderer.ponder(board, 2, lambda work, move, stop: move, predicted=(0, 0))
+        assert analysed[0] == (0, 0) and len(analysed) == 4
+        assert len(board.move_history) == 3
+
+        assert ponderer.take(board, analysed[1]) == analysed[1]
+        ponderer.ponder(board, 2, lambda work, move, stop: move)
+        assert ponderer.take(board, (14, 14)) is None
+        assert ponderer.take(board, analysed[1]) is None   # 同一局面只统计一次
+        other = board_with([(3, 3, 1)])
+        assert ponderer.take(other, (4, 4)) is None
+        stats = ponderer.stats()
+        assert stats['hits'] == 1 and stats['misses'] == 1 and stats['hit_rate'] == 0.5
+
+    def test_stop_discards_partial(self):
+        """测试停止后不再分析，被打断的一手不保存"""
+        board = board_with([(7, 7, 1), (7, 8, 2)])
+        ponderer = Ponderer(SearchEngine(), replies=6)
+        calls = []
+
+        def analyse(work, move, stop):
+            calls.append(move)
+            return move
+
+        assert ponderer.ponder(board, 1, analyse, should_stop=lambda: len(calls) >= 2) == [calls[0]]
+        assert len(calls) == 2
+
+    def test_ponder_search(self):
+        """测试自由对弈预想：命中时电脑的应手已经搜索好"""
+        board = board_with([(7, 7, 1), (7, 8, 2), (8, 8, 1)])
+        ponderer = Ponderer(SearchEngine(max_depth=3, time_limit=None), replies=2)
+        analysed = ponderer.ponder_search(board, 2, predicted=(6, 6))
+        assert analysed[0] == (6, 6)
+        result = ponderer.take(board, (6, 6))
+        assert result['depth'] == 3 and result['move'] is not None
+
+
+class TestSessionPonder:
+    """训练会话中的预想"""
+
+    def test_precheck_fills_proof_cache(self):
+        """测试预想把候选走法的求解结果写入证明缓存，之后落子不再调用求解器"""
+        session = TrainingSession(ponderer=Ponderer())
+        session.load('one_move_1')
+        analysed = session.ponder()
+        expected = session.validator.get_expected_move()[:2]
+        assert analysed[0] == expected
+        assert len(session.validator._proofs) == len(analysed) - 1
+
+        other = analysed[1]
+        session.validator.solver = None   # 再调用求解器就会出错
+        assert session.play(*other)[0]['type'] in ('move', 'wrong')
+        assert session.ponderer.stats()['hits'] == 1
+
+    def test_no_ponder_on_computer_turn(self):
+        """测试不是玩家回合或没有预想器时不预想"""
+        assert TrainingSession().ponder() == []
+        session = TrainingSession(ponderer=Ponderer(), auto_reply=False)
+        session.load('three_move_93')
+        session.play(11, 5)
+        assert session.ponder() == []
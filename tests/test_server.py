@@ -0,0 +1,146 @@
+"""
+训练服务测试（本地客户端，不依赖外部服务）
+"""
+
+import asyncio
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.server import LatencyMetrics, TrainingClient, TrainingServer
+
+PATTERN = 'three_move_93'
+
+
+def run(coroutine_function, **options):
+    """启动服务，把服务和端口交给测试协程，结束后关闭"""
+    async def main():
+        server = TrainingServer(**options)
+        port = await server.start()
+        try:
+            await coroutine_function(server, port)
+        finally:
+            await server.close()
+    asyncio.run(main())
+
+
+class TestTrainingServer:
+    """训练服务"""
+
+    def test_http_session(self):
+        """测试通过 HTTP 新建会话、走棋、悔棋和关闭"""
+        async def scenario(server, port):
+            client = await TrainingClient('127.0.0.1', port).connect()
+            status, body = await client.request('GET', '/patterns?language=chinese')
+            assert status == 200 and any(pattern['id'] == PATTERN for pattern in body['patterns'])
+
+            status, body = await client.request('POST', '/sessions', {'pattern': PATTERN})
+            assert status == 201
+            session_id = body['state']['session']
+            assert body['state']['setup'] == 7
+
+            status, body = await client.request('POST', f'/sessions/{session_id}/play', {'row': 11, 'col': 5})
+            assert [event['type'] for event in body['events']] == ['move', 'computer']
+            assert body['state']['stones'][-1] == [10, 0, 1]
+
+            status, body = await client.request('POST', f'/sessions/{session_id}/undo')
+            assert len(body['state']['stones']) == 7 and body['state']['player_turn']
+
+            status, _ = await client.request('DELETE', f'/sessions/{session_id}')
+            assert status == 200
+            status, _ = await client.request('GET', f'/sessions/{session_id}')
+            assert status == 404
+            await client.close()
+        run(scenario)
+
+    def test_http_errors(self):
+        """测试错误请求返回 4xx 且连接保持可用"""
+        async def scenario(server, port):
+            client = await TrainingClient('127.0.0.1', port).connect()
+            assert (await client.request('POST', '/sessions', {'pattern': 'missing'}))[0] == 404
+            assert (await client.request('POST', '/sessions', {}))[0] == 400
+            assert (await client.request('GET', '/nowhere'))[0] == 404
+            assert (await client.request('PUT', '/sessions/abc'))[0] == 405
+            _, body = await client.request('POST', '/sessions', {'pattern': PATTERN})
+            status, _ = await client.request('POST', f"/sessions/{body['state']['session']}/play", {'row': 'x'})
+            assert status == 400
+            await client.close()
+        run(scenario)
+
+    def test_bad_field_types(self):
+        """测试 language / session / pattern 不是字符串时返回 400，未预料的异常返回 500，连接保持可用"""
+        async def scenario(server, port):
+            client = await TrainingClient('127.0.0.1', port).connect()
+            status, body = await client.request('POST', '/sessions', {'pattern': [PATTERN]})
+            assert status == 400 and 'pattern' in body['error']
+            assert (await client.request('POST', '/sessions', {'pattern': PATTERN, 'language': ['english']}))[0] == 400
+            assert (await client.request('GET', '/patterns'))[0] == 200
+            await client.close()
+
+            client = await TrainingClient('127.0.0.1', port).connect(websocket=True)
+            response = await client.send('new', pattern=PATTERN, language=['english'])
+            assert not response['ok'] and response['status'] == 400
+            response = await client.send('play', session=['abc'], row=0, col=0)
+            assert not response['ok'] and response['status'] == 400
+
+            def broken(operation, params):
+                raise RuntimeError('boom')
+            server.handle = broken
+            response = await client.send('state', session='abc')
+            assert not response['ok'] and response['status'] == 500
+            await client.close()
+        run(scenario)
+
+    def test_websocket_session(self):
+        """测试通过 WebSocket 完成整道题，响应带回请求 id"""
+        async def scenario(server, port):
+            client = await TrainingClient('127.0.0.1', port).connect(websocket=True)
+            response = await client.send('new', pattern=PATTERN)
+            assert response['ok'] and response['status'] == 201 and response['id'] == 1
+            session_id = response['state']['session']
+            response = await client.send('hint', session=session_id)
+            assert response['events'][0]['level'] == 1
+            for row, col in ((11, 5), (9, 3), (10, 5)):
+                response = await client.send('play', session=session_id, row=row, col=col)
+            assert response['state']['complete']
+            response = await client.send('play', session='missing', row=0, col=0)
+            assert not response['ok'] and response['status'] == 404
+            await client.close()
+        run(scenario)
+
+    def test_many_sessions_and_metrics(self):
+        """测试同时保留上千个会话，超出上限时关闭最久未用的会话，并统计延迟"""
+        async def scenario(server, port):
+            client = await TrainingClient('127.0.0.1', port).connect(websocket=True)
+            first = None
+            for _ in range(1200):
+                response = await client.send('new', pattern=PATTERN)
+                first = first or response['state']['session']
+                await client.send('play', session=response['state']['session'], row=11, col=5)
+            assert len(server.sessions) == 1000
+            assert server.expired == 200
+            assert first not in server.sessions
+            # 所有会话共享同一个求解器和证明缓存
+            session, _ = next(iter(server.sessions.values()))
+            assert session.validator.solver is server.solver
+            assert session.validator._proofs is server.proofs
+
+            metrics = (await client.send('metrics'))
+            assert metrics['sessions'] == 1000
+            assert metrics['latency']['play']['count'] == 1200
+            assert metrics['latency']['new']['p99_ms'] >= metrics['latency']['new']['p50_ms']
+            await client.close()
+        run(scenario, max_sessions=1000)
+
+    def test_latency_metrics(self):
+        """测试分位数统计"""
+        metrics = LatencyMetrics()
+        for value in range(1, 101):
+            metrics.record('play', value / 1000)
+        stats = metrics.snapshot()['play']
+        assert stats['count'] == 100
+        assert stats['p50_ms'] == 51.0
+        assert stats['max_ms'] == 100.0
+        assert abs(stats['mean_ms'] - 50.5) < 1e-6
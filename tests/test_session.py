@@ -0,0 +1,158 @@
+"""
+无界面训练会话与回放测试
+"""
+
+import io
+import json
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import PatternManager
+from game.replay import make_session, parse_log, replay_log, replay_stream
+from game.session import TrainingSession
+
+import pytest
+
+# three_move_93：白子走 (11, 5)、(9, 3)、(10, 5)，黑子依次应 (10, 0)、(9, 6)、(8, 7)
+PATTERN = 'three_move_93'
+SOLUTION = [(11, 5), (9, 3), (10, 5)]
+SETUP_STONES = 7
+
+
+def types(events):
+    return [event['type'] for event in events]
+
+
+class TestTrainingSession:
+    """训练会话"""
+
+    def test_load_and_solve(self):
+        """测试按棋谱走完，每一手之后电脑立即应手"""
+        session = TrainingSession()
+        assert types(session.load(PATTERN)) == ['restart']
+        assert len(session.board.move_history) == SETUP_STONES
+        assert types(session.play(*SOLUTION[0])) == ['move', 'computer']
+        assert types(session.play(*SOLUTION[1])) == ['move', 'computer']
+        events = session.play(*SOLUTION[2])
+        assert types(events) == ['move', 'computer', 'complete']
+        assert events[1]['move'] == (8, 7, 1)
+        assert session.is_complete()
+
+    def test_rejections(self):
+        """测试无效操作被拒绝且不改变棋盘"""
+        session = TrainingSession()
+        assert session.play(7, 7)[0]['reason'] == 'no_pattern'
+        session.load(PATTERN)
+        assert session.play(10, 3)[0]['reason'] == 'occupied'
+        assert session.play(-1, 3)[0]['reason'] == 'off_board'
+        assert session.undo()[0]['reason'] == 'no_moves'
+        assert session.load('missing')[0]['reason'] == 'unknown_pattern'
+        assert len(session.board.move_history) == SETUP_STONES
+
+    def test_wrong_moves_reveal_answer(self):
+        """测试错误次数用完后演示正确走法，电脑随后应手"""
+        session = TrainingSession()
+        session.load(PATTERN)
+        assert types(session.play(0, 0)) == ['wrong']
+        assert types(session.play(0, 1)) == ['wrong']
+        events = session.play(0, 2)
+        assert types(events) == ['wrong', 'answer', 'computer']
+        assert events[0]['show_answer'] == True
+        assert events[1]['move'] == (11, 5, 2)
+        assert len(session.board.move_history) == SETUP_STONES + 2
+
+    def test_manual_reply(self):
+        """测试 auto_reply=False 时由调用方决定何时让电脑走棋"""
+        session = TrainingSession(auto_reply=False)
+        session.load(PATTERN)
+        events = session.play(*SOLUTION[0])
+        assert types(events) == ['move'] and events[0]['computer_move'] == True
+        assert session.play(*SOLUTION[1])[0]['reason'] == 'not_your_turn'
+        assert types(session.computer_move()) == ['computer']
+        assert session.computer_move() == []
+
+    def test_undo_back_to_player(self):
+        """测试悔棋回到玩家回合，初始局面保留"""
+        session = TrainingSession()
+        session.load(PATTERN)
+        for move in SOLUTION:
+            session.play(*move)
+        # 最后一手是电脑走的：连同玩家的一手一起撤销
+        events = session.undo()
+        assert events[0]['undone'] == [(8, 7, 1), (10, 5, 2)]
+        assert session.validator.is_player_turn
+        assert session.validator.get_expected_move() == (10, 5, 2)
+        session.undo()
+        session.undo()
+        assert len(session.board.move_history) == SETUP_STONES
+        assert session.undo()[0]['reason'] == 'no_moves'
+        assert types(session.play(*SOLUTION[0])) == ['move', 'computer']
+
+    def test_shared_state(self):
+        """测试多个会话共享集合文件和证明缓存，状态互不影响"""
+        manager = PatternManager()
+        proofs = {}
+        first = TrainingSession(PatternManager(collections=manager.collections), proof_cache=proofs)
+        second = TrainingSession(PatternManager(collections=manager.collections), proof_cache=proofs)
+        first.load(PATTERN)
+        second.load(PATTERN)
+        first.play(*SOLUTION[0])
+        assert first.validator._proofs is second.validator._proofs
+        assert len(second.board.move_history) == SETUP_STONES
+
+
+class TestReplay:
+    """回放"""
+
+    def test_parse_log(self):
+        """测试解析日志，支持棋谱坐标"""
+        log = parse_log(json.dumps({'pattern': PATTERN, 'actions': [['play', 'F12'], 'undo']}))
+        assert log['actions'] == [('play', 11, 5), ('undo',)]
+        with pytest.raises(ValueError):
+            parse_log(json.dumps({'pattern': PATTERN, 'actions': [['play', 1]]}))
+        with pytest.raises(ValueError):
+            parse_log(json.dumps({'actions': []}))
+        for bad in ({'pattern': PATTERN, 'actions': [{'x': 1}]}, {'pattern': PATTERN, 'actions': [[]]},
+                    {'pattern': PATTERN, 'actions': 'play'}, {'pattern': PATTERN, 'expect': [True]},
+                    {'pattern': [PATTERN]}):
+            with pytest.raises(ValueError):
+                parse_log(json.dumps(bad))
+
+    def test_replay_log(self):
+        """测试回放一条日志并检查 expect；会话可以重复使用"""
+        session = make_session()
+        log = parse_log(json.dumps({'id': 's1', 'pattern': PATTERN,
+                                    'actions': [['play', r, c] for r, c in SOLUTION],
+                                    'expect': {'complete': True, 'wrong': 0}}))
+        for _ in range(2):
+            summary = replay_log(log, session)
+            assert summary['ok'] == True
+            assert summary['plies'] == 6
+            assert summary['events']['computer'] == 3
+
+        log['expect'] = {'complete': False}
+        assert replay_log(log, session)['mismatch'] == {'complete': True}
+
+    def test_replay_stream(self):
+        """测试流式回放：结果按输入顺序输出，坏行报告错误而不中断"""
+        lines = [
+            json.dumps({'id': 'ok', 'pattern': PATTERN, 'actions': [['play', r, c] for r, c in SOLUTION],
+                        'expect': {'complete': True}}),
+            '{not json',
+            json.dumps({'id': 'missing', 'pattern': 'missing'}),
+            json.dumps({'id': 'wrong', 'pattern': PATTERN, 'actions': [['play', 0, 0], ['play', 0, 1]],
+                        'expect': {'wrong': 2, 'plies': 0}}),
+            '{"pattern": "classic_1", "actions": [{"x": 1}]}',
+        ]
+        output = io.StringIO()
+        stats = replay_stream(io.StringIO('\n'.join(lines)), output, chunk_size=2)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [result['line_number'] for result in results] == [1, 2, 3, 4, 5]
+        assert stats['sessions'] == 5
+        assert stats['errors'] == 3
+        assert stats['mismatches'] == 0
+        assert stats['complete'] == 1
+        assert results[3]['ok'] == True
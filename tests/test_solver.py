@@ -0,0 +1,230 @@
+"""
+求解器测试
+"""
+
+import random
+import sys
+import os
+
+import pytest
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import BitBoard, PatternManager
+from game.threats import THREAT_FOUR, THREAT_THREE, ThreatMap, cell_entries, find_threat_moves, threat_level
+from game.vcf import VCFSolver, pattern_attacker, pattern_start, verify_pattern
+from game.vct import VCTSolver, proof_tree_size
+from tests.conftest import DOUBLE_THREE, board_with
+
+
+def _assert_valid_vcf(board, line, attacker):
+    """重放制胜序列：进攻方每手都是冲四，最后一手成五"""
+    for i, (row, col, player) in enumerate(line):
+        if player == attacker and i < len(line) - 1:
+            index = row * board.size + col
+            assert threat_level(cell_entries(board, index, attacker)) >= THREAT_FOUR
+        assert board.make_move(row, col, player)
+    row, col, player = line[-1]
+    assert player == attacker
+    assert board.check_winner(row, col, attacker)
+
+
+class TestVCFSolver:
+    """连续冲四求解器测试"""
+
+    def test_double_four(self):
+        """测试一手双四"""
+        board = board_with([(7, 4, 1), (7, 5, 1), (7, 6, 1), (7, 3, 2),
+                            (4, 7, 1), (5, 7, 1), (6, 7, 1), (3, 7, 2), (0, 0, 2)])
+        result = VCFSolver().solve(board, 1)
+        assert result['result'] == 'win'
+        assert result['line'][0] == (7, 7, 1)
+        _assert_valid_vcf(board, result['line'], 1)
+
+    def test_multi_step_vcf(self):
+        """测试需要连续多次冲四的必胜"""
+        moves = [(7, 4, 1), (7, 5, 1), (7, 6, 1), (7, 3, 2), (9, 8, 1), (10, 8, 1),
+                 (11, 8, 2), (5, 10, 1), (4, 11, 1), (3, 12, 2), (0, 0, 2), (0, 2, 2), (0, 4, 2)]
+        board = board_with(moves)
+        result = VCFSolver().solve(board, 1)
+        assert result['result'] == 'win'
+        assert len(result['line']) >= 5
+        _assert_valid_vcf(board, result['line'], 1)
+        assert len(board.move_history) == len(moves) + len(result['line'])
+
+    def test_no_vcf_and_defender_four(self):
+        """测试没有冲四时否定，以及防守方有四时必须先处理"""
+        board = board_with([(7, 7, 1), (7, 8, 1), (8, 8, 2)])
+        assert VCFSolver().solve(board, 1)['result'] == 'no_win'
+        # 白方已有冲四，黑方的冲四不在成五点上时无效
+        board = board_with([(7, 4, 1), (7, 5, 1), (7, 6, 1), (7, 3, 2),
+                            (10, 2, 2), (10, 3, 2), (10, 4, 2), (10, 5, 2), (10, 1, 1)])
+        assert VCFSolver().solve(board, 1)['result'] == 'no_win'
+
+    def test_budget(self):
+        """测试节点预算耗尽时返回 unknown"""
+        moves = [(7, 4, 1), (7, 5, 1), (7, 6, 1), (7, 3, 2), (9, 8, 1), (10, 8, 1),
+                 (11, 8, 2), (5, 10, 1), (4, 11, 1), (3, 12, 2)]
+        result = VCFSolver(max_nodes=1).solve(board_with(moves), 1)
+        assert result['result'] == 'unknown'
+
+    def test_built_in_patterns_fast(self):
+        """测试全部内置棋谱的验证结论不变，且可在一秒内完成（回归门禁）"""
+        patterns = PatternManager()._get_built_in_patterns()
+        solver = VCFSolver()
+        reports = {pattern_id: verify_pattern(pattern, solver) for pattern_id, pattern in patterns.items()}
+        assert len(reports) == 40
+        # 进攻方都是先走的白子；题目给出的走法都没有以进攻方成五结束，
+        # 只有 three_move_92 / 94 的白子有连续冲四必胜
+        verdicts = {pattern_id: (report['attacker'], report['result'], report['script_wins'])
+                    for pattern_id, report in reports.items()}
+        expected = {pattern_id: (2, 'win' if pattern_id in ('three_move_92', 'three_move_94') else 'no_win', False)
+                    for pattern_id in patterns}
+        assert verdicts == expected
+        assert sum(report['time'] for report in reports.values()) < 1.0
+
+
+class TestThreatMap:
+    """增量威胁表测试"""
+
+    def test_matches_frontier_scan(self):
+        """测试随机落子/悔棋后与逐个扫描候选点的结果一致"""
+        rng = random.Random(1)
+        board = BitBoard()
+        threat_map = ThreatMap(board, THREAT_THREE)
+        cells = [(r, c) for r in range(15) for c in range(15)]
+        rng.shuffle(cells)
+
+        def check():
+            for player in (1, 2):
+                expected = [(level, index) for level, index, _ in find_threat_moves(board, player, THREAT_THREE)]
+                assert threat_map.threats(player) == expected
+
+        for i, (row, col) in enumerate(cells[:50]):
+            assert threat_map.make_move(row, col, 1 + i % 2)
+            check()
+        assert not threat_map.make_move(*cells[0], 1)
+        for _ in range(50):
+            threat_map.undo_move()
+            check()
+        assert threat_map.undo_move() is None
+        assert threat_map.threats(1) == threat_map.threats(2) == []
+
+
+def _assert_tree_wins(board, tree, attacker):
+    """沿证明树的每条路径重放：叶子必须是进攻方成五"""
+    for child in tree['children']:
+        row, col, player = child['move']
+        assert board.make_move(row, col, player)
+        if child['children']:
+            assert not board.check_winner(row, col, player)
+            _assert_tree_wins(board, child, attacker)
+        else:
+            assert player == attacker
+            assert board.check_winner(row, col, player)
+        board.undo_move()
+
+
+class TestVCTSolver:
+    """连续攻击（df-pn）求解器测试"""
+
+    def test_double_three(self):
+        """测试只能靠活三取胜的局面：VCF 失败，VCT 证明"""
+        board = board_with(DOUBLE_THREE)
+        assert VCFSolver().solve(board, 1)['result'] == 'no_win'
+        result = VCTSolver().solve(board, 1)
+        assert result['result'] == 'proven'
+        assert result['move'] == (7, 8)
+        assert proof_tree_size(result['tree']) > 0
+        _assert_tree_wins(board, result['tree'], 1)
+        assert len(board.move_history) == len(DOUBLE_THREE)
+
+    def test_built_in_needs_vct(self):
+        """测试内置二手胜 two_move_31 白子第一手之后的局面：黑子没有连续冲四必胜，但有连续攻击必胜"""
+        pattern = PatternManager()._get_built_in_patterns()['two_move_31']
+        board = board_with(pattern['initial_setup'] + pattern['moves'][:1])
+        assert VCFSolver().solve(board, 1)['result'] == 'no_win'
+        result = VCTSolver().solve(board, 1)
+        assert result['result'] == 'proven'
+        _assert_tree_wins(board, result['tree'], 1)
+
+    def test_built_in_attacker_is_side_to_move(self):
+        """测试内置棋谱的进攻方都是先走的白子；VCT 与 VCF 的结论一致，只有 three_move_92 / 94 有必胜"""
+        patterns = PatternManager()._get_built_in_patterns()
+        proven = set()
+        for pattern_id, pattern in patterns.items():
+            board, attacker = pattern_start(pattern, BitBoard)
+            assert attacker == pattern_attacker(pattern) == 2
+            if VCTSolver().solve(board, attacker)['result'] == 'proven':
+                proven.add(pattern_id)
+        assert proven == {'three_move_92', 'three_move_94'}
+
+    def test_vcf_is_vct(self):
+        """测试连续冲四必胜的局面也能被 VCT 证明"""
+        board = board_with([(7, 4, 1), (7, 5, 1), (7, 6, 1), (7, 3, 2), (9, 8, 1), (10, 8, 1),
+                            (11, 8, 2), (5, 10, 1), (4, 11, 1), (3, 12, 2), (0, 0, 2), (0, 2, 2), (0, 4, 2)])
+        result = VCTSolver().solve(board, 1)
+        assert result['result'] == 'proven'
+        _assert_tree_wins(board, result['tree'], 1)
+
+    def test_disproven_and_unknown(self):
+        """测试没有威胁时反证，预算耗尽时返回 unknown"""
+        board = board_with([(7, 7, 1), (7, 8, 2), (8, 8, 1), (6, 6, 2)])
+        result = VCTSolver().solve(board, 1)
+        assert result['result'] == 'disproven'
+        assert result['tree'] is None
+        result = VCTSolver(max_nodes=2).solve(board_with(DOUBLE_THREE), 1)
+        assert result['result'] == 'unknown'
+        assert result['move'] is None
+
+    def test_solve_move(self):
+        """测试判断单个走法是否制胜"""
+        board = board_with(DOUBLE_THREE)
+        solver = VCTSolver()
+        assert solver.solve_move(board, 1, (7, 8))['result'] == 'proven'
+        assert solver.solve_move(board, 1, (3, 3))['result'] == 'disproven'
+        assert len(board.move_history) == len(DOUBLE_THREE)
+        with pytest.raises(ValueError):
+            solver.solve_move(board, 1, (7, 7))
+        # 停止检查返回 True：与预算耗尽一样返回 unknown
+        result = VCTSolver().solve_move(board, 1, (7, 8), should_stop=lambda: True)
+        assert result['result'] == 'unknown' and result['nodes'] <= 16
+
+    def test_bounded_table(self):
+        """测试置换表容量受限时仍能得出正确结论"""
+        solver = VCTSolver(tt_size=64)
+        board = board_with(DOUBLE_THREE)
+        result = solver.solve(board, 1)
+        assert result['result'] == 'proven'
+        assert len(solver.tt) <= 64
+        _assert_tree_wins(board, result['tree'], 1)
+
+    def test_eviction_keeps_decided_entries(self):
+        """测试置换表满了时一次淘汰到半满，先保留已证明、再保留已反证的项"""
+        solver = VCTSolver(tt_size=8)
+        for key in range(8):
+            solver._store(key, (0, 1, 3, 5)[key % 4], (1, 0, 3, 5)[key % 4])
+        solver._store(8, 1, 1)
+        assert len(solver.tt) == 5
+        assert set(solver.tt) == {0, 4, 1, 5, 8}
+        for key in range(9, 12):
+            solver._store(key, 1, 1)
+        assert len(solver.tt) == 8   # 之后几次写入不再淘汰
+
+    def test_tree_complete_after_eviction(self):
+        """测试提取证明树时表项已被淘汰：重新求解补齐，而不是跳过防守方的应手"""
+        board = board_with(DOUBLE_THREE)
+        expected = VCTSolver().solve(board, 1)['tree']
+        solver = VCTSolver()
+        extract = solver._proof_tree
+
+        def forgetful(work, is_or, move):
+            if move is None:
+                solver.tt.clear()
+            return extract(work, is_or, move)
+
+        solver._proof_tree = forgetful
+        result = solver.solve(board, 1)
+        assert result['result'] == 'proven'
+        assert result['tree'] == expected
@@ -0,0 +1,90 @@
+"""
+局面对称与棋谱去重测试
+"""
+
+import io
+import json
+import sys
+import os
+from contextlib import redirect_stdout
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.catalog import PatternRecord
+from game.cli import main
+from game.collection import PatternCollection, write_collection
+from game.pattern import compile_built_in_records
+from game.symmetry import canonical_stones, find_duplicates, unique_records
+
+
+def make_record(pattern_id, setup, moves=((0, 0, 1),)):
+    return PatternRecord(pattern_id, 'beginner', 1, 0, tuple(setup), tuple(moves))
+
+
+class TestCanonicalStones:
+    """规范形式测试"""
+
+    def test_mirror_and_rotation(self):
+        """测试镜像、旋转后的局面规范形式相同"""
+        stones = [(7, 6, 1), (7, 7, 1), (7, 8, 2)]
+        mirrored = [(7, 14 - col, player) for _, col, player in stones]
+        rotated = [(col, 14 - row, player) for row, col, player in stones]
+        key, _ = canonical_stones(stones)
+        assert canonical_stones(mirrored)[0] == key
+        assert canonical_stones(rotated)[0] == key
+        # 颜色不同不是同一局面
+        assert canonical_stones([(7, 6, 2), (7, 7, 2), (7, 8, 1)])[0] != key
+
+    def test_translation(self):
+        """测试只有开启 translate 时才忽略平移"""
+        stones = [(7, 6, 1), (7, 7, 1), (7, 8, 2)]
+        shifted = [(row - 1, col - 1, player) for row, col, player in stones]
+        assert canonical_stones(stones)[0] != canonical_stones(shifted)[0]
+        assert canonical_stones(stones, translate=True)[0] == canonical_stones(shifted, translate=True)[0]
+
+
+class TestDeduplication:
+    """重复棋谱查找测试"""
+
+    def test_clusters(self):
+        """测试重复簇和流式去重"""
+        records = [
+            make_record('a', [(7, 6, 1), (7, 7, 1), (7, 8, 2)]),
+            make_record('b', [(3, 3, 1)]),
+            make_record('c', [(7, 8, 1), (7, 7, 1), (7, 6, 2)]),   # a 的左右镜像
+            make_record('d', [(6, 7, 1), (7, 7, 1), (8, 7, 2)]),   # a 的转置
+        ]
+        report = find_duplicates(records)
+        assert report['records'] == 4
+        assert report['unique'] == 2
+        assert [cluster['ids'] for cluster in report['clusters']] == [['a', 'c', 'd']]
+        skipped = []
+        kept = unique_records(records, on_duplicate=lambda record, kept_id: skipped.append((record.id, kept_id)))
+        assert [record.id for record in kept] == ['a', 'b']
+        assert skipped == [('c', 'a'), ('d', 'a')]
+        # 解答不同的题目在 include_moves 下不合并
+        records[2] = records[2]._replace(moves=((1, 1, 2),))
+        report = find_duplicates(records, include_moves=True)
+        assert [cluster['ids'] for cluster in report['clusters']] == [['a', 'd']]
+
+    def test_built_in_duplicates(self):
+        """测试内置棋谱中的对称重复题目能被找出"""
+        report = find_duplicates(compile_built_in_records())
+        assert report['records'] == 40
+        assert ['one_move_5', 'one_move_17'] in [cluster['ids'] for cluster in report['clusters']]
+        loose = find_duplicates(compile_built_in_records(), translate=True)
+        assert loose['unique'] < report['unique']
+
+    def test_dedup_command(self, tmp_path):
+        """测试 gobang dedup 输出报告并写出去重后的集合文件"""
+        source = str(tmp_path / 'all.gpc')
+        target = str(tmp_path / 'unique.gpc')
+        write_collection(source, compile_built_in_records())
+        output = io.StringIO()
+        with redirect_stdout(output):
+            assert main(['dedup', source, '-o', target]) == 0
+        report = json.loads(output.getvalue())
+        with PatternCollection(target) as collection:
+            assert len(collection) == report['unique']
+            assert 'one_move_17' not in collection
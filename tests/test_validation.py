@@ -0,0 +1,90 @@
+"""
+棋谱校验测试
+"""
+
+import io
+import json
+import sys
+import os
+from contextlib import redirect_stdout
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.catalog import PatternRecord
+from game.cli import main
+from game.validation import (CHECK_ALTERNATION, CHECK_BOUNDS, CHECK_FINAL_FIVE, CHECK_FORCED,
+                             CHECK_OVERLAP, CHECK_PREMATURE_FIVE, validate_record,
+                             validate_records, validation_report)
+from game.vcf import VCFSolver
+
+# 黑子横向四连，白子散落在第 0 行；第 9 手黑子成五
+SETUP = ((7, 3, 1), (0, 0, 2), (7, 4, 1), (0, 2, 2), (7, 5, 1), (0, 4, 2), (7, 6, 1), (0, 6, 2))
+WINNING = PatternRecord('win', 'beginner', 1, 1, SETUP, ((7, 7, 1),))
+
+
+def checks_of(result):
+    return [issue['check'] for issue in result['issues']]
+
+
+class TestValidateRecord:
+    """单题校验测试"""
+
+    def test_valid_record(self):
+        """测试合法棋谱通过全部检查，求解器确认必胜"""
+        result = validate_record(WINNING, VCFSolver())
+        assert result['valid'] == True
+        assert result['result'] == 'win'
+        assert result['nodes'] > 0
+
+    def test_structural_errors(self):
+        """测试坐标越界、重叠、颜色顺序和成五检查"""
+        result = validate_record(WINNING._replace(moves=((7, 15, 1),)))
+        assert checks_of(result) == [CHECK_BOUNDS, CHECK_FINAL_FIVE]
+        result = validate_record(WINNING._replace(moves=((7, 6, 1),)))
+        assert checks_of(result) == [CHECK_OVERLAP, CHECK_FINAL_FIVE]
+        assert result['issues'][0]['ply'] == 9
+        result = validate_record(WINNING._replace(moves=((7, 7, 2),)))
+        assert CHECK_ALTERNATION in checks_of(result)
+        early = WINNING._replace(moves=((7, 7, 1), (1, 1, 2)))
+        result = validate_record(early)
+        assert checks_of(result) == [CHECK_PREMATURE_FIVE, CHECK_FINAL_FIVE]
+        assert result['issues'][0]['ply'] == 9
+        # 关闭的检查项不报告
+        assert validate_record(early, checks=(CHECK_BOUNDS,))['valid'] == True
+
+    def test_not_forced(self):
+        """测试求解器无法证明必胜时报告 forced 问题"""
+        record = PatternRecord('weak', 'beginner', 1, 1, ((7, 7, 1), (7, 8, 2)), ((9, 9, 1),))
+        result = validate_record(record, VCFSolver(max_nodes=1000))
+        assert CHECK_FORCED in checks_of(result)
+        assert result['result'] == 'no_win'
+
+
+class TestValidationPipeline:
+    """批量校验测试"""
+
+    def test_parallel_matches_serial(self):
+        """测试进程池结果与串行一致且保持顺序"""
+        records = [WINNING._replace(id=f"p{i}", moves=((7, 7 + i % 3, 1),)) for i in range(30)]
+        serial = list(validate_records(records, VCFSolver()))
+        parallel = list(validate_records(records, VCFSolver(), workers=2, chunk_size=4))
+        assert parallel == serial
+        report = validation_report(parallel)
+        assert report['records'] == 30
+        assert report['valid'] == 10
+        assert report['issues'][CHECK_FINAL_FIVE] == 20
+        assert [result['id'] for result in report['results']][:2] == ['p1', 'p2']
+
+    def test_validate_command(self):
+        """测试 gobang validate 输出 JSON 报告，内置棋谱没有成五时返回 1"""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            assert main(['validate', '--built-in', '--checks', 'bounds,overlap,alternation']) == 0
+        report = json.loads(output.getvalue())
+        assert report['records'] == 40
+        assert report['invalid'] == 0
+        output = io.StringIO()
+        with redirect_stdout(output):
+            assert main(['validate', '--built-in']) == 1
+        assert json.loads(output.getvalue())['issues'][CHECK_FINAL_FIVE] == 40
@@ -0,0 +1,133 @@
+"""
+后台计算线程测试（使用记录 after 调用的假根窗口，不需要显示器）
+"""
+
+import threading
+import time
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import BitBoard
+from game.engine import SearchEngine
+from gui.worker import BackgroundWorker
+
+
+class FakeRoot:
+    """只记录 after 调用的假根窗口"""
+
+    def __init__(self):
+        self.afters = {}
+        self.next_id = 0
+
+    def after(self, delay, func):
+        self.next_id += 1
+        self.afters[self.next_id] = func
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.afters.pop(after_id, None)
+
+    def run_until_idle(self, timeout=5.0):
+        """像主循环一样执行定时回调，直到没有待执行的回调"""
+        deadline = time.perf_counter() + timeout
+        while self.afters and time.perf_counter() < deadline:
+            after_id = min(self.afters)
+            self.afters.pop(after_id)()
+            time.sleep(0.001)
+        assert not self.afters
+
+
+def _search_board():
+    board = BitBoard()
+    for row, col, player in [(7, 7, 1), (7, 8, 2), (8, 8, 1), (6, 6, 2)]:
+        board.make_move(row, col, player)
+    return board
+
+
+class TestBackgroundWorker:
+    """后台计算线程"""
+
+    def test_results_on_ui_thread(self):
+        """测试结果按提交顺序在界面线程交付，异常交给 on_error，空闲后停止轮询"""
+        root = FakeRoot()
+        worker = BackgroundWorker(root)
+        results = []
+        worker.submit(lambda x: x * 2, 21, on_done=lambda result: results.append((result, threading.current_thread())))
+        worker.submit(lambda: 1 / 0, on_error=lambda error: results.append((type(error), threading.current_thread())))
+        assert worker.busy()
+        root.run_until_idle()
+        assert results == [(42, threading.current_thread()), (ZeroDivisionError, threading.current_thread())]
+        assert not worker.busy()
+        worker.shutdown()
+
+    def test_cancel_queued_and_group(self):
+        """测试取消排队中的任务（按组），被取消的任务不执行也不交付"""
+        root = FakeRoot()
+        worker = BackgroundWorker(root)
+        gate = threading.Event()
+        ran = []
+        worker.submit(gate.wait, 5)
+        worker.submit(ran.append, 'search', group='search')
+        worker.submit(ran.append, 'hint', group='hint', on_done=lambda result: ran.append('hint done'))
+        assert worker.cancel(group='search') == 1
+        assert worker.busy(group='hint') and not worker.busy(group='search')
+        gate.set()
+        root.run_until_idle()
+        assert ran == ['hint', 'hint done']
+        assert worker.delivered == 2 and worker.dropped == 1
+        worker.shutdown()
+
+    def test_cancel_running_search(self):
+        """测试取消正在进行的搜索：引擎在几个节点内停下，结果被丢弃"""
+        root = FakeRoot()
+        worker = BackgroundWorker(root)
+        results = []
+        job = worker.submit(SearchEngine(max_depth=20, time_limit=30).search, _search_board(), 1,
+                            on_done=results.append, cancellable=True)
+        time.sleep(0.05)
+        start = time.perf_counter()
+        worker.cancel(wait=True)
+        assert job.is_finished()
+        assert time.perf_counter() - start < 0.5
+        root.run_until_idle()
+        assert results == [] and worker.dropped == 1
+        worker.shutdown()
+
+    def test_cancel_wait_total_timeout(self):
+        """测试等待取消的任务时 timeout 是总时长，而不是每个任务各等一次"""
+        root = FakeRoot()
+        worker = BackgroundWorker(root)
+        gate = threading.Event()
+        for _ in range(5):
+            worker.submit(gate.wait, 5)
+        start = time.perf_counter()
+        assert worker.cancel(wait=True, timeout=0.1) == 5
+        assert time.perf_counter() - start < 0.3
+        gate.set()
+        root.run_until_idle()
+        assert worker.dropped == 5
+        worker.shutdown()
+
+    def test_ui_thread_stays_responsive(self):
+        """测试后台搜索时界面线程的每一帧都不超过约 16 毫秒"""
+        root = FakeRoot()
+        worker = BackgroundWorker(root)
+        results = []
+        worker.submit(SearchEngine(max_depth=20, time_limit=0.3).search, _search_board(), 1,
+                      on_done=results.append, cancellable=True)
+        longest = 0.0
+        last = time.perf_counter()
+        while not results:
+            # 模拟主循环：处理一帧（轮询结果）后等待下一帧
+            for after_id in sorted(root.afters):
+                root.afters.pop(after_id)()
+            time.sleep(0.001)
+            now = time.perf_counter()
+            longest = max(longest, now - last)
+            last = now
+        assert results[0]['move'] is not None
+        assert longest < 0.016
+        worker.shutdown()